@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""Microbenchmarks for the heavy local dataflow paths on synthetic data.
+
+Generates a synthetic data directory per size (see synthetic_data.py) and
+times stockstats indicators, the Reddit, Finnhub and SimFin loaders and the
+Alpha Vantage CSV date filter against it. Each case runs once untimed, then
+`--repeat` times; the minimum is compared with the baseline.
+
+With `--save-baseline` the results are written to the baseline file. Otherwise,
+when the baseline exists, cases slower than baseline * (1 + threshold) are
+reported as regressions and the exit status is 1. Baselines are machine
+specific: record one before a change and compare after it on the same host.
+
+Usage:
+    python benchmarks/dataflow_benchmark.py --sizes small,medium --save-baseline
+    python benchmarks/dataflow_benchmark.py --sizes small,medium --threshold 0.2
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from synthetic_data import END_DATE, SIZES, alpha_vantage_csv, generate_dataset  # noqa: E402
+from tradingagents.dataflows import local  # noqa: E402
+from tradingagents.dataflows.alpha_vantage_common import _filter_csv_by_date_range  # noqa: E402
+from tradingagents.dataflows.config import set_config  # noqa: E402
+from tradingagents.dataflows.reddit_utils import fetch_top_from_category  # noqa: E402
+from tradingagents.dataflows.y_finance import (  # noqa: E402
+    _get_stock_stats_bulk,
+    get_stock_stats_indicators_window,
+)
+
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "dataflow_baseline.json")
+TICKER = "NVDA"
+
+
+def _configure(root: str) -> None:
+    set_config(
+        {
+            "data_dir": root,
+            "data_cache_dir": os.path.join(root, "data_cache"),
+            "data_vendors": {
+                "core_stock_apis": "local",
+                "technical_indicators": "local",
+                "fundamental_data": "local",
+                "news_data": "local",
+            },
+            "tool_vendors": {},
+        }
+    )
+    # local.py binds DATA_DIR at import time, so set_config does not reach it
+    local.DATA_DIR = root
+
+
+def build_cases(root: str, size: str) -> List[Tuple[str, Callable[[], Any]]]:
+    """The benchmarked calls for a generated data directory."""
+    reddit = os.path.join(root, "reddit_data")
+    av_csv = alpha_vantage_csv(TICKER, SIZES[size]["ohlcv_years"])
+    return [
+        ("stockstats_bulk", lambda: _get_stock_stats_bulk(TICKER, "rsi", END_DATE)),
+        (
+            "indicators_window",
+            lambda: get_stock_stats_indicators_window(TICKER, "macd", END_DATE, 30),
+        ),
+        ("reddit_global", lambda: fetch_top_from_category("global_news", "2025-03-20", 10, data_path=reddit)),
+        (
+            "reddit_company",
+            lambda: fetch_top_from_category("company_news", "2025-03-20", 10, TICKER, data_path=reddit),
+        ),
+        (
+            "finnhub_range",
+            lambda: local.get_data_in_range(TICKER, "2025-02-01", END_DATE, "news_data", root),
+        ),
+        ("simfin_balance", lambda: local.get_simfin_balance_sheet(TICKER, "quarterly", END_DATE)),
+        ("simfin_cashflow", lambda: local.get_simfin_cashflow(TICKER, "quarterly", END_DATE)),
+        ("simfin_income", lambda: local.get_simfin_income_statements(TICKER, "quarterly", END_DATE)),
+        ("av_csv_filter", lambda: _filter_csv_by_date_range(av_csv, "2024-01-01", END_DATE)),
+    ]
+
+
+def time_case(call: Callable[[], Any], repeat: int) -> Dict[str, float]:
+    call()  # warm-up: imports, file system cache
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        call()
+        timings.append((time.perf_counter() - start) * 1000)
+    return {
+        "min_ms": round(min(timings), 3),
+        "median_ms": round(statistics.median(timings), 3),
+        "repeat": repeat,
+    }
+
+
+def run(sizes: List[str], repeat: int, cases: List[str]) -> Dict[str, Dict[str, float]]:
+    results = {}
+    for size in sizes:
+        with tempfile.TemporaryDirectory(prefix=f"ta_dataflow_{size}_") as root:
+            dataset = generate_dataset(root, size, tickers=[TICKER])
+            print(f"\n{size}: {dataset['files']} files, {dataset['bytes'] / 2**20:.1f} MB")
+            _configure(root)
+            for name, call in build_cases(root, size):
+                if cases and name not in cases:
+                    continue
+                # The loaders print progress and diagnostics
+                with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull), contextlib.redirect_stderr(devnull):
+                    timing = time_case(call, repeat)
+                results[f"{name}@{size}"] = timing
+                print(f"  {name:<20} min {timing['min_ms']:>10.3f} ms   median {timing['median_ms']:>10.3f} ms")
+    return results
+
+
+def compare(results, baseline, threshold) -> List[str]:
+    """Cases whose minimum time exceeds the baseline by more than `threshold`."""
+    regressions = []
+    for key, timing in results.items():
+        reference = baseline.get(key)
+        if reference is None:
+            continue
+        ratio = timing["min_ms"] / max(reference["min_ms"], 1e-6)
+        status = "REGRESSION" if ratio > 1 + threshold else "ok"
+        print(f"  {key:<28} {reference['min_ms']:>10.3f} -> {timing['min_ms']:>10.3f} ms  x{ratio:.2f}  {status}")
+        if status != "ok":
+            regressions.append(key)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", default="small,medium", help=f"Comma-separated: {', '.join(SIZES)}")
+    parser.add_argument("--cases", default="", help="Comma-separated case names (default: all)")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Write results as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="Allowed slowdown (0.25 = 25%%)")
+    parser.add_argument("--output", help="Also write the results JSON here")
+    args = parser.parse_args()
+
+    sizes = [size for size in args.sizes.split(",") if size]
+    unknown = set(sizes) - set(SIZES)
+    if unknown:
+        parser.error(f"Unknown sizes: {sorted(unknown)}. Options: {list(SIZES)}")
+
+    results = run(sizes, args.repeat, [case for case in args.cases.split(",") if case])
+    report = {
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(report, f, indent=2)
+
+    if args.save_baseline:
+        baseline = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline) as f:
+                baseline = json.load(f).get("results", {})
+        report["results"] = {**baseline, **results}
+        with open(args.baseline, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"\nSaved baseline to {args.baseline}")
+        return
+
+    if not os.path.exists(args.baseline):
+        print(f"\nNo baseline at {args.baseline}; run with --save-baseline to record one")
+        return
+    with open(args.baseline) as f:
+        baseline = json.load(f).get("results", {})
+    print(f"\nComparison with {args.baseline} (threshold {args.threshold:.0%}):")
+    regressions = compare(results, baseline, args.threshold)
+    if regressions:
+        print(f"\n{len(regressions)} regression(s): {', '.join(regressions)}")
+        sys.exit(1)
+    print("\nNo regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,578 @@
+#!/usr/bin/env python3
+"""Offline end-to-end benchmark of TradingAgentsGraph.propagate.
+
+Builds the full graph with a scripted chat model (analysts issue real tool
+calls for every bound tool before writing their report) and a "fixture" data
+vendor serving deterministic synthetic prices, fundamentals and news, so no
+API keys or network access are needed. Each workload runs `propagate` for
+every ticker and reports, as JSON:
+
+- per-node wall time, CPU time, LLM calls and allocations (tracemalloc peak
+  and net growth, unless --no-alloc)
+- propagate latency percentiles and throughput (runs per minute)
+- prompt tokens sent by the analysts, which tool output compaction reduces
+  over several tool rounds (compare --tool-rounds 3 with
+  --tool-compaction-chars 0 and e.g. 600)
+- with --profile-prompts, prompt tokens per section and node over all runs
+  (also printed to stderr)
+
+CPU time is process-wide, so a node's figure includes the worker threads of
+its parallel tool calls. Allocation tracking slows Python code noticeably;
+compare timings across runs with the same --no-alloc setting.
+
+Usage:
+    python benchmarks/graph_benchmark.py --tickers 3 --analysts market,news \\
+        --debate-rounds 2 --output bench.json
+"""
+
+import argparse
+import contextlib
+import hashlib
+import json
+import os
+import platform
+import re
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from functools import lru_cache
+from typing import Any, Dict, Optional
+
+import numpy as np
+import pandas as pd
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from synthetic_data import synthetic_ohlcv  # noqa: E402
+from tradingagents.agents.utils.prompt_profiler import merge_prompt_profiles  # noqa: E402
+
+from tradingagents.agents.utils.token_utils import estimate_tokens  # noqa: E402
+from tradingagents.dataflows.interface import TOOLS_CATEGORIES, VENDOR_METHODS  # noqa: E402
+from tradingagents.dataflows.market_snapshot import compute_market_snapshot  # noqa: E402
+from tradingagents.default_config import DEFAULT_CONFIG  # noqa: E402
+from tradingagents.graph.trading_graph import TradingAgentsGraph  # noqa: E402
+
+
+FIXTURE_VENDOR = "fixture"
+TICKERS = ["NVDA", "AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "AMD", "NFLX", "JPM"]
+INDICATORS = ["close_50_sma", "rsi", "macd", "boll_ub", "atr", "vwma"]
+
+_CURRENT_DATE = re.compile(r"current date is (\d{4}-\d{2}-\d{2})")
+_TICKER = re.compile(r"(?:look at is|analyze is|looking at the company) ([A-Z][A-Z0-9.\-]*)")
+
+
+def _seed(*parts: str) -> int:
+    digest = hashlib.blake2b("|".join(parts).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+# ---------------------------------------------------------------------------
+# Fixture data vendor
+# ---------------------------------------------------------------------------
+
+
+@lru_cache(maxsize=64)
+def _price_history(symbol: str) -> pd.DataFrame:
+    """Three years of daily OHLCV ending 2025-12-31."""
+    return synthetic_ohlcv(symbol, years=3, end="2025-12-31")
+
+
+def fixture_stock_data(symbol, start_date, end_date):
+    data = _price_history(symbol)
+    data = data[(data["Date"] >= start_date) & (data["Date"] <= end_date)].copy()
+    data["Date"] = data["Date"].dt.strftime("%Y-%m-%d")
+    header = (
+        f"# Stock data for {symbol.upper()} from {start_date} to {end_date}\n"
+        f"# Total records: {len(data)}\n"
+        f"# Data retrieved on: 2025-12-31 00:00:00\n\n"
+    )
+    return header + data.round(2).to_csv(index=False)
+
+
+def fixture_indicators(symbol, indicator, curr_date, look_back_days=30):
+    from stockstats import wrap
+
+    data = _price_history(symbol)
+    frame = wrap(data[data["Date"] <= curr_date].rename(columns=str.lower))
+    values = frame[indicator].tail(look_back_days)
+    lines = "\n".join(f"{date:%Y-%m-%d}: {value:.4f}" for date, value in values.items())
+    return f"## {indicator} values from the last {look_back_days} trading days up to {curr_date}:\n\n{lines}"
+
+
+def fixture_fundamentals(ticker, curr_date):
+    rng = np.random.default_rng(_seed(ticker, "fundamentals"))
+    fields = {
+        "MarketCapitalization": int(rng.integers(10, 3000)) * 10**9,
+        "PERatio": round(float(rng.uniform(8, 80)), 2),
+        "PEGRatio": round(float(rng.uniform(0.5, 3)), 2),
+        "ProfitMargin": round(float(rng.uniform(0.02, 0.5)), 4),
+        "ReturnOnEquityTTM": round(float(rng.uniform(0.02, 0.6)), 4),
+        "RevenueTTM": int(rng.integers(1, 600)) * 10**9,
+        "DividendYield": round(float(rng.uniform(0, 0.04)), 4),
+        "Beta": round(float(rng.uniform(0.5, 2.5)), 3),
+    }
+    return json.dumps({"Symbol": ticker, "AsOf": curr_date, **fields}, indent=4)
+
+
+def _statement(ticker, kind, items, freq, curr_date):
+    rng = np.random.default_rng(_seed(ticker, kind))
+    periods = pd.date_range(end=curr_date or "2025-12-31", periods=8, freq="QE" if freq == "quarterly" else "YE")
+    table = pd.DataFrame(
+        rng.integers(-5, 200, (len(items), len(periods))) * 10**8,
+        index=items,
+        columns=[p.strftime("%Y-%m-%d") for p in periods[::-1]],
+    )
+    return f"# {kind} for {ticker.upper()} ({freq})\n\n" + table.rename_axis("Item").to_csv()
+
+
+def fixture_balance_sheet(ticker, freq="quarterly", curr_date=None):
+    items = ["Total Assets", "Total Liabilities", "Stockholders Equity", "Cash And Cash Equivalents",
+             "Current Assets", "Current Liabilities", "Long Term Debt", "Inventory", "Goodwill"]
+    return _statement(ticker, "Balance sheet", items, freq, curr_date)
+
+
+def fixture_cashflow(ticker, freq="quarterly", curr_date=None):
+    items = ["Operating Cash Flow", "Capital Expenditure", "Free Cash Flow", "Repurchase Of Capital Stock",
+             "Cash Dividends Paid", "Issuance Of Debt", "Depreciation And Amortization"]
+    return _statement(ticker, "Cash flow", items, freq, curr_date)
+
+
+def fixture_income_statement(ticker, freq="quarterly", curr_date=None):
+    items = ["Total Revenue", "Cost Of Revenue", "Gross Profit", "Operating Expense", "Operating Income",
+             "Net Income", "Diluted EPS", "EBITDA", "Research And Development"]
+    return _statement(ticker, "Income statement", items, freq, curr_date)
+
+
+def _articles(key, count, when):
+    rng = np.random.default_rng(_seed(key, when))
+    topics = ["earnings beat", "guidance cut", "new product launch", "regulatory probe", "analyst upgrade",
+              "supply constraints", "share buyback", "executive departure", "partnership", "price war"]
+    return "\n\n".join(
+        f"### {key} {topics[i]} (source: Wire {i})\n"
+        + " ".join(f"Coverage of {key} {topics[i]} with detail {j}." for j in range(int(rng.integers(3, 8))))
+        for i in rng.permutation(len(topics))[:count]
+    )
+
+
+def fixture_news(ticker, start_date, end_date):
+    return f"## {ticker} News, from {start_date} to {end_date}:\n\n" + _articles(ticker, 8, end_date)
+
+
+def fixture_global_news(curr_date, look_back_days=7, limit=5):
+    return f"## Global Market News, {look_back_days} days to {curr_date}:\n\n" + _articles("Markets", limit, curr_date)
+
+
+def fixture_insider_sentiment(ticker, curr_date):
+    rng = np.random.default_rng(_seed(ticker, "insider_sentiment", curr_date))
+    rows = "\n".join(f"### 2025-{m:02d}:\nChange: {int(rng.integers(-50000, 50000))}\nMonthly Share Purchase Ratio: {rng.uniform(-1, 1):.3f}" for m in range(1, 7))
+    return f"## {ticker} Insider Sentiment Data up to {curr_date}:\n{rows}"
+
+
+def fixture_insider_transactions(ticker, curr_date):
+    rng = np.random.default_rng(_seed(ticker, "insider_transactions", curr_date))
+    rows = "\n".join(
+        f"Insider {i},Officer,{'Sale' if rng.random() < 0.7 else 'Purchase'},{int(rng.integers(100, 50000))},{rng.uniform(20, 500):.2f}"
+        for i in range(12)
+    )
+    return f"# Insider transactions for {ticker} up to {curr_date}\n\nName,Position,Transaction,Shares,Price\n{rows}"
+
+
+FIXTURES = {
+    "get_stock_data": fixture_stock_data,
+    "get_indicators": fixture_indicators,
+    "get_fundamentals": fixture_fundamentals,
+    "get_balance_sheet": fixture_balance_sheet,
+    "get_cashflow": fixture_cashflow,
+    "get_income_statement": fixture_income_statement,
+    "get_news": fixture_news,
+    "get_global_news": fixture_global_news,
+    "get_insider_sentiment": fixture_insider_sentiment,
+    "get_insider_transactions": fixture_insider_transactions,
+}
+
+
+def install_fixture_vendors() -> Dict[str, str]:
+    """Register the fixture vendor for every tool and return a data_vendors config."""
+    for method, implementation in FIXTURES.items():
+        VENDOR_METHODS[method][FIXTURE_VENDOR] = implementation
+    return {category: FIXTURE_VENDOR for category in TOOLS_CATEGORIES}
+
+
+def fixture_snapshot(symbol, trade_date):
+    return compute_market_snapshot(_price_history(symbol), trade_date)
+
+
+# ---------------------------------------------------------------------------
+# Scripted chat model
+# ---------------------------------------------------------------------------
+
+
+def _tool_args(tool: Dict[str, Any], ticker: str, trade_date: str, call_index: int) -> Dict[str, Any]:
+    """Plausible arguments for a tool from its JSON schema."""
+    start = (pd.Timestamp(trade_date) - pd.Timedelta(days=30)).strftime("%Y-%m-%d")
+    args = {}
+    for name, spec in tool["function"]["parameters"].get("properties", {}).items():
+        if name in ("symbol", "ticker", "query"):
+            args[name] = ticker
+        elif name == "start_date":
+            args[name] = start
+        elif name.endswith("date"):
+            args[name] = trade_date
+        elif name == "indicator":
+            args[name] = INDICATORS[call_index % len(INDICATORS)]
+        elif name == "freq":
+            args[name] = "quarterly"
+        elif spec.get("type") == "integer":
+            args[name] = spec.get("default") or 7
+    return args
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Deterministic chat model that scripts tool calls and sized responses.
+
+    With tools bound, the first `tool_rounds` turns of a conversation call
+    every bound tool (indicators are cycled); afterwards, and without tools,
+    it answers with roughly `response_chars` characters of report text that
+    quotes a close price, ends with a BUY proposal and carries token usage.
+    """
+
+    response_chars: int = 2000
+    tool_rounds: int = 1
+    latency_ms: float = 0.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(tool) for tool in tools], **kwargs)
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        if self.latency_ms:
+            time.sleep(self.latency_ms / 1000)
+
+        text = "\n".join(str(message.content) for message in messages)
+        date_match = _CURRENT_DATE.search(text)
+        ticker_match = _TICKER.search(text)
+        trade_date = date_match.group(1) if date_match else "2025-06-02"
+        ticker = ticker_match.group(1) if ticker_match else "NVDA"
+
+        tool_turns = sum(1 for m in messages if isinstance(m, AIMessage) and m.tool_calls)
+        if tools and tool_turns < self.tool_rounds:
+            calls = []
+            for i, tool in enumerate(tools):
+                calls.append(
+                    {
+                        "name": tool["function"]["name"],
+                        "args": _tool_args(tool, ticker, trade_date, tool_turns * len(tools) + i),
+                        "id": f"call_{tool_turns}_{i}",
+                    }
+                )
+            message = AIMessage(content="", tool_calls=calls)
+        else:
+            message = AIMessage(content=self._report(text, ticker))
+
+        message.usage_metadata = {
+            "input_tokens": estimate_tokens(text),
+            "output_tokens": estimate_tokens(str(message.content)) + 20 * len(message.tool_calls),
+            "total_tokens": 0,
+        }
+        message.usage_metadata["total_tokens"] = (
+            message.usage_metadata["input_tokens"] + message.usage_metadata["output_tokens"]
+        )
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _report(self, prompt: str, ticker: str) -> str:
+        rng = np.random.default_rng(_seed(prompt[-2000:]))
+        price = float(rng.uniform(50, 500))
+        sentences = [
+            f"{ticker} shows {word} momentum with support near ${price * (1 - 0.01 * k):.2f}."
+            for k, word in enumerate(["steady", "improving", "fading", "mixed", "strong", "weak"] * 50)
+        ]
+        body = " ".join(sentences)[: max(0, self.response_chars - 300)]
+        return (
+            f"Close Price: ${price:.2f}\n\n{body}\n\n"
+            "| Metric | Value |\n|---|---|\n"
+            f"| Close | {price:.2f} |\n| Target | {price * 1.1:.2f} |\n\n"
+            f"Entry price: ${price:.2f}. Price target: ${price * 1.1:.2f}. Stop-loss at ${price * 0.93:.2f}.\n"
+            "FINAL TRANSACTION PROPOSAL: **BUY**"
+        )
+
+
+# ---------------------------------------------------------------------------
+# Per-node profiling
+# ---------------------------------------------------------------------------
+
+
+class NodeProfiler(BaseCallbackHandler):
+    """Callback handler recording wall time, CPU time and allocations per graph node."""
+
+    def __init__(self, track_allocations: bool = True):
+        self.track_allocations = track_allocations
+        self.nodes: Dict[str, Dict[str, Any]] = {}
+        self._open: Dict[Any, tuple] = {}
+
+    def _node(self, name: str) -> Dict[str, Any]:
+        return self.nodes.setdefault(
+            name,
+            {"calls": 0, "errors": 0, "llm_calls": 0, "wall_ms": [], "cpu_ms": 0.0,
+             "alloc_peak_kb": 0.0, "alloc_net_kb": 0.0},
+        )
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if not node or kwargs.get("name") != node:
+            return
+        allocated = 0
+        if self.track_allocations:
+            allocated = tracemalloc.get_traced_memory()[0]
+            tracemalloc.reset_peak()
+        self._open[run_id] = (node, time.perf_counter(), time.process_time(), allocated)
+
+    def _close(self, run_id, error=False):
+        opened = self._open.pop(run_id, None)
+        if opened is None:
+            return
+        node, wall_start, cpu_start, allocated = opened
+        stats = self._node(node)
+        stats["calls"] += 1
+        stats["errors"] += int(error)
+        stats["wall_ms"].append((time.perf_counter() - wall_start) * 1000)
+        stats["cpu_ms"] += (time.process_time() - cpu_start) * 1000
+        if self.track_allocations:
+            current, peak = tracemalloc.get_traced_memory()
+            stats["alloc_peak_kb"] = max(stats["alloc_peak_kb"], (peak - allocated) / 1024)
+            stats["alloc_net_kb"] += (current - allocated) / 1024
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._close(run_id)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._close(run_id, error=True)
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        if node:
+            self._node(node)["llm_calls"] += 1
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        report = {}
+        for name, stats in self.nodes.items():
+            wall = stats["wall_ms"]
+            report[name] = {
+                "calls": stats["calls"],
+                "errors": stats["errors"],
+                "llm_calls": stats["llm_calls"],
+                "wall_ms_total": round(sum(wall), 3),
+                "wall_ms_mean": round(statistics.mean(wall), 3) if wall else 0.0,
+                "wall_ms_max": round(max(wall), 3) if wall else 0.0,
+                "cpu_ms_total": round(stats["cpu_ms"], 3),
+            }
+            if self.track_allocations:
+                report[name]["alloc_peak_kb"] = round(stats["alloc_peak_kb"], 1)
+                report[name]["alloc_net_kb"] = round(stats["alloc_net_kb"], 1)
+        return dict(sorted(report.items(), key=lambda item: -item[1]["wall_ms_total"]))
+
+
+# ---------------------------------------------------------------------------
+# Workload
+# ---------------------------------------------------------------------------
+
+
+def offline_graph(
+    results_dir: str,
+    llm: Optional[BaseChatModel] = None,
+    analysts: str = "market,social,news,fundamentals",
+    callbacks=None,
+    **config,
+) -> TradingAgentsGraph:
+    """A TradingAgentsGraph wired to the fixture vendor and a scripted model.
+
+    Extra keyword arguments override the config. Also used by the offline
+    tests at the repository root.
+    """
+    config = {
+        **DEFAULT_CONFIG,
+        "results_dir": results_dir,
+        "data_vendors": install_fixture_vendors(),
+        "tool_vendors": {},
+        "embedding_backend": "hashing",
+        **config,
+    }
+    llm = llm or ScriptedChatModel()
+    graph = TradingAgentsGraph(
+        selected_analysts=analysts.split(","),
+        config=config,
+        quick_thinking_llm=llm,
+        deep_thinking_llm=llm,
+        callbacks=callbacks,
+    )
+    graph.propagator.snapshot_provider = fixture_snapshot
+    return graph
+
+
+def build_graph(args, results_dir: str, profiler: Optional[NodeProfiler]) -> TradingAgentsGraph:
+    llm = ScriptedChatModel(
+        response_chars=args.response_chars,
+        tool_rounds=args.tool_rounds,
+        latency_ms=args.llm_latency_ms,
+    )
+    return offline_graph(
+        results_dir,
+        llm,
+        args.analysts,
+        callbacks=[profiler] if profiler else None,
+        max_debate_rounds=args.debate_rounds,
+        max_risk_discuss_rounds=args.risk_rounds,
+        max_prediction_rounds=args.prediction_rounds,
+        enable_prediction_team=not args.no_predictions,
+        prompt_profiling=args.profile_prompts,
+        tool_output_compaction=_compaction_limits(args.tool_compaction_chars),
+    )
+
+
+def _compaction_limits(max_chars: Optional[int]) -> Dict[str, Optional[int]]:
+    limits = DEFAULT_CONFIG["tool_output_compaction"]
+    if max_chars is None:
+        return limits
+    return {analyst: max_chars or None for analyst in limits}
+
+
+def run(args) -> Dict[str, Any]:
+    tickers = (TICKERS * (args.tickers // len(TICKERS) + 1))[: args.tickers]
+    workdir = tempfile.mkdtemp(prefix="ta_bench_")
+    previous_cwd = os.getcwd()
+    # propagate writes its state logs under ./eval_results
+    os.chdir(workdir)
+    try:
+        with open(os.devnull, "w") as devnull, contextlib.redirect_stdout(devnull):
+            # Warm-up runs pay one-off import, compile and cache costs
+            warmup = build_graph(args, os.path.join(workdir, "warmup"), None)
+            for _ in range(args.warmup):
+                warmup.propagate(tickers[0], args.date)
+
+            profiler = NodeProfiler(track_allocations=not args.no_alloc)
+            graph = build_graph(args, os.path.join(workdir, "results"), profiler)
+            if not args.no_alloc:
+                tracemalloc.start()
+            latencies, reflect_ms, decisions = [], [], {}
+            analyst_nodes = [f"{name.capitalize()} Analyst" for name in args.analysts.split(",")]
+            analyst_input_tokens = 0
+            wall_start, cpu_start = time.perf_counter(), time.process_time()
+            for _ in range(args.repeat):
+                for ticker in tickers:
+                    start = time.perf_counter()
+                    _, decisions[ticker] = graph.propagate(ticker, args.date)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    analyst_input_tokens += sum(
+                        graph.run_metrics["nodes"].get(node, {}).get("input_tokens", 0)
+                        for node in analyst_nodes
+                    )
+                    if args.reflect:
+                        start = time.perf_counter()
+                        graph.reflect_and_remember(1000)
+                        reflect_ms.append((time.perf_counter() - start) * 1000)
+            wall_s = time.perf_counter() - wall_start
+            cpu_s = time.process_time() - cpu_start
+            peak_kb = tracemalloc.get_traced_memory()[1] / 1024 if not args.no_alloc else None
+            tracemalloc.stop()
+    finally:
+        os.chdir(previous_cwd)
+
+    latencies.sort()
+    nodes = profiler.summary()
+    result = {
+        "workload": {
+            "tickers": tickers,
+            "date": args.date,
+            "analysts": args.analysts.split(","),
+            "debate_rounds": args.debate_rounds,
+            "risk_rounds": args.risk_rounds,
+            "prediction_rounds": args.prediction_rounds,
+            "predictions": not args.no_predictions,
+            "repeat": args.repeat,
+            "tool_rounds": args.tool_rounds,
+            "tool_compaction_chars": args.tool_compaction_chars,
+            "response_chars": args.response_chars,
+            "llm_latency_ms": args.llm_latency_ms,
+            "reflect": args.reflect,
+            "track_allocations": not args.no_alloc,
+            "profile_prompts": args.profile_prompts,
+        },
+        "environment": {
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpu_count": os.cpu_count(),
+        },
+        "totals": {
+            "runs": len(latencies),
+            "wall_s": round(wall_s, 3),
+            "cpu_s": round(cpu_s, 3),
+            "runs_per_min": round(60 * len(latencies) / wall_s, 2),
+            "llm_calls": sum(node["llm_calls"] for node in nodes.values()),
+            "analyst_input_tokens": analyst_input_tokens,
+            "node_calls": sum(node["calls"] for node in nodes.values()),
+            "alloc_peak_kb": round(peak_kb, 1) if peak_kb is not None else None,
+        },
+        "propagate_ms": {
+            "mean": round(statistics.mean(latencies), 3),
+            "p50": round(latencies[len(latencies) // 2], 3),
+            "p95": round(latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))], 3),
+            "max": round(latencies[-1], 3),
+        },
+        "nodes": nodes,
+        "decisions": decisions,
+    }
+    if graph.prompt_profiles:
+        result["prompt_profile"] = merge_prompt_profiles(graph.prompt_profiles)
+        print(graph.prompt_profile_summary(), file=sys.stderr)
+    if reflect_ms:
+        result["reflect_ms"] = {"mean": round(statistics.mean(reflect_ms), 3), "max": round(max(reflect_ms), 3)}
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--tickers", type=int, default=2, help="Number of tickers per repeat")
+    parser.add_argument("--date", default="2025-06-02", help="Trade date")
+    parser.add_argument("--analysts", default="market,social,news,fundamentals")
+    parser.add_argument("--debate-rounds", type=int, default=1)
+    parser.add_argument("--risk-rounds", type=int, default=1)
+    parser.add_argument("--prediction-rounds", type=int, default=1)
+    parser.add_argument("--no-predictions", action="store_true", help="Skip the prediction team")
+    parser.add_argument("--repeat", type=int, default=1, help="Passes over the tickers")
+    parser.add_argument("--warmup", type=int, default=1, help="Untimed runs before measuring")
+    parser.add_argument("--tool-rounds", type=int, default=1, help="Tool-calling turns per analyst")
+    parser.add_argument(
+        "--tool-compaction-chars",
+        type=int,
+        help="Compact analyzed tool outputs above this size for every analyst (0 disables; "
+        "default: tool_output_compaction)",
+    )
+    parser.add_argument("--response-chars", type=int, default=2000, help="Size of each model answer")
+    parser.add_argument("--llm-latency-ms", type=float, default=0.0, help="Simulated model latency")
+    parser.add_argument("--reflect", action="store_true", help="Reflect after each run to grow memories")
+    parser.add_argument("--profile-prompts", action="store_true", help="Break prompt tokens down by section")
+    parser.add_argument("--no-alloc", action="store_true", help="Disable tracemalloc allocation tracking")
+    parser.add_argument("--output", help="Write the JSON report here instead of stdout")
+    args = parser.parse_args()
+
+    report = json.dumps(run(args), indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report + "\n")
+        print(f"Wrote {args.output}")
+    else:
+        print(report)
+
+
+if __name__ == "__main__":
+    main()
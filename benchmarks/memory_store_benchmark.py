@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""Compare agent memory vector stores: Chroma vs the NumPy store.
+
+Measures collection startup, batched insert time, query latency (top-2 and
+the full scan used for chunk aggregation) and memory growth for random
+normalized embeddings.
+
+Usage:
+    python benchmarks/memory_store_benchmark.py --entries 2000 --dim 1536
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+import uuid
+
+import numpy as np
+
+import chromadb
+from chromadb.config import Settings
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from tradingagents.agents.utils.memory import NumpyCollection  # noqa: E402
+
+
+def _rss_bytes():
+    """Resident set size of this process (Linux only, else None)."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError):
+        return None
+
+
+def _make_chroma():
+    client = chromadb.Client(Settings(allow_reset=True))
+    return client.create_collection(
+        name=f"bench_{uuid.uuid4().hex[:8]}", metadata={"hnsw:space": "cosine"}
+    )
+
+
+def _bench(name, factory, vectors, queries, batch_size):
+    rss_before = _rss_bytes()
+    start = time.perf_counter()
+    collection = factory()
+    startup_ms = (time.perf_counter() - start) * 1000
+
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), batch_size):
+        batch = vectors[offset : offset + batch_size]
+        ids = [str(offset + i) for i in range(len(batch))]
+        collection.add(
+            documents=[f"situation {i}" for i in ids],
+            metadatas=[{"recommendation": f"advice {i}", "situation_id": i} for i in ids],
+            embeddings=batch.tolist(),
+            ids=ids,
+        )
+    insert_ms = (time.perf_counter() - start) * 1000
+
+    def latency(n_results):
+        timings = []
+        for query in queries:
+            start = time.perf_counter()
+            collection.query(query_embeddings=[query.tolist()], n_results=n_results)
+            timings.append((time.perf_counter() - start) * 1000)
+        return statistics.median(timings)
+
+    top2_ms = latency(2)
+    full_ms = latency(len(vectors))
+    rss_after = _rss_bytes()
+    rss_mb = (rss_after - rss_before) / 2**20 if rss_before is not None else float("nan")
+
+    print(
+        f"{name:<16} {startup_ms:>10.2f} {insert_ms:>10.1f} {top2_ms:>10.3f} "
+        f"{full_ms:>10.3f} {rss_mb:>10.1f}"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--entries", type=int, default=2000)
+    parser.add_argument("--dim", type=int, default=1536)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--batch-size", type=int, default=100)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    vectors = rng.normal(size=(args.entries, args.dim)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    queries = vectors[rng.integers(0, args.entries, args.queries)]
+
+    print(f"{args.entries} entries x {args.dim} dims, median of {args.queries} queries")
+    print(
+        f"{'store':<16} {'startup ms':>10} {'insert ms':>10} {'top-2 ms':>10} "
+        f"{'full ms':>10} {'RSS MB':>10}"
+    )
+    _bench("chroma", _make_chroma, vectors, queries, args.batch_size)
+    for dtype in ("float32", "float16", "int8"):
+        _bench(
+            f"numpy-{dtype}",
+            lambda: NumpyCollection("bench", dtype=dtype, dedup_threshold=None),
+            vectors,
+            queries,
+            args.batch_size,
+        )
+
+
+if __name__ == "__main__":
+    main()
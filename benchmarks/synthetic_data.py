@@ -0,0 +1,301 @@
+"""Deterministic synthetic market data in the layouts the dataflows read.
+
+Everything is seeded from the ticker (or file) name, so the same size always
+produces identical files. `generate_dataset(root, size)` writes a complete
+data directory:
+
+- `<root>/market_data/price_data/<T>-YFin-data-2015-01-01-2025-03-25.csv`
+  and `<root>/data_cache/<T>-YFin-data-2015-01-01-2025-03-25.csv`: daily
+  OHLCV (Yahoo Finance columns) for the local price store and stockstats
+- `<root>/fundamental_data/simfin_data_all/...`: SimFin balance sheet, cash
+  flow and income statement bulk files (";"-separated, quarterly and annual)
+- `<root>/finnhub_data/<type>/<T>_data_formatted.json`: Finnhub news, insider
+  sentiment and insider transactions keyed by date
+- `<root>/reddit_data/<category>/<subreddit>.jsonl`: Reddit posts
+"""
+
+import hashlib
+import json
+import os
+from typing import Any, Dict, Iterable, List
+
+import numpy as np
+import pandas as pd
+
+
+END_DATE = "2025-03-25"
+PRICE_FILE = "{ticker}-YFin-data-2015-01-01-2025-03-25.csv"
+TICKERS = ["NVDA", "AAPL", "MSFT", "AMZN", "GOOGL", "META", "TSLA", "AMD", "NFLX", "JPM"]
+
+SIZES: Dict[str, Dict[str, int]] = {
+    "small": {
+        "ohlcv_years": 2,
+        "simfin_tickers": 200,
+        "simfin_periods": 12,
+        "finnhub_days": 180,
+        "finnhub_per_day": 4,
+        "reddit_subreddits": 3,
+        "reddit_posts": 1500,
+    },
+    "medium": {
+        "ohlcv_years": 5,
+        "simfin_tickers": 1000,
+        "simfin_periods": 24,
+        "finnhub_days": 730,
+        "finnhub_per_day": 8,
+        "reddit_subreddits": 4,
+        "reddit_posts": 6000,
+    },
+    "large": {
+        "ohlcv_years": 15,
+        "simfin_tickers": 3000,
+        "simfin_periods": 40,
+        "finnhub_days": 1825,
+        "finnhub_per_day": 16,
+        "reddit_subreddits": 5,
+        "reddit_posts": 20000,
+    },
+}
+
+SIMFIN_STATEMENTS = {
+    "balance_sheet": (
+        "us-balance-{freq}.csv",
+        [
+            "Cash, Cash Equivalents & Short Term Investments", "Accounts & Notes Receivable",
+            "Inventories", "Total Current Assets", "Property, Plant & Equipment, Net",
+            "Long Term Investments & Receivables", "Other Long Term Assets", "Total Noncurrent Assets",
+            "Total Assets", "Payables & Accruals", "Short Term Debt", "Total Current Liabilities",
+            "Long Term Debt", "Total Noncurrent Liabilities", "Total Liabilities",
+            "Share Capital & Additional Paid-In Capital", "Treasury Stock", "Retained Earnings",
+            "Total Equity", "Total Liabilities & Equity",
+        ],
+    ),
+    "cash_flow": (
+        "us-cashflow-{freq}.csv",
+        [
+            "Net Income/Starting Line", "Depreciation & Amortization", "Non-Cash Items",
+            "Change in Working Capital", "Change in Accounts Receivable", "Change in Inventories",
+            "Net Cash from Operating Activities", "Change in Fixed Assets & Intangibles",
+            "Net Cash from Investing Activities", "Dividends Paid", "Cash from (Repayment of) Debt",
+            "Cash from (Repurchase of) Equity", "Net Cash from Financing Activities",
+            "Net Change in Cash",
+        ],
+    ),
+    "income_statements": (
+        "us-income-{freq}.csv",
+        [
+            "Revenue", "Cost of Revenue", "Gross Profit", "Operating Expenses",
+            "Selling, General & Administrative", "Research & Development",
+            "Depreciation & Amortization", "Operating Income (Loss)", "Non-Operating Income (Loss)",
+            "Interest Expense, Net", "Pretax Income (Loss)", "Income Tax (Expense) Benefit, Net",
+            "Net Income", "Net Income (Common)",
+        ],
+    ),
+}
+
+_HEADLINES = [
+    "beats earnings estimates", "cuts full-year guidance", "unveils new product line",
+    "faces regulatory probe", "upgraded by analysts", "reports supply constraints",
+    "announces share buyback", "CFO departs", "signs strategic partnership", "enters price war",
+]
+
+
+def _rng(*parts: Any) -> np.random.Generator:
+    digest = hashlib.blake2b("|".join(map(str, parts)).encode("utf-8"), digest_size=8).digest()
+    return np.random.default_rng(int.from_bytes(digest, "little"))
+
+
+def _ensure_dir(path: str) -> str:
+    os.makedirs(path, exist_ok=True)
+    return path
+
+
+def synthetic_ohlcv(ticker: str, years: float = 15, end: str = END_DATE) -> pd.DataFrame:
+    """Daily OHLCV for `years` of business days ending at `end` (geometric random walk)."""
+    rng = _rng(ticker, "ohlcv")
+    dates = pd.bdate_range(end=end, periods=int(252 * years))
+    close = (20 + 200 * rng.random()) * np.exp(np.cumsum(rng.normal(0.0004, 0.02, len(dates))))
+    spread = close * rng.uniform(0.005, 0.03, len(dates))
+    open_ = close + rng.normal(0, 0.3, len(dates)) * spread
+    return pd.DataFrame(
+        {
+            "Date": dates,
+            "Open": open_,
+            "High": np.maximum(open_, close) + spread / 2,
+            "Low": np.minimum(open_, close) - spread / 2,
+            "Close": close,
+            "Adj Close": close,
+            "Volume": rng.integers(1_000_000, 80_000_000, len(dates)),
+        }
+    )
+
+
+def write_ohlcv(root: str, tickers: Iterable[str], years: float) -> List[str]:
+    """Write the price CSVs read by the local vendor and by stockstats."""
+    paths = []
+    for ticker in tickers:
+        frame = synthetic_ohlcv(ticker, years)
+        frame["Date"] = frame["Date"].dt.strftime("%Y-%m-%d")
+        for directory in ("market_data/price_data", "data_cache"):
+            path = os.path.join(_ensure_dir(os.path.join(root, directory)), PRICE_FILE.format(ticker=ticker))
+            frame.round(4).to_csv(path, index=False)
+            paths.append(path)
+    return paths
+
+
+def alpha_vantage_csv(ticker: str, years: float) -> str:
+    """Alpha Vantage TIME_SERIES_DAILY CSV (newest first, timestamp column first)."""
+    frame = synthetic_ohlcv(ticker, years).iloc[::-1]
+    frame = frame.rename(columns=str.lower).rename(columns={"date": "timestamp"})
+    frame["timestamp"] = frame["timestamp"].dt.strftime("%Y-%m-%d")
+    return frame[["timestamp", "open", "high", "low", "close", "volume"]].round(4).to_csv(index=False)
+
+
+def _simfin_tickers(count: int) -> List[str]:
+    # Real tickers first so lookups hit; the rest are padding of the same shape
+    return TICKERS + [f"T{i:04d}" for i in range(max(0, count - len(TICKERS)))]
+
+
+def write_simfin(root: str, tickers: int, periods: int) -> List[str]:
+    """Write SimFin bulk statement files for `tickers` companies x `periods` reports."""
+    base = os.path.join(root, "fundamental_data", "simfin_data_all")
+    names = _simfin_tickers(tickers)
+    paths = []
+    for statement, (filename, columns) in SIMFIN_STATEMENTS.items():
+        directory = _ensure_dir(os.path.join(base, statement, "companies", "us"))
+        for freq, step in (("quarterly", "QE"), ("annual", "YE")):
+            n_periods = periods if freq == "quarterly" else max(1, periods // 4)
+            report_dates = pd.date_range(end=END_DATE, periods=n_periods, freq=step)
+            rng = _rng(statement, freq, tickers, periods)
+            rows = len(names) * n_periods
+            frame = pd.DataFrame(
+                {
+                    "Ticker": np.repeat(names, n_periods),
+                    "SimFinId": np.repeat(np.arange(100000, 100000 + len(names)), n_periods),
+                    "Currency": "USD",
+                    "Fiscal Year": np.tile(report_dates.year, len(names)),
+                    "Fiscal Period": "FY" if freq == "annual" else np.tile(
+                        [f"Q{quarter}" for quarter in report_dates.quarter], len(names)
+                    ),
+                    "Report Date": np.tile(report_dates.strftime("%Y-%m-%d"), len(names)),
+                    "Publish Date": np.tile(
+                        (report_dates + pd.Timedelta(days=35)).strftime("%Y-%m-%d"), len(names)
+                    ),
+                    "Restated Date": np.tile(
+                        (report_dates + pd.Timedelta(days=400)).strftime("%Y-%m-%d"), len(names)
+                    ),
+                    "Shares (Basic)": rng.integers(10**7, 10**10, rows),
+                    "Shares (Diluted)": rng.integers(10**7, 10**10, rows),
+                }
+            )
+            for column in columns:
+                frame[column] = rng.integers(-10**9, 10**11, rows)
+            path = os.path.join(directory, filename.format(freq=freq))
+            frame.to_csv(path, sep=";", index=False)
+            paths.append(path)
+    return paths
+
+
+def write_finnhub(root: str, tickers: Iterable[str], days: int, per_day: int) -> List[str]:
+    """Write Finnhub news, insider sentiment and insider transaction files."""
+    dates = pd.date_range(end=END_DATE, periods=days).strftime("%Y-%m-%d")
+    paths = []
+    for ticker in tickers:
+        rng = _rng(ticker, "finnhub")
+        news, sentiment, transactions = {}, {}, {}
+        for day in dates:
+            news[day] = [
+                {
+                    "category": "company",
+                    "datetime": int(pd.Timestamp(day).timestamp()) + i,
+                    "headline": f"{ticker} {_HEADLINES[int(rng.integers(len(_HEADLINES)))]}",
+                    "id": int(rng.integers(10**8)),
+                    "related": ticker,
+                    "source": "Wire",
+                    "summary": " ".join(
+                        f"{ticker} detail {j} on {day}." for j in range(int(rng.integers(5, 20)))
+                    ),
+                    "url": f"https://news.example.com/{ticker}/{day}/{i}",
+                }
+                for i in range(int(rng.integers(0, per_day + 1)))
+            ]
+            year, month = int(day[:4]), int(day[5:7])
+            sentiment[day] = [
+                {
+                    "symbol": ticker,
+                    "year": year,
+                    "month": month,
+                    "change": int(rng.integers(-10**6, 10**6)),
+                    "mspr": round(float(rng.uniform(-100, 100)), 4),
+                }
+            ]
+            transactions[day] = [
+                {
+                    "name": f"Insider {int(rng.integers(50))}",
+                    "share": int(rng.integers(10**3, 10**7)),
+                    "change": int(rng.integers(-10**5, 10**5)),
+                    "filingDate": day,
+                    "transactionDate": day,
+                    "transactionCode": "S" if rng.random() < 0.7 else "P",
+                    "transactionPrice": round(float(rng.uniform(10, 900)), 2),
+                }
+                for _ in range(int(rng.integers(0, max(2, per_day // 2))))
+            ]
+        for data_type, data in (
+            ("news_data", news),
+            ("insider_senti", sentiment),
+            ("insider_trans", transactions),
+        ):
+            directory = _ensure_dir(os.path.join(root, "finnhub_data", data_type))
+            path = os.path.join(directory, f"{ticker}_data_formatted.json")
+            with open(path, "w") as f:
+                json.dump(data, f)
+            paths.append(path)
+    return paths
+
+
+def write_reddit(root: str, subreddits: int, posts: int, days: int = 365) -> List[str]:
+    """Write `posts` Reddit posts per subreddit spread over the last `days` days."""
+    end = int(pd.Timestamp(END_DATE).timestamp()) + 86399
+    companies = ["Nvidia", "Apple", "Microsoft", "Tesla", "Amazon"]
+    paths = []
+    for category in ("global_news", "company_news"):
+        directory = _ensure_dir(os.path.join(root, "reddit_data", category))
+        for s in range(subreddits):
+            rng = _rng(category, s, posts)
+            path = os.path.join(directory, f"sub{s}.jsonl")
+            with open(path, "w") as f:
+                for i in range(posts):
+                    subject = companies[int(rng.integers(len(companies)))]
+                    post = {
+                        "id": f"{s}_{i}",
+                        "created_utc": end - int(rng.integers(days * 86400)),
+                        "title": f"{subject} {_HEADLINES[int(rng.integers(len(_HEADLINES)))]}",
+                        "selftext": "" if rng.random() < 0.3 else f"Discussion of {subject} post {i}. " * 5,
+                        "url": f"https://reddit.example.com/r/sub{s}/{i}",
+                        "ups": int(rng.integers(0, 50000)),
+                        "upvote_ratio": round(float(rng.uniform(0.5, 1)), 2),
+                        "num_comments": int(rng.integers(0, 5000)),
+                    }
+                    f.write(json.dumps(post) + "\n")
+            paths.append(path)
+    return paths
+
+
+def generate_dataset(root: str, size: str = "small", tickers: Iterable[str] = TICKERS[:3]) -> Dict[str, Any]:
+    """Write a full synthetic data directory of the given size under `root`."""
+    scale = SIZES[size]
+    tickers = list(tickers)
+    files = (
+        write_ohlcv(root, tickers, scale["ohlcv_years"])
+        + write_simfin(root, scale["simfin_tickers"], scale["simfin_periods"])
+        + write_finnhub(root, tickers, scale["finnhub_days"], scale["finnhub_per_day"])
+        + write_reddit(root, scale["reddit_subreddits"], scale["reddit_posts"])
+    )
+    return {
+        "root": root,
+        "size": size,
+        "tickers": tickers,
+        "files": len(files),
+        "bytes": sum(os.path.getsize(path) for path in files),
+    }
@@ -279,6 +279,7 @@ async def run_trading_analysis():
     # Send progress messages
     await cl.Message(content="🔄 Initializing agents...").send()
 
+    graph = None
     try:
         # Initialize the graph
         graph = TradingAgentsGraph(
@@ -314,6 +315,10 @@ async def run_trading_analysis():
 
         # Reset config to allow retry
         cl.user_session.set("config_set", False)
+    finally:
+        # Release the graph's in-process agent memories
+        if graph is not None:
+            graph.close()
 
 
 async def run_graph_with_streaming(graph, ticker, analysis_date, shares_owned, purchase_price):
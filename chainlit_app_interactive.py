@@ -11,6 +11,7 @@ from datetime import datetime
 from dotenv import load_dotenv
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.checkpointing import new_run_id, make_thread_id
 from tradingagents.default_config import DEFAULT_CONFIG
 
 load_dotenv()
@@ -23,6 +24,7 @@ class ConfigState:
     POSITION = "position"
     PREDICTIONS = "predictions"
     READY = "ready"
+    RESUME = "resume"
 
 
 @cl.on_chat_start
@@ -74,6 +76,9 @@ async def main(message: cl.Message):
     elif state == ConfigState.READY:
         await cl.Message(content="Analysis is running. Please wait for results...").send()
 
+    elif state == ConfigState.RESUME:
+        await handle_resume(user_input)
+
 
 async def handle_model(selection: str):
     """Handle model selection."""
@@ -271,9 +276,27 @@ I'll update you as each agent completes their work."""
     await run_analysis()
 
 
-async def run_analysis():
-    """Execute the trading analysis."""
+async def handle_resume(choice: str):
+    """Resume an interrupted analysis, or start a new configuration."""
+    if choice.lower().strip() == "resume":
+        cl.user_session.set("state", ConfigState.READY)
+        await cl.Message(content="🔁 Resuming from the last completed step...").send()
+        await run_analysis(resume=True)
+        return
+
+    cl.user_session.set("state", ConfigState.MODEL)
+    await handle_model(choice)
+
+
+async def run_analysis(resume: bool = False):
+    """Execute the trading analysis.
+
+    Args:
+        resume: Continue the session's last run from its latest checkpoint
+            instead of starting a new one.
+    """
 
+    graph = None
     try:
         # Get configuration
         model = cl.user_session.get("model", "gpt-4o-mini")
@@ -288,6 +311,7 @@ async def run_analysis():
         config["enable_prediction_team"] = enable_predictions
         config["deep_think_llm"] = model
         config["quick_think_llm"] = model
+        config["checkpoint_enabled"] = True
 
         # Create graph
         await cl.Message(content="🔧 Initializing AI agents...").send()
@@ -301,18 +325,30 @@ async def run_analysis():
         # Create initial state
         await cl.Message(content="📊 Setting up analysis...").send()
 
-        init_state = graph.propagator.create_initial_state(
-            ticker,
-            datetime.now().strftime('%Y-%m-%d')
+        if resume:
+            analysis_date = cl.user_session.get("analysis_date")
+            run_id = cl.user_session.get("run_id")
+            init_state = None
+        else:
+            analysis_date = datetime.now().strftime('%Y-%m-%d')
+            run_id = new_run_id()
+            cl.user_session.set("analysis_date", analysis_date)
+            cl.user_session.set("run_id", run_id)
+
+            init_state = graph.propagator.create_initial_state(
+                ticker,
+                analysis_date
+            )
+
+            # Add position data if provided
+            if shares > 0:
+                init_state["shares_owned"] = shares
+                init_state["purchase_price"] = price
+
+        args = graph.get_run_args(
+            make_thread_id(ticker, analysis_date, run_id)
         )
 
-        # Add position data if provided
-        if shares > 0:
-            init_state["shares_owned"] = shares
-            init_state["purchase_price"] = price
-
-        args = graph.propagator.get_graph_args()
-
         # Stream the analysis with updates
         await cl.Message(content=f"🤖 Running {len(analysts)} agents for {ticker}...").send()
 
@@ -398,7 +434,6 @@ async def run_analysis():
         final_predictions = final_state.get("final_predictions", "")
 
         # Save results to file
-        analysis_date = datetime.now().strftime('%Y-%m-%d')
         results_dir = Path("results") / ticker / analysis_date
         reports_dir = results_dir / "reports"
         reports_dir.mkdir(parents=True, exist_ok=True)
@@ -492,11 +527,15 @@ Please check:
 - The ticker symbol is correct
 - You have sufficient API credits
 
-Type a new ticker to try again."""
+Type `resume` to continue from the last completed step, or pick a model (1-5) to start over."""
         ).send()
 
-        # Reset state
-        cl.user_session.set("state", ConfigState.MODEL)
+        # Completed steps are checkpointed, so the run can be resumed
+        cl.user_session.set("state", ConfigState.RESUME)
+    finally:
+        # Release the graph's in-process agent memories
+        if graph is not None:
+            graph.close()
 
 
 if __name__ == "__main__":
@@ -61,6 +61,7 @@ async def main(message: cl.Message):
 
     await cl.Message(content=f"🔄 Starting analysis for **{ticker}**...").send()
 
+    graph = None
     try:
         # Use default configuration
         config = DEFAULT_CONFIG.copy()
@@ -81,7 +82,7 @@ async def main(message: cl.Message):
             ticker,
             datetime.now().strftime('%Y-%m-%d')
         )
-        args = graph.propagator.get_graph_args()
+        args = graph.get_run_args()
 
         # Run the analysis
         await cl.Message(content="🚀 Running analysis (this may take 2-5 minutes)...").send()
@@ -126,6 +127,10 @@ Please check:
 - The ticker symbol is correct
 """
         ).send()
+    finally:
+        # Release the graph's in-process agent memories
+        if graph is not None:
+            graph.close()
 
 
 if __name__ == "__main__":
@@ -25,6 +25,7 @@ from rich.align import Align
 from rich.rule import Rule
 
 from tradingagents.graph.trading_graph import TradingAgentsGraph
+from tradingagents.graph.checkpointing import new_run_id, make_thread_id
 from tradingagents.default_config import DEFAULT_CONFIG
 from cli.models import AnalystType
 from cli.utils import *
@@ -950,11 +951,35 @@ def run_analysis():
     config["deep_think_llm"] = selections["deep_thinker"]
     config["backend_url"] = selections["backend_url"]
     config["llm_provider"] = selections["llm_provider"].lower()
+    config["checkpoint_enabled"] = True
 
     # Initialize the graph
     graph = TradingAgentsGraph(
         [analyst.value for analyst in selections["analysts"]], config=config, debug=True
     )
+    try:
+        stream_analysis(graph, selections, config)
+    finally:
+        # Release the graph's in-process agent memories
+        graph.close()
+
+
+def stream_analysis(graph, selections, config):
+    """Run the selected analysis on `graph`, streaming progress to the live display."""
+    # Offer to resume an interrupted run for the same ticker and date
+    run_id = new_run_id()
+    resume = False
+    resumable_runs = graph.get_resumable_runs(
+        selections["ticker"], selections["analysis_date"]
+    )
+    if resumable_runs:
+        console.print(
+            f"[yellow]Found an interrupted analysis for {selections['ticker']} on "
+            f"{selections['analysis_date']} (run {resumable_runs[0]}).[/yellow]"
+        )
+        if typer.confirm("Resume it from the last completed step?", default=True):
+            run_id = resumable_runs[0]
+            resume = True
 
     # Create result directory
     results_dir = Path(config["results_dir"]) / selections["ticker"] / selections["analysis_date"]
@@ -1044,12 +1069,19 @@ def run_analysis():
         )
         update_display(layout, spinner_text, enable_prediction_team=enable_prediction_team)
 
-        # Initialize state and get graph args
-        init_agent_state = graph.propagator.create_initial_state(
-            selections["ticker"], selections["analysis_date"],
-            selections["shares_owned"], selections["purchase_price"]
+        # Initialize state and get graph args. When resuming, the graph picks up
+        # from its last checkpoint, so no initial state is passed in.
+        if resume:
+            init_agent_state = None
+            message_buffer.add_message("System", f"Resuming run {run_id}")
+        else:
+            init_agent_state = graph.propagator.create_initial_state(
+                selections["ticker"], selections["analysis_date"],
+                selections["shares_owned"], selections["purchase_price"]
+            )
+        args = graph.get_run_args(
+            make_thread_id(selections["ticker"], selections["analysis_date"], run_id)
         )
-        args = graph.propagator.get_graph_args()
 
         # Stream the analysis
         trace = []
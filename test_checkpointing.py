@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""Test SQLite checkpointing, resumable run discovery and resume."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import os
+import tempfile
+from contextlib import contextmanager
+from typing import TypedDict
+
+from langgraph.checkpoint.memory import MemorySaver
+from langgraph.graph import END, START, StateGraph
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+from graph_benchmark import ScriptedChatModel, offline_graph  # noqa: E402
+from tradingagents.graph.checkpointing import (  # noqa: E402
+    LocalSqliteSaver,
+    create_checkpointer,
+    list_run_ids,
+    make_thread_id,
+)
+
+
+@contextmanager
+def in_temp_dir():
+    """Run in a temporary directory (propagate writes ./eval_results)."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            yield directory
+        finally:
+            os.chdir(previous)
+
+
+class FlakyChatModel(ScriptedChatModel):
+    """Scripted model that fails the first time it is asked to act as the trader."""
+
+    failures: int = 1
+    trader_calls: int = 0
+    analyst_calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        text = "\n".join(str(message.content) for message in messages)
+        if tools:
+            self.analyst_calls += 1
+        if "You are a trading agent analyzing market data" in text:
+            self.trader_calls += 1
+            if self.failures:
+                self.failures -= 1
+                raise RuntimeError("provider outage")
+        return super()._generate(messages, stop, run_manager, tools, **kwargs)
+
+
+class State(TypedDict):
+    value: int
+
+
+def _tiny_graph(checkpointer):
+    builder = StateGraph(State)
+    builder.add_node("step", lambda state: {"value": state["value"] + 1})
+    builder.add_edge(START, "step")
+    builder.add_edge("step", END)
+    return builder.compile(checkpointer=checkpointer)
+
+
+def test_list_run_ids():
+    """Run ids are listed per ticker and date from SQLite and generic savers."""
+    print("Testing list_run_ids")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        checkpointer = create_checkpointer(
+            {"checkpoint_enabled": True, "results_dir": directory}
+        )
+        assert isinstance(checkpointer, LocalSqliteSaver)
+        assert os.path.exists(os.path.join(directory, "checkpoints.sqlite"))
+
+        for saver in (checkpointer, MemorySaver()):
+            graph = _tiny_graph(saver)
+            for ticker, date, run_id in [
+                ("NVDA", "2025-06-02", "20250602T090000-aaaaaa"),
+                ("NVDA", "2025-06-02", "20250602T100000-bbbbbb"),
+                ("NVDA", "2025-06-03", "20250603T090000-cccccc"),
+                ("NVDAX", "2025-06-02", "20250602T110000-dddddd"),
+            ]:
+                config = {"configurable": {"thread_id": make_thread_id(ticker, date, run_id)}}
+                graph.invoke({"value": 0}, config)
+
+            assert list_run_ids(saver, "nvda", "2025-06-02") == [
+                "20250602T100000-bbbbbb",
+                "20250602T090000-aaaaaa",
+            ]
+            assert list_run_ids(saver, "AAPL", "2025-06-02") == []
+            print(f"✓ {type(saver).__name__}: newest first, scoped to ticker and date")
+
+    assert create_checkpointer({"checkpoint_enabled": False}) is None
+
+
+def test_resume_interrupted_run():
+    """A run that fails mid-graph resumes from its last completed node."""
+    print("Testing resume")
+    print("=" * 60)
+
+    with in_temp_dir() as directory:
+        llm = FlakyChatModel(response_chars=400)
+        graph = offline_graph(
+            os.path.join(directory, "results"),
+            llm,
+            analysts="market",
+            checkpoint_enabled=True,
+            enable_prediction_team=False,
+        )
+
+        try:
+            graph.propagate("NVDA", "2025-06-02")
+            raise AssertionError("the trader failure should propagate")
+        except RuntimeError:
+            pass
+        run_id = graph.run_id
+        assert graph.get_resumable_runs("NVDA", "2025-06-02") == [run_id]
+        analyst_calls = llm.analyst_calls
+        print(f"✓ Interrupted run {run_id} is resumable")
+
+        final_state, decision = graph.propagate("NVDA", "2025-06-02", run_id=run_id, resume=True)
+        assert decision == "BUY"
+        assert final_state["market_report"]
+        assert llm.analyst_calls == analyst_calls, "analysts must not run again"
+        assert llm.trader_calls == 2
+        assert graph.get_resumable_runs("NVDA", "2025-06-02") == []
+        print("✓ Resumed from the trader without rerunning the analysts")
+
+        try:
+            graph.propagate("NVDA", "2025-06-02", resume=True)
+            raise AssertionError("resume without a run id should be rejected")
+        except ValueError:
+            pass
+
+
+if __name__ == "__main__":
+    test_list_run_ids()
+    test_resume_interrupted_run()
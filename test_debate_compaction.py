@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""Test rolling compaction of debate histories."""
+
+import sys
+sys.dont_write_bytecode = True
+
+from types import SimpleNamespace
+
+from tradingagents.agents.utils.debate_compaction import (
+    compact_debate_history,
+    split_turns,
+)
+from tradingagents.dataflows.config import set_config
+
+
+class SummaryLLM:
+    """Stand-in model that records how many summaries it was asked for."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def invoke(self, prompt):
+        self.calls += 1
+        return SimpleNamespace(content=f"summary #{self.calls}")
+
+
+def _history(n_turns):
+    speakers = ["Bull Analyst", "Bear Analyst"]
+    return "".join(
+        f"\n{speakers[i % 2]}: argument {i} " + "word " * 50 for i in range(n_turns)
+    )
+
+
+def test_split_turns():
+    """Turns are split on the speaker labels debaters prefix to their arguments."""
+    print("Testing split_turns")
+    print("=" * 60)
+
+    turns = split_turns(_history(4))
+    assert len(turns) == 4
+    assert turns[0].startswith("Bull Analyst: argument 0")
+    assert turns[3].startswith("Bear Analyst: argument 3")
+    print(f"✓ Split history into {len(turns)} turns")
+
+
+def test_history_under_budget_is_unchanged():
+    """Histories within budget are sent verbatim without calling the model."""
+    print("\nTesting history under budget")
+    print("=" * 60)
+
+    set_config({"debate_compaction": {"investment": {"max_history_tokens": 10000}}})
+    llm = SummaryLLM()
+    history = _history(2)
+
+    text, fields = compact_debate_history(llm, {"history": history}, "investment")
+    assert text == history
+    assert fields == {"history_summary": "", "summarized_turns": 0}
+    assert llm.calls == 0
+    print("✓ History passed through unchanged")
+
+
+def test_history_over_budget_is_compacted():
+    """Older turns are folded into the summary, keeping the last K verbatim."""
+    print("\nTesting history over budget")
+    print("=" * 60)
+
+    set_config(
+        {"debate_compaction": {"investment": {"max_history_tokens": 50, "keep_last_turns": 2}}}
+    )
+    llm = SummaryLLM()
+
+    text, fields = compact_debate_history(llm, {"history": _history(5)}, "investment")
+    assert fields["summarized_turns"] == 3
+    assert fields["history_summary"] == "summary #1"
+    assert "argument 3" in text and "argument 4" in text
+    assert "argument 2" not in text
+    print("✓ Folded 3 turns and kept the last 2 verbatim")
+
+    # The next turn only folds what is new since the last summary
+    state = {"history": _history(6), **fields}
+    text, fields = compact_debate_history(llm, state, "investment")
+    assert fields["summarized_turns"] == 4
+    assert llm.calls == 2
+    print("✓ Summary updated incrementally")
+
+    # Nothing new to fold leaves the summary untouched
+    text, fields = compact_debate_history(llm, state | fields, "investment")
+    assert llm.calls == 2
+    print("✓ No extra summary call when nothing new falls out of the window")
+
+
+if __name__ == "__main__":
+    test_split_turns()
+    test_history_under_budget_is_unchanged()
+    test_history_over_budget_is_compacted()
@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""Test the shared embedding cache and retrieval memoization of agent memories."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import os
+import tempfile
+from types import SimpleNamespace
+
+os.environ.setdefault("OPENAI_API_KEY", "test")
+
+from tradingagents.agents.utils.embeddings import HashingEmbedder
+from tradingagents.agents.utils import memory as memory_module
+from tradingagents.agents.utils.memory import EmbeddingCache, FinancialSituationMemory
+
+
+class CountingEmbeddings:
+    """Stand-in for `client.embeddings` that counts remote calls."""
+
+    def __init__(self):
+        self.calls = 0
+
+    def create(self, model, input):
+        self.calls += 1
+        return SimpleNamespace(
+            data=[
+                SimpleNamespace(index=i, embedding=[float(ord(c)) for c in text[:8].ljust(8)])
+                for i, text in enumerate(input)
+            ]
+        )
+
+
+def _memory(name, cache, embeddings):
+    memory = FinancialSituationMemory(name, {"backend_url": "https://api.openai.com/v1"}, cache)
+    memory.embedder.client = SimpleNamespace(embeddings=embeddings)
+    return memory
+
+
+def test_shared_cache():
+    """Memories sharing a cache embed the same situation once."""
+    print("Testing shared embedding cache")
+    print("=" * 60)
+
+    embeddings = CountingEmbeddings()
+    cache = EmbeddingCache()
+    bull = _memory("cache_test_bull", cache, embeddings)
+    bear = _memory("cache_test_bear", cache, embeddings)
+    bull.add_situations([("rates rising", "reduce duration")])
+    bear.add_situations([("rates rising", "buy banks")])
+    assert embeddings.calls == 1
+
+    situation = "tech selloff"
+    assert bull.get_memories(situation)[0]["recommendation"] == "reduce duration"
+    assert bear.get_memories(situation)[0]["recommendation"] == "buy banks"
+    bull.get_memories(situation)
+    assert embeddings.calls == 2
+    print(f"✓ {embeddings.calls} embedding calls, cache {cache.stats()}")
+
+
+def test_retrieval_memo_invalidated_on_add():
+    """Adding situations invalidates memoized query results."""
+    print("\nTesting retrieval memoization")
+    print("=" * 60)
+
+    memory = _memory("cache_test_memo", EmbeddingCache(), CountingEmbeddings())
+    memory.add_situations([("aaaa", "first")])
+    assert len(memory.get_memories("aaab", n_matches=2)) == 1
+    memory.add_situations([("aaab", "second")])
+    assert len(memory.get_memories("aaab", n_matches=2)) == 2
+    print("✓ New situations are visible after an add")
+
+    limit = memory_module.RETRIEVAL_CACHE_SIZE
+    memory_module.RETRIEVAL_CACHE_SIZE = 2
+    try:
+        for situation in ("aaab", "bbbb", "aaab", "cccc"):
+            memory.get_memories(situation)
+        assert len(memory._retrieval_cache) == 2
+        kept = [EmbeddingCache.make_key(memory.embedding, s) for s in ("aaab", "cccc")]
+        assert [key[0] for key in memory._retrieval_cache] == kept
+    finally:
+        memory_module.RETRIEVAL_CACHE_SIZE = limit
+    print("✓ Least recently used results evicted beyond the limit")
+
+
+def test_disk_cache():
+    """A disk cache serves embeddings to a new process."""
+    print("\nTesting persisted embeddings")
+    print("=" * 60)
+
+    path = os.path.join(tempfile.mkdtemp(), "embeddings.sqlite")
+    EmbeddingCache(path).put("model", "text", [0.1, 0.2])
+    assert EmbeddingCache(path).get("model", "text") == [0.1, 0.2]
+    assert EmbeddingCache(path).get("other-model", "text") is None
+    print("✓ Embedding reloaded from disk")
+
+
+def test_local_hashing_backend():
+    """The hashing backend retrieves by term overlap without any network calls."""
+    print("\nTesting local hashing embeddings")
+    print("=" * 60)
+
+    embedder = HashingEmbedder(dim=256)
+    a, b = embedder.embed(["Rising rates hit tech stocks", "Rising rates hit tech stocks"])
+    assert a == b and abs(sum(v * v for v in a) - 1) < 1e-5
+
+    memory = FinancialSituationMemory(
+        "cache_test_hashing",
+        {"backend_url": "https://api.openai.com/v1", "embedding_backend": "hashing"},
+    )
+    memory.add_situations(
+        [
+            ("Rising interest rates pressure tech valuations", "trim growth"),
+            ("Oil supply shock lifts energy producers", "add energy"),
+        ]
+    )
+    match = memory.get_memories("tech valuations fall as interest rates climb")[0]
+    assert match["recommendation"] == "trim growth"
+    print(f"✓ Matched with similarity {match['similarity_score']:.2f}")
+
+
+def test_chunked_situations():
+    """Long situations are stored as several chunks and matched as one entry."""
+    print("\nTesting chunked situations")
+    print("=" * 60)
+
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "embedding_backend": "hashing",
+        "memory_chunk_tokens": 50,
+    }
+    memory = FinancialSituationMemory("cache_test_chunks", config)
+    energy = "Energy producers rally on an oil supply shock.\n\n" + "Filler text. " * 200
+    rates = "Rising interest rates pressure tech valuations.\n\n" + "Other words. " * 200
+    memory.add_situations([(energy, "add energy"), (rates, "trim growth")])
+    assert memory.situation_collection.count() > 2
+
+    matches = memory.get_memories("oil supply shock lifts energy producers", n_matches=2)
+    assert [m["recommendation"] for m in matches] == ["add energy", "trim growth"]
+    assert matches[0]["matched_situation"] == energy
+    print(f"✓ {memory.situation_collection.count()} chunks, situation reassembled")
+
+
+if __name__ == "__main__":
+    test_shared_cache()
+    test_retrieval_memo_invalidated_on_add()
+    test_disk_cache()
+    test_local_hashing_backend()
+    test_chunked_situations()
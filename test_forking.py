@@ -0,0 +1,88 @@
+#!/usr/bin/env python3
+"""Test forking downstream variants from a graph state snapshot."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import os
+import tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+from graph_benchmark import ScriptedChatModel, offline_graph  # noqa: E402
+
+
+class CountingChatModel(ScriptedChatModel):
+    """Scripted model that counts analyst (tool-bound) and total calls."""
+
+    calls: int = 0
+    analyst_calls: int = 0
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        self.calls += 1
+        if tools:
+            self.analyst_calls += 1
+        return super()._generate(messages, stop, run_manager, tools, **kwargs)
+
+
+def test_run_variants():
+    """Variants share the upstream run and apply their own position and routing."""
+    print("Testing run_variants")
+    print("=" * 60)
+
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            llm = CountingChatModel(response_chars=400)
+            graph = offline_graph(
+                os.path.join(directory, "results"),
+                llm,
+                analysts="market",
+                enable_prediction_team=False,
+            )
+
+            snapshot = graph.snapshot("NVDA", "2025-06-02")
+            assert snapshot["after_node"] == "Research Manager"
+            assert snapshot["values"]["investment_plan"]
+            analyst_calls = llm.analyst_calls
+            print(f"✓ Snapshot after {snapshot['after_node']} ({analyst_calls} analyst calls)")
+
+            results = graph.run_variants(
+                snapshot,
+                [
+                    {"shares_owned": 0},
+                    {"shares_owned": 100, "purchase_price": 80.0},
+                    {"config": {"max_risk_discuss_rounds": 2}},
+                ],
+                max_workers=2,
+            )
+            assert llm.analyst_calls == analyst_calls, "variants must not rerun the analysts"
+            assert [state["shares_owned"] for state, _ in results] == [0, 100, 0]
+            assert results[1][0]["purchase_price"] == 80.0
+            assert [signal for _, signal in results] == ["BUY", "BUY", "BUY"]
+            risk_turns = [state["risk_debate_state"]["count"] for state, _ in results]
+            assert risk_turns == [3, 3, 6], risk_turns
+            print(f"✓ Three variants, risk debate turns {risk_turns}")
+
+            # The debaters of the snapshot run and every variant count into the graph's stats
+            cache_calls = graph.run_collectors["prompt_cache_stats"].snapshot()["calls"]
+            assert cache_calls == 2 + sum(risk_turns), cache_calls
+
+            calls = llm.calls
+            for bad in (
+                {"config": {"deep_think_llm": "gpt-4o"}},
+                {"config": {"memory_min_similarity": 0.5}},
+                {"position": 10},
+            ):
+                try:
+                    graph.run_variants(snapshot, [{"shares_owned": 1}, bad])
+                    raise AssertionError(f"{bad} should be rejected")
+                except ValueError as error:
+                    print(f"✓ Rejected: {error}")
+            assert llm.calls == calls, "nothing runs when a variant is invalid"
+        finally:
+            os.chdir(previous)
+
+
+if __name__ == "__main__":
+    test_run_variants()
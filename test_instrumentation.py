@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""Test per-node latency, token, tool-call and cost instrumentation."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import os
+import tempfile
+from typing import TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langgraph.graph import END, START, StateGraph
+
+from langchain_core.outputs import ChatGeneration, ChatResult
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+from graph_benchmark import ScriptedChatModel, offline_graph  # noqa: E402
+from tradingagents.graph.instrumentation import (  # noqa: E402
+    OUTSIDE_GRAPH,
+    RunMetrics,
+    metrics_to_json,
+    metrics_to_prometheus,
+)
+
+
+class State(TypedDict):
+    report: str
+
+
+def fake_llm():
+    return GenericFakeChatModel(
+        messages=iter(
+            [
+                AIMessage(
+                    content="",
+                    tool_calls=[
+                        {"name": "get_stock_data", "args": {}, "id": "1"},
+                        {"name": "get_indicators", "args": {}, "id": "2"},
+                    ],
+                    usage_metadata={
+                        "input_tokens": 1000,
+                        "output_tokens": 50,
+                        "total_tokens": 1050,
+                        "input_token_details": {"cache_read": 400},
+                    },
+                ),
+                AIMessage(
+                    content="Report",
+                    usage_metadata={"input_tokens": 2000, "output_tokens": 500, "total_tokens": 2500},
+                ),
+                AIMessage(
+                    content="Cached report",
+                    usage_metadata={
+                        "input_tokens": 2000,
+                        "output_tokens": 500,
+                        "total_tokens": 2500,
+                        "total_cost": 0,
+                    },
+                ),
+                AIMessage(
+                    content="Reflection",
+                    usage_metadata={"input_tokens": 100, "output_tokens": 10, "total_tokens": 110},
+                ),
+            ]
+        )
+    )
+
+
+def test_run_metrics():
+    """LLM calls are attributed to graph nodes, priced, and exported."""
+    print("Testing run instrumentation")
+    print("=" * 60)
+
+    # $1 / $0.5 / $2 per million input, cached input and output tokens
+    metrics = RunMetrics({"generic-fake": [1.0, 0.5, 2.0]})
+    llm = fake_llm()
+    llm.callbacks = [metrics]
+
+    def analyst(state):
+        llm.invoke("Pick tools")
+        return {"report": llm.invoke("Write the report").content}
+
+    def manager(state):
+        return {"report": llm.invoke("Summarize").content}
+
+    builder = StateGraph(State)
+    builder.add_node("Analyst", analyst)
+    builder.add_node("Manager", manager)
+    builder.add_edge(START, "Analyst")
+    builder.add_edge("Analyst", "Manager")
+    builder.add_edge("Manager", END)
+    builder.compile().invoke({"report": ""}, {"callbacks": [metrics]})
+    llm.invoke("Reflect")
+
+    snapshot = metrics.snapshot()
+    analyst_stats = snapshot["nodes"]["Analyst"]
+    assert analyst_stats["calls"] == 1 and analyst_stats["llm_calls"] == 2
+    assert analyst_stats["input_tokens"] == 3000 and analyst_stats["cached_tokens"] == 400
+    assert analyst_stats["tool_calls"] == 2
+    assert snapshot["tools"] == {"get_indicators": 1, "get_stock_data": 1}
+    expected = (600 * 1.0 + 400 * 0.5 + 50 * 2.0 + 2000 * 1.0 + 500 * 2.0) / 1e6
+    assert abs(analyst_stats["cost_usd"] - expected) < 1e-9
+    assert analyst_stats["wall_ms"] > 0
+    print(f"✓ Analyst: {analyst_stats['llm_calls']} LLM calls, ${analyst_stats['cost_usd']:.6f}")
+
+    # A response served from the LLM cache is counted but not billed
+    manager_stats = snapshot["nodes"]["Manager"]
+    assert manager_stats["llm_cache_hits"] == 1
+    assert manager_stats["input_tokens"] == 0 and manager_stats["cost_usd"] == 0
+    print("✓ Cache hits not billed")
+
+    assert snapshot["nodes"][OUTSIDE_GRAPH]["llm_calls"] == 1
+    assert snapshot["totals"]["llm_calls"] == 4
+    assert snapshot["totals"]["unpriced_models"] == []
+    print("✓ Calls outside the graph counted once")
+
+    text = metrics_to_prometheus(snapshot, ticker="NVDA")
+    assert "# TYPE tradingagents_llm_input_tokens_total counter" in text
+    assert 'tradingagents_llm_input_tokens_total{ticker="NVDA",node="Analyst"} 3000' in text
+    assert 'tradingagents_tool_requests_total{ticker="NVDA",tool="get_stock_data"} 1' in text
+    assert '"ticker": "NVDA"' in metrics_to_json(snapshot, ticker="NVDA")
+    print("✓ Prometheus and JSON export")
+
+    metrics.reset()
+    assert metrics.snapshot()["nodes"] == {}
+    assert RunMetrics().price("openai/gpt-4o-mini-2024-07-18") == (0.15, 0.075, 0.60)
+    assert RunMetrics().price("my-local-model") is None
+    print("✓ Reset and longest-prefix pricing")
+
+
+class AmbiguousJudgeModel(ScriptedChatModel):
+    """Scripted model whose risk judge leaves the decision ambiguous."""
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs):
+        text = "\n".join(str(message.content) for message in messages)
+        if "Risk Management Judge" in text:
+            answer = "Recommendation: Buy\nFinal Decision: Sell"
+        elif "extract the investment decision" in text:
+            answer = "HOLD"
+        else:
+            return super()._generate(messages, stop, run_manager, tools, **kwargs)
+        return ChatResult(generations=[ChatGeneration(message=AIMessage(content=answer))])
+
+
+def test_graph_metrics_cover_calls_outside_the_graph():
+    """Signal fallback and reflection calls are reported without touching the models."""
+    print("\nTesting graph run metrics")
+    print("=" * 60)
+
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            llm = AmbiguousJudgeModel(response_chars=400)
+            graph = offline_graph(
+                os.path.join(directory, "results"),
+                llm,
+                analysts="market",
+                enable_prediction_team=False,
+            )
+            # A second graph sharing the model must not count into the first one
+            other = offline_graph(os.path.join(directory, "other"), llm, analysts="market")
+            assert llm.callbacks is None, "handlers must not be attached to shared models"
+
+            _, decision = graph.propagate("NVDA", "2025-06-02")
+            assert decision == "HOLD" and graph.curr_signal["source"] == "llm"
+            assert graph.run_metrics["nodes"][OUTSIDE_GRAPH]["llm_calls"] == 1
+            graph_calls = graph.run_metrics["totals"]["llm_calls"]
+            print(f"✓ Signal fallback counted ({graph_calls} LLM calls)")
+
+            other.propagate("NVDA", "2025-06-02")
+            assert graph.instrumentation.snapshot()["totals"]["llm_calls"] == graph_calls
+
+            reflections = graph.reflect_and_remember(1000)
+            assert graph.run_metrics["nodes"][OUTSIDE_GRAPH]["llm_calls"] == 1 + len(reflections)
+            assert graph.run_metrics["totals"]["llm_calls"] == graph_calls + len(reflections)
+            assert f'"llm_calls": {graph_calls + len(reflections)}' in graph.export_run_metrics()
+            print(f"✓ {len(reflections)} reflection calls added to the run metrics")
+        finally:
+            os.chdir(previous)
+
+
+if __name__ == "__main__":
+    test_run_metrics()
+    test_graph_metrics_cover_calls_outside_the_graph()
@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""Test the persistent exact-match LLM response cache."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import os
+import tempfile
+import time
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage
+from langchain_core.outputs import ChatGeneration
+
+from tradingagents.graph.llm_cache import SQLiteLLMCache, create_llm_cache
+
+
+def fake_llm(cache, *answers):
+    return GenericFakeChatModel(
+        messages=iter([AIMessage(content=answer) for answer in answers]), cache=cache
+    )
+
+
+def test_cache_modes():
+    """read_write stores and serves responses, read_only only serves them."""
+    print("Testing LLM cache modes")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        assert create_llm_cache({"llm_cache_mode": "off", "results_dir": directory}) is None
+        try:
+            create_llm_cache({"llm_cache_mode": "sometimes", "results_dir": directory})
+            raise AssertionError("unknown modes should be rejected")
+        except ValueError:
+            pass
+
+        cache = create_llm_cache({"llm_cache_mode": "read_write", "results_dir": directory})
+        assert cache.path == os.path.join(directory, "llm_cache.sqlite")
+
+        llm = fake_llm(cache, "first", "second")
+        assert llm.invoke("Analyze NVDA").content == "first"
+        assert llm.invoke("Analyze NVDA").content == "first"  # served from the cache
+        assert llm.invoke("Analyze AAPL").content == "second"
+        assert cache.stats()["entries"] == 2 and cache.hits == 1
+        print(f"✓ read_write: {cache.stats()}")
+
+        # A new process reading the same file in read-only mode
+        reader = SQLiteLLMCache(cache.path, mode="read_only")
+        llm = fake_llm(reader, "fresh", "fresher")
+        assert llm.invoke("Analyze NVDA").content == "first"
+        assert llm.invoke("Analyze MSFT").content == "fresh"
+        assert reader.stats()["entries"] == 2, "read_only must not store"
+        print("✓ read_only serves hits without storing misses")
+
+        cache.clear()
+        assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction():
+    """Least-recently-used entries are evicted once the cache exceeds max_bytes."""
+    print("Testing LLM cache eviction")
+    print("=" * 60)
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "cache.sqlite")
+        generation = [ChatGeneration(message=AIMessage(content="x" * 500))]
+        cache = SQLiteLLMCache(path, max_bytes=10**9)
+        cache.update("probe", "llm", generation)
+        entry_size = cache.stats()["bytes"]
+        cache.clear()
+
+        cache.max_bytes = entry_size * 3
+        for key in ("a", "b", "c"):
+            cache.update(key, "llm", generation)
+            time.sleep(0.01)
+        assert cache.lookup("a", "llm") is not None  # "a" becomes most recently used
+        time.sleep(0.01)
+        cache.update("d", "llm", generation)
+
+        assert cache.stats()["entries"] == 3
+        assert cache.lookup("b", "llm") is None, "least recently used entry evicted"
+        for key in ("a", "c", "d"):
+            assert cache.lookup(key, "llm")[0].message.content == "x" * 500
+        print(f"✓ Evicted the LRU entry at {cache.stats()['bytes']} / {cache.max_bytes} bytes")
+
+
+if __name__ == "__main__":
+    test_cache_modes()
+    test_lru_eviction()
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""Test the market snapshot computed from price history."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import pandas as pd
+
+from tradingagents.agents.utils.agent_utils import resolve_current_price
+from tradingagents.dataflows.market_snapshot import (
+    compute_market_snapshot,
+    format_market_snapshot,
+)
+from tradingagents.graph.propagation import Propagator
+
+
+# 300 business days of rising prices with a constant 2.0 daily range
+PRICES = pd.DataFrame(
+    {
+        "Date": pd.bdate_range("2023-01-02", periods=300).strftime("%Y-%m-%d"),
+        "Open": [100.0 + i for i in range(300)],
+        "High": [101.0 + i for i in range(300)],
+        "Low": [99.0 + i for i in range(300)],
+        "Close": [100.0 + i for i in range(300)],
+    }
+)
+
+
+def test_compute_snapshot():
+    """Values are taken from rows on or before the trade date only."""
+    print("Testing snapshot computation")
+    print("=" * 60)
+
+    trade_date = PRICES["Date"].iloc[279]
+    snapshot = compute_market_snapshot(PRICES, trade_date)
+    assert snapshot["as_of"] == trade_date
+    assert snapshot["last_close"] == 379.0
+    assert snapshot["previous_close"] == 378.0
+    assert snapshot["change_pct"] == round(1 / 378 * 100, 2)
+    assert snapshot["week52_high"] == 380.0
+    assert snapshot["week52_low"] == 99.0 + 28
+    assert snapshot["atr14"] == 2.0
+    print(f"✓ {snapshot}")
+
+    assert compute_market_snapshot(PRICES, "2022-12-30") is None
+    print("✓ No snapshot before the first close")
+
+
+def test_format_snapshot():
+    """The prompt line leaves out a change that cannot be computed."""
+    print("\nTesting snapshot formatting")
+    print("=" * 60)
+
+    snapshot = compute_market_snapshot(PRICES, PRICES["Date"].iloc[279])
+    line = format_market_snapshot(snapshot)
+    assert "previous close $378.00 (+0.26%)" in line
+    print(f"✓ {line}")
+
+    halted = PRICES.copy()
+    halted.loc[278, "Close"] = 0.0
+    snapshot = compute_market_snapshot(halted, halted["Date"].iloc[279])
+    assert snapshot["previous_close"] == 0.0 and snapshot["change_pct"] is None
+    line = format_market_snapshot(snapshot)
+    assert "previous close $0.00;" in line and "%" not in line
+    assert format_market_snapshot(None) == ""
+    print(f"✓ Zero previous close: {line}")
+
+
+def test_initial_state_and_price():
+    """The propagator injects the snapshot; failures leave it empty."""
+    print("\nTesting snapshot injection")
+    print("=" * 60)
+
+    propagator = Propagator(
+        snapshot_provider=lambda ticker, date: compute_market_snapshot(PRICES, date)
+    )
+    state = propagator.create_initial_state("NVDA", "2023-06-01")
+    state["market_report"] = "The current price is $1.00"
+    assert state["market_snapshot"]["as_of"] == "2023-06-01"
+    assert resolve_current_price(state) == state["market_snapshot"]["last_close"]
+    print("✓ Snapshot price preferred over the report")
+
+    def failing_provider(ticker, date):
+        raise ConnectionError("offline")
+
+    state = Propagator(snapshot_provider=failing_provider).create_initial_state(
+        "NVDA", "2023-06-01"
+    )
+    state["market_report"] = "| Close | 123.45 |"
+    assert state["market_snapshot"] is None
+    assert resolve_current_price(state) == 123.45
+    print("✓ Fell back to the market report")
+
+
+if __name__ == "__main__":
+    test_compute_snapshot()
+    test_format_snapshot()
+    test_initial_state_and_price()
@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""Test the persistent on-disk memory store."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "benchmarks"))
+from graph_benchmark import offline_graph  # noqa: E402
+from tradingagents.agents.utils.memory import (  # noqa: E402
+    MemoryRegistry,
+    NumpyCollection,
+    memory_registry,
+)
+from tradingagents.agents.utils.memory_store import (  # noqa: E402
+    PersistentCollection,
+    RECORDS_FILE,
+    VECTORS_FILE,
+    find_snapshot_tag,
+    load_snapshot_manifest,
+    open_snapshot_collection,
+    save_snapshot_manifest,
+)
+
+
+def _add(collection, rows):
+    offset = collection.count()
+    collection.add(
+        documents=[doc for doc, _ in rows],
+        metadatas=[{"recommendation": rec} for _, rec in rows],
+        embeddings=[[1.0, float(i), 0.0] for i, _ in enumerate(rows, offset)],
+        ids=[str(offset + i) for i in range(len(rows))],
+    )
+
+
+def test_survives_reopen():
+    """Rows written by one instance are read back by a new one."""
+    print("Testing persistence")
+    print("=" * 60)
+
+    directory = os.path.join(tempfile.mkdtemp(), "bull_memory")
+    _add(PersistentCollection(directory), [("a", "first"), ("b", "second")])
+
+    reopened = PersistentCollection(directory)
+    assert reopened.count() == 2
+    results = reopened.query(query_embeddings=[[1.0, 1.0, 0.0]], n_results=5)
+    assert results["documents"][0] == ["b", "a"]
+    assert results["metadatas"][0][0] == {"recommendation": "second"}
+    assert abs(results["distances"][0][0]) < 1e-6
+    print("✓ Rows reloaded and ranked by cosine similarity")
+
+
+def test_concurrent_reader_sees_appends():
+    """A reader opened earlier picks up rows appended by another writer."""
+    print("\nTesting reader refresh")
+    print("=" * 60)
+
+    directory = os.path.join(tempfile.mkdtemp(), "trader_memory")
+    reader, writer = PersistentCollection(directory), PersistentCollection(directory)
+    assert reader.query(query_embeddings=[[1.0, 0.0, 0.0]])["documents"] == [[]]
+    _add(writer, [("a", "first")])
+    assert reader.count() == 1
+    print("✓ Reader refreshed")
+
+
+def test_torn_write_recovery():
+    """A partial record line and unreferenced vectors are discarded on open."""
+    print("\nTesting torn write recovery")
+    print("=" * 60)
+
+    directory = os.path.join(tempfile.mkdtemp(), "risk_manager_memory")
+    _add(PersistentCollection(directory), [("a", "first")])
+    with open(os.path.join(directory, VECTORS_FILE), "ab") as f:
+        f.write(b"\x00" * 12)
+    with open(os.path.join(directory, RECORDS_FILE), "ab") as f:
+        f.write(b'{"id": "1", "docu')
+
+    collection = PersistentCollection(directory)
+    assert collection.count() == 1
+    _add(collection, [("b", "second")])
+    assert PersistentCollection(directory).count() == 2
+    print("✓ Torn write discarded and appends continue")
+
+
+def _add_situation(collection, situation_id, vector, recommendation):
+    collection.add(
+        documents=[situation_id],
+        metadatas=[{"recommendation": recommendation, "situation_id": situation_id}],
+        embeddings=[vector],
+        ids=[f"{situation_id}-0"],
+    )
+
+
+def test_numpy_quantized_search():
+    """Quantized stores rank like float32 search."""
+    print("\nTesting quantized NumPy search")
+    print("=" * 60)
+
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(200, 64))
+    query = vectors[17] + rng.normal(scale=0.1, size=64)
+    for dtype in ("float16", "int8"):
+        collection = NumpyCollection("quantized", dtype=dtype, dedup_threshold=None)
+        for i, vector in enumerate(vectors):
+            _add_situation(collection, str(i), vector, f"rec {i}")
+        results = collection.query(query_embeddings=[query], n_results=3)
+        assert results["ids"][0][0] == "17-0"
+        print(f"✓ {dtype}: {collection.nbytes()} bytes for {collection.count()} vectors")
+
+
+def test_numpy_dedup_and_eviction():
+    """Near-duplicates update in place; capacity evicts least recently matched."""
+    print("\nTesting deduplication and eviction")
+    print("=" * 60)
+
+    collection = NumpyCollection("evicting", max_entries=2, eviction="lru")
+    _add_situation(collection, "a", [1.0, 0.0, 0.0], "old advice")
+    _add_situation(collection, "a2", [1.0, 0.001, 0.0], "new advice")
+    assert collection.count() == 1
+    assert collection.query(query_embeddings=[[1.0, 0.0, 0.0]])["metadatas"][0][0][
+        "recommendation"
+    ] == "new advice"
+    print("✓ Near-duplicate replaced the stored advice")
+
+    _add_situation(collection, "b", [0.0, 1.0, 0.0], "b")
+    collection.touch(["a"])
+    _add_situation(collection, "c", [0.0, 0.0, 1.0], "c")
+    ids = collection.query(query_embeddings=[[1.0, 1.0, 1.0]], n_results=5)["ids"][0]
+    assert sorted(ids) == ["a-0", "c-0"]
+    print("✓ Least recently matched situation evicted")
+
+
+def test_registry_namespaces():
+    """Namespaces isolate same-named memories; get-or-create is shared and thread-safe."""
+    print("\nTesting memory registry")
+    print("=" * 60)
+
+    registry = MemoryRegistry()
+    config = {"memory_backend": "chroma"}
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        collections = list(
+            pool.map(
+                lambda _: registry.get_or_create_collection("bull_memory", config, "tenant_a"),
+                range(16),
+            )
+        )
+    assert all(c is collections[0] for c in collections)
+
+    other = registry.get_or_create_collection("bull_memory", config, "tenant_b")
+    collections[0].add(documents=["a"], metadatas=[{"recommendation": "x"}], embeddings=[[1.0, 0.0]], ids=["0"])
+    assert other.count() == 0
+    print("✓ One collection per namespace")
+
+    registry.drop_namespace("tenant_a")
+    fresh = registry.get_or_create_collection("bull_memory", config, "tenant_a")
+    assert fresh.count() == 0
+    print("✓ Dropped namespace starts empty")
+
+
+def test_graph_close_releases_memories():
+    """Closing a graph drops its private memories but keeps a tenant's."""
+    print("\nTesting graph close")
+    print("=" * 60)
+
+    def namespaces():
+        return set(memory_registry._namespaces.values())
+
+    with tempfile.TemporaryDirectory() as directory:
+        with offline_graph(os.path.join(directory, "private"), analysts="market") as graph:
+            private = graph.memory_namespace
+            assert private in namespaces()
+        assert private not in namespaces()
+        print("✓ Private namespace dropped on exit")
+
+        graph = offline_graph(
+            os.path.join(directory, "tenant"), analysts="market", memory_namespace="tenant_close"
+        )
+        graph.close()
+        assert "tenant_close" in namespaces()
+        memory_registry.drop_namespace("tenant_close")
+        print("✓ Tenant namespace kept for the tenant's other graphs")
+
+
+def test_point_in_time_snapshots():
+    """A worker restored to a snapshot sees only earlier rows and writes copy-on-write."""
+    print("\nTesting memory snapshots")
+    print("=" * 60)
+
+    root = tempfile.mkdtemp()
+    snapshots = os.path.join(root, "snapshots")
+    bull = PersistentCollection(os.path.join(root, "bull_memory"), model="m")
+    _add(bull, [("jan", "lesson 1")])
+    save_snapshot_manifest(snapshots, "2024-01-31", {"bull_memory": bull})
+    _add(bull, [("feb", "lesson 2")])
+    save_snapshot_manifest(snapshots, "2024-02-29", {"bull_memory": bull})
+
+    tag = find_snapshot_tag(snapshots, "2024-02-15")
+    assert tag == "2024-01-31"
+    entry = load_snapshot_manifest(snapshots, tag)["memories"]["bull_memory"]
+    worker = open_snapshot_collection(entry, os.path.join(root, "overlays", "w1", "bull_memory"))
+    assert worker.count() == 1
+    print("✓ Later lessons are not visible")
+
+    _add(worker, [("worker", "lesson w")])
+    docs = worker.query(query_embeddings=[[1.0, 1.0, 0.0]], n_results=5)["documents"][0]
+    assert sorted(docs) == ["jan", "worker"]
+    assert bull.count() == 2
+    print("✓ Worker writes go to its overlay")
+
+    save_snapshot_manifest(snapshots, "2024-02-15", {"bull_memory": worker})
+    entry = load_snapshot_manifest(snapshots, "2024-02-15")["memories"]["bull_memory"]
+    assert [s["rows"] for s in entry["segments"]] == [1, 1]
+    print("✓ Snapshots of overlays chain their segments")
+
+
+if __name__ == "__main__":
+    test_survives_reopen()
+    test_concurrent_reader_sees_appends()
+    test_torn_write_recovery()
+    test_numpy_quantized_search()
+    test_numpy_dedup_and_eviction()
+    test_registry_namespaces()
+    test_graph_close_releases_memories()
+    test_point_in_time_snapshots()
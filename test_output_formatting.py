@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""Test the output profiles applied to data tool results."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import json
+
+from typing import TypedDict
+
+from langgraph.graph import END, START, StateGraph
+
+from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.formatting import ToolOutputStats, format_tool_output
+
+
+OHLCV_CSV = (
+    "# Stock data for NVDA from 2024-01-01 to 2024-01-31\n"
+    "# Total records: 20\n"
+    "# Data retrieved on: 2025-01-01 10:00:00\n\n"
+    "Date,Open,High,Low,Close,Volume,Dividends,Stock Splits\n"
+    + "\n".join(
+        f"2024-01-{i + 1:02d} 00:00:00,{100 + i * 1.123456:.6f},{101 + i},{99 + i},{100.5 + i},{1000000 + i},0.0,0.0"
+        for i in range(20)
+    )
+)
+
+
+def _configure(**overrides):
+    set_config(
+        {
+            "output_format": "compact",
+            "tool_output_max_tokens": 6000,
+            "tool_output_formats": {},
+            **overrides,
+        }
+    )
+
+
+def test_compact_csv():
+    """Compact keeps every row but drops timestamps, zero columns and precision."""
+    print("Testing compact CSV")
+    print("=" * 60)
+
+    _configure()
+    output = format_tool_output("get_stock_data", OHLCV_CSV)
+    assert "Data retrieved on" not in output
+    assert "Dividends" not in output and "Stock Splits" not in output
+    assert "2024-01-02,101.12," in output
+    assert output.count("\n2024-01-") == 20
+    print(f"✓ {len(OHLCV_CSV)} chars -> {len(output)} chars")
+
+
+def test_small_values_keep_precision():
+    """Values below 1 keep 4 significant digits instead of rounding to 0."""
+    print("\nTesting small values")
+    print("=" * 60)
+
+    _configure()
+    raw = "Date,close,macd,macds\n2024-01-02,135.1234,0.012345,-0.0004567\n2024-01-03,136.5,0.5,0.25"
+    output = format_tool_output("get_indicators", raw)
+    assert "2024-01-02,135.12,0.01235,-0.0004567" in output
+    assert "2024-01-03,136.5,0.5,0.25" in output
+
+    _configure(tool_output_formats={"get_indicators": "summary"})
+    output = format_tool_output("get_indicators", raw)
+    assert "macd,0.01235,0.5,0.01235,0.5,0.2562," in output
+    print("✓ Indicator values survive compaction")
+
+
+def test_summary_csv():
+    """Summary reports statistics plus only the most recent rows."""
+    print("\nTesting summary CSV")
+    print("=" * 60)
+
+    _configure(tool_output_formats={"get_stock_data": "summary"}, output_recent_rows=5)
+    output = format_tool_output("get_stock_data", OHLCV_CSV)
+    assert "Close,100.5,119.5,100.5,119.5," in output
+    assert "2024-01-20," in output and "2024-01-15," not in output
+    print("✓ Statistics and 5 most recent rows")
+
+
+def test_fields_json():
+    """The fields profile projects JSON onto a key whitelist."""
+    print("\nTesting fields JSON")
+    print("=" * 60)
+
+    _configure(
+        tool_output_formats={
+            "get_balance_sheet": {"profile": "fields", "fields": ["fiscalDateEnding", "totalAssets"]}
+        }
+    )
+    raw = json.dumps(
+        {
+            "symbol": "NVDA",
+            "quarterlyReports": [
+                {"fiscalDateEnding": "2024-03-31", "totalAssets": "100", "goodwill": "None"}
+            ],
+        },
+        indent=4,
+    )
+    output = json.loads(format_tool_output("get_balance_sheet", raw))
+    assert output == {
+        "quarterlyReports": [{"fiscalDateEnding": "2024-03-31", "totalAssets": "100"}]
+    }
+    print("✓ Projected to whitelisted fields")
+
+
+class State(TypedDict):
+    output: str
+
+
+def test_stats_per_run():
+    """Token accounting goes to the stats of the run calling the tool."""
+    print("\nTesting per-run tool output stats")
+    print("=" * 60)
+
+    _configure()
+    builder = StateGraph(State)
+    builder.add_node("tools", lambda state: {"output": format_tool_output("get_stock_data", OHLCV_CSV)})
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    graph = builder.compile()
+
+    first, second = ToolOutputStats(), ToolOutputStats()
+    graph.invoke({"output": ""}, {"configurable": {"tool_output_stats": first}})
+    graph.invoke({"output": ""}, {"configurable": {"tool_output_stats": first}})
+    graph.invoke({"output": ""}, {"configurable": {"tool_output_stats": second}})
+    format_tool_output("get_stock_data", OHLCV_CSV)  # outside a run: not counted
+
+    stats = first.snapshot()["get_stock_data"]
+    assert stats["calls"] == 2 and stats["emitted_tokens"] < stats["raw_tokens"]
+    assert second.snapshot()["get_stock_data"]["calls"] == 1
+    print(f"✓ {stats}")
+
+
+def test_token_cap():
+    """Outputs over the cap are truncated with a marker."""
+    print("\nTesting token cap")
+    print("=" * 60)
+
+    _configure(tool_output_max_tokens=50)
+    output = format_tool_output("get_news", "headline " * 1000)
+    assert output.endswith("[output truncated to 50 tokens]")
+    assert len(output) < 1000
+    print("✓ Output truncated")
+
+    prices = "Date,Open,Close\n" + "\n".join(
+        f"2024-{1 + i // 28:02d}-{1 + i % 28:02d},{100 + i}.25,{101 + i}.75" for i in range(200)
+    )
+    _configure(tool_output_max_tokens=400)
+    output = format_tool_output("get_stock_data", prices)
+    lines = output.splitlines()
+    assert lines[1] == "Date,Open,Close" and lines[-1] == "2024-08-04,299.25,300.75"
+    assert lines[0].startswith("# ") and "older rows omitted" in lines[0]
+    assert 10 < len(lines) < 200
+    print(f"✓ Capped price series keeps the latest {len(lines) - 2} rows")
+
+    newest_first = "Date,Open,Close\n" + "\n".join(reversed(prices.splitlines()[1:]))
+    lines = format_tool_output("get_stock_data", newest_first).splitlines()
+    assert lines[2] == "2024-08-04,299.25,300.75"
+    print("✓ Newest-first series keeps its first rows")
+
+    _configure()
+
+
+if __name__ == "__main__":
+    test_compact_csv()
+    test_small_values_keep_precision()
+    test_summary_csv()
+    test_fields_json()
+    test_stats_per_run()
+    test_token_cap()
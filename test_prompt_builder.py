@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""Test shared-prefix prompt assembly and per-run prompt-cache stats."""
+
+import sys
+sys.dont_write_bytecode = True
+
+from concurrent.futures import ThreadPoolExecutor
+from typing import TypedDict
+
+from langchain_core.language_models.fake_chat_models import GenericFakeChatModel
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage
+from langgraph.graph import END, START, StateGraph
+
+from tradingagents.agents.utils.prompt_builder import (
+    PromptCacheStats,
+    build_prompt_messages,
+    build_shared_prefix,
+    invoke_with_shared_prefix,
+)
+from tradingagents.dataflows.config import set_config
+
+
+STATE = {
+    "company_of_interest": "NVDA",
+    "trade_date": "2025-06-02",
+    "research_brief": "Close 135.10; RSI 71; P/E 45.",
+}
+
+
+def fake_llm(calls):
+    usage = {
+        "input_tokens": 1000,
+        "output_tokens": 10,
+        "total_tokens": 1010,
+        "input_token_details": {"cache_read": 800},
+    }
+    return GenericFakeChatModel(
+        messages=iter([AIMessage(content="argument", usage_metadata=usage)] * calls)
+    )
+
+
+def test_shared_prefix():
+    """Every agent's prompt starts with the same system message."""
+    print("Testing shared prefix")
+    print("=" * 60)
+
+    set_config({"research_context": "brief", "llm_provider": "openai"})
+    bull = build_prompt_messages(STATE, "You are the Bull Analyst.")
+    bear = build_prompt_messages(STATE, "You are the Bear Analyst.")
+    assert isinstance(bull[0], SystemMessage) and isinstance(bull[1], HumanMessage)
+    assert bull[0].content == bear[0].content == build_shared_prefix(STATE)
+    assert "Close 135.10" in bull[0].content and "Bull" not in bull[0].content
+    print("✓ Byte-identical prefix, role prompt after it")
+
+    set_config({"llm_provider": "anthropic"})
+    block = build_prompt_messages(STATE, "You are the Bull Analyst.")[0].content[0]
+    assert block["cache_control"] == {"type": "ephemeral"}
+    assert block["text"] == build_shared_prefix(STATE)
+    set_config({"llm_provider": "openai"})
+    print("✓ Anthropic prefix marked as a cache breakpoint")
+
+
+class State(TypedDict):
+    history: str
+
+
+def test_stats_per_run():
+    """Usage is counted into the collector of the run making the call."""
+    print("\nTesting per-run prompt-cache stats")
+    print("=" * 60)
+
+    llm = fake_llm(8)
+
+    def debater(state):
+        response = invoke_with_shared_prefix(llm, STATE, "Argue.", {"debate_history": state["history"]})
+        return {"history": state["history"] + response.content}
+
+    builder = StateGraph(State)
+    builder.add_node("Debater", debater)
+    builder.add_edge(START, "Debater")
+    builder.add_edge("Debater", END)
+    graph = builder.compile()
+
+    def run(stats, turns):
+        for _ in range(turns):
+            graph.invoke({"history": ""}, {"configurable": {"prompt_cache_stats": stats}})
+        return stats.snapshot()
+
+    # Two concurrent runs keep separate counts
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        first, second = executor.map(run, (PromptCacheStats(), PromptCacheStats()), (2, 4))
+    assert first == {"calls": 2, "input_tokens": 2000, "cached_tokens": 1600, "cached_ratio": 0.8}
+    assert second["calls"] == 4 and second["cached_tokens"] == 3200
+    print(f"✓ Concurrent runs: {first['calls']} and {second['calls']} calls")
+
+    # Calls outside a run, or in a run without a collector, are not counted
+    assert invoke_with_shared_prefix(llm, STATE, "Argue.").content == "argument"
+    assert graph.invoke({"history": ""})["history"] == "argument"
+    print("✓ Calls without a collector are ignored")
+
+
+if __name__ == "__main__":
+    test_shared_prefix()
+    test_stats_per_run()
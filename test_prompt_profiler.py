@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""Test the prompt anatomy profiler."""
+
+import sys
+sys.dont_write_bytecode = True
+
+from typing import TypedDict
+
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langgraph.graph import END, START, StateGraph
+
+from tradingagents.agents.utils.agent_utils import get_stock_data
+from tradingagents.agents.utils.prompt_profiler import (
+    OUTSIDE_GRAPH,
+    PromptProfiler,
+    format_prompt_profile,
+    merge_prompt_profiles,
+    prompt_anatomy,
+    record_prompt,
+)
+from tradingagents.agents.utils.token_utils import estimate_tokens
+
+
+HISTORY = "Bull Analyst: margins keep expanding. " * 40
+MEMORY = "Lesson: trim into earnings when guidance is soft. " * 5
+
+
+def test_prompt_anatomy():
+    """Tagged sections are counted separately from the static remainder."""
+    print("Testing prompt anatomy")
+    print("=" * 60)
+
+    prompt = f"You are the judge. Weigh both sides.\n\nLessons:\n{MEMORY}\n\nDebate:\n{HISTORY}"
+    counts = prompt_anatomy(prompt, {"debate_history": HISTORY, "memories": MEMORY, "decisions": ""})
+    assert counts["debate_history"] == estimate_tokens(HISTORY)
+    assert counts["memories"] == estimate_tokens(MEMORY)
+    assert "decisions" not in counts
+    assert 0 < counts["instructions"] < 30
+    print(f"✓ String prompt: {counts}")
+
+    messages = [
+        SystemMessage(content="Pick tools."),
+        HumanMessage(content="NVDA"),
+        AIMessage(content="", tool_calls=[{"name": "get_stock_data", "args": {"symbol": "NVDA"}, "id": "1"}]),
+        ToolMessage(content="Date,Close\n" * 100, tool_call_id="1"),
+    ]
+    counts = prompt_anatomy(messages, tools=[get_stock_data])
+    assert counts["tool_outputs"] == estimate_tokens("Date,Close\n" * 100)
+    assert counts["conversation"] > 0 and counts["tool_schemas"] > 0
+    print(f"✓ Message list: {counts}")
+
+
+class State(TypedDict):
+    report: str
+
+
+def test_profiler_per_node_and_batch():
+    """Prompts go to the run's profiler, per graph node, and merge across runs."""
+    profiler = PromptProfiler(enabled=True)
+    disabled = PromptProfiler()
+    disabled.record("ignored while disabled")
+    assert disabled.snapshot()["prompts"] == 0
+
+    def judge(state):
+        record_prompt(f"Decide.\n{HISTORY}", {"debate_history": HISTORY})
+        return {"report": "done"}
+
+    builder = StateGraph(State)
+    builder.add_node("Risk Judge", judge)
+    builder.add_edge(START, "Risk Judge")
+    builder.add_edge("Risk Judge", END)
+    graph = builder.compile()
+
+    profiles = []
+    for _ in range(2):
+        profiler.reset()
+        graph.invoke({"report": ""}, {"configurable": {"prompt_profiler": profiler}})
+        profiler.record("Reflect on the outcome.")
+        profiles.append(profiler.snapshot())
+
+    # Runs of another graph, or without a profiler, are not counted
+    graph.invoke({"report": ""}, {"configurable": {"prompt_profiler": disabled}})
+    graph.invoke({"report": ""})
+    assert disabled.snapshot()["prompts"] == 0
+
+    run = profiles[0]
+    assert run["nodes"]["Risk Judge"]["calls"] == 1
+    assert run["nodes"][OUTSIDE_GRAPH]["sections"] == {"instructions": estimate_tokens("Reflect on the outcome.")}
+    assert next(iter(run["sections"])) == "debate_history"
+
+    batch = merge_prompt_profiles(profiles)
+    assert batch["runs"] == 2 and batch["prompts"] == 4
+    assert batch["tokens"] == 2 * run["tokens"]
+    print(format_prompt_profile(batch, "Prompt anatomy across 2 runs"))
+    print("✓ Per-node attribution and batch merge")
+
+
+if __name__ == "__main__":
+    test_prompt_anatomy()
+    test_profiler_per_node_and_batch()
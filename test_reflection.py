@@ -0,0 +1,191 @@
+#!/usr/bin/env python3
+"""Test concurrent reflection into the agent memories and lesson distillation."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import logging
+import threading
+import time
+from types import SimpleNamespace
+
+from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.graph.reflection import REFLECTION_COMPONENTS, Reflector, extract_lesson
+
+
+class SlowLLM:
+    """Stand-in model that takes a fixed time per call and tracks concurrency."""
+
+    def __init__(self, delay=0.2):
+        self.delay = delay
+        self.active = 0
+        self.max_active = 0
+        self._lock = threading.Lock()
+
+    def invoke(self, messages, config=None):
+        with self._lock:
+            self.active += 1
+            self.max_active = max(self.max_active, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return SimpleNamespace(content=f"Lesson on: {messages[1][1]}")
+
+
+STATE = {
+    "market_report": "Rising rates",
+    "sentiment_report": "Bearish chatter",
+    "news_report": "Fed hawkish",
+    "fundamentals_report": "Strong margins",
+    "investment_debate_state": {
+        "bull_history": "Bull: buy",
+        "bear_history": "Bear: sell",
+        "judge_decision": "Hold",
+    },
+    "trader_investment_plan": "Hold 100 shares",
+    "risk_debate_state": {"judge_decision": "Hold with stop at $90"},
+    "prediction_debate_state": {
+        "short_term_history": "14d: +2%",
+        "medium_term_history": "30d: +4%",
+        "long_term_history": "90d: +9%",
+    },
+    "final_predictions": "Up across horizons",
+}
+
+
+def test_reflect_all_concurrently():
+    """All nine memories get a lesson, in parallel, from one embedding batch."""
+    print("Testing concurrent reflection")
+    print("=" * 60)
+
+    config = {"backend_url": "https://api.openai.com/v1", "embedding_backend": "hashing"}
+    memories = {
+        name: FinancialSituationMemory(name, config, namespace="reflection_test")
+        for name in REFLECTION_COMPONENTS
+    }
+    embed_calls = []
+    for memory in memories.values():
+        original = memory.embedder.embed
+        memory.embedder.embed = lambda texts, original=original: embed_calls.append(texts) or original(texts)
+
+    llm = SlowLLM()
+    start = time.perf_counter()
+    reflections = Reflector(llm).reflect_all(STATE, 1000, memories)
+    elapsed = time.perf_counter() - start
+
+    assert set(reflections) == set(REFLECTION_COMPONENTS)
+    assert all(memory.situation_collection.count() == 1 for memory in memories.values())
+    assert llm.max_active == len(REFLECTION_COMPONENTS)
+    assert len(embed_calls) == 1
+    assert elapsed < 2 * llm.delay
+    print(f"✓ {len(reflections)} reflections in {elapsed:.2f}s with {len(embed_calls)} embedding call")
+
+    lesson = memories["long_term_predictor_memory"].get_memories("Rising rates")[0]
+    assert "90d" in lesson["recommendation"]
+    print("✓ Predictor memories populated")
+
+
+class FailingLLM(SlowLLM):
+    """Stand-in model whose reflections on the trader fail."""
+
+    def invoke(self, messages, config=None):
+        if "Hold 100 shares" in messages[1][1]:
+            raise TimeoutError("model timed out")
+        return super().invoke(messages, config)
+
+
+class RecordingHandler(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.messages = []
+
+    def emit(self, record):
+        self.messages.append(record.getMessage())
+
+
+def test_reflect_all_failures():
+    """A failed shared embedding or reflection does not lose the other lessons."""
+    print("\nTesting reflection failures")
+    print("=" * 60)
+
+    config = {"backend_url": "https://api.openai.com/v1", "embedding_backend": "hashing"}
+    memories = {
+        name: FinancialSituationMemory(name, config, namespace="reflection_failure_test")
+        for name in REFLECTION_COMPONENTS
+    }
+    first = next(iter(memories.values()))
+    original = first.embedder.embed
+    failures = []
+
+    def flaky_embed(texts):
+        if not failures:
+            failures.append(texts)
+            raise ConnectionError("embedding endpoint down")
+        return original(texts)
+
+    first.embedder.embed = flaky_embed
+    handler = RecordingHandler()
+    logger = logging.getLogger("tradingagents.graph.reflection")
+    logger.addHandler(handler)
+    try:
+        reflections = Reflector(FailingLLM(delay=0)).reflect_all(STATE, 1000, memories)
+    finally:
+        logger.removeHandler(handler)
+
+    assert set(reflections) == set(REFLECTION_COMPONENTS) - {"trader_memory"}
+    assert all(memories[name].situation_collection.count() == 1 for name in reflections)
+    assert memories["trader_memory"].situation_collection.count() == 0
+    assert handler.messages == [
+        "Shared situation embedding failed",
+        "Reflection for trader_memory failed",
+    ]
+    print(f"✓ {len(reflections)} lessons stored; failures logged: {handler.messages}")
+
+
+REFLECTION = """1. Reasoning:
+The HOLD was incorrect; rate-sensitive names rallied after the Fed pause.
+
+2. Improvement:
+Change the decision from HOLD to BUY on the pause.
+
+3. Summary:
+Dovish pivots lift duration-heavy growth stocks.
+
+**Lesson:** Buy rate-sensitive growth names when the Fed signals a pause.
+"""
+
+
+def test_lessons_stored_and_filtered():
+    """Memories return the distilled lesson and skip dissimilar situations."""
+    print("\nTesting lesson distillation")
+    print("=" * 60)
+
+    assert extract_lesson(REFLECTION) == "Buy rate-sensitive growth names when the Fed signals a pause."
+    assert extract_lesson(REFLECTION.split("**Lesson")[0]) == "Dovish pivots lift duration-heavy growth stocks."
+    assert len(extract_lesson("word " * 1000, max_tokens=20)) < 200
+    print("✓ Lesson line, Summary fallback and token cap")
+
+    config = {
+        "backend_url": "https://api.openai.com/v1",
+        "embedding_backend": "hashing",
+        "memory_min_similarity": 0.3,
+    }
+    memory = FinancialSituationMemory("lesson_test", config, namespace="reflection_test")
+    situation = "Fed pauses rate hikes; growth stocks rally on lower yields"
+    Reflector(SlowLLM(delay=0))._remember(memory, situation, REFLECTION)
+
+    match = memory.get_memories("Fed pauses rate hikes and growth stocks rally")[0]
+    assert match["recommendation"] == extract_lesson(REFLECTION)
+    stored = memory.situation_collection.get(include=["metadatas"])["metadatas"][0]
+    assert stored["reflection"] == REFLECTION
+    print("✓ Lesson injected, full reflection kept for audit")
+
+    assert memory.get_memories("Crude inventories build as OPEC output climbs") == []
+    assert len(memory.get_memories("Crude inventories build", min_similarity=-1.0)) == 1
+    print("✓ Unrelated situations filtered by similarity")
+
+
+if __name__ == "__main__":
+    test_reflect_all_concurrently()
+    test_reflect_all_failures()
+    test_lessons_stored_and_filtered()
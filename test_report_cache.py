@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Test analyst report memoization with tool-data fingerprints."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import tempfile
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+from langchain_core.tools import tool
+
+from tradingagents.graph.report_cache import (
+    ReportCache,
+    analyst_prompt_version,
+    fingerprint_outputs,
+)
+
+
+PRICES = {"NVDA": "Date,Close\n2025-06-02,135.1"}
+
+
+@tool
+def get_stock_data(symbol: str, curr_date: str) -> str:
+    """Price history for a ticker up to a date."""
+    return f"# Data retrieved on: {curr_date} 09:00\n{PRICES[symbol]}"
+
+
+def _messages(trade_date):
+    call = {"name": "get_stock_data", "args": {"symbol": "NVDA", "curr_date": trade_date}, "id": "1"}
+    return [
+        HumanMessage(content="NVDA"),
+        AIMessage(content="", tool_calls=[call]),
+        ToolMessage(content=get_stock_data.invoke(call["args"]), tool_call_id="1"),
+    ]
+
+
+def test_fingerprint_ignores_fetch_time():
+    """Fetch timestamps do not change the fingerprint, the data does."""
+    a = fingerprint_outputs(["# Data retrieved on: 2025-06-02 09:00\n1,2"])
+    b = fingerprint_outputs(["# Data retrieved on: 2025-06-03 17:30\n1,2"])
+    c = fingerprint_outputs(["# Data retrieved on: 2025-06-02 09:00\n1,3"])
+    assert a == b != c
+    print("✓ Fingerprints ignore fetch timestamps")
+
+
+def test_replay_and_invalidation():
+    """Reports are reused while replayed tool data is unchanged."""
+    print("Testing report cache")
+    print("=" * 60)
+    PRICES["NVDA"] = "Date,Close\n2025-06-02,135.1"
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ReportCache(directory, {"get_stock_data": get_stock_data}, "gpt-4o-mini")
+        assert cache.lookup("market", "NVDA", "2025-06-02") is None
+
+        cache.record("market", "NVDA", "2025-06-02", _messages("2025-06-02"), "Market report")
+        assert cache.lookup("market", "nvda", "2025-06-02") == "Market report"
+        assert cache.lookup("market", "NVDA", "2025-06-03") is None, "market reports are per date"
+        print("✓ Hit on an identical replay")
+
+        PRICES["NVDA"] = "Date,Close\n2025-06-02,140.0"
+        assert cache.lookup("market", "NVDA", "2025-06-02") is None
+        print("✓ Miss once the underlying data changes")
+
+        # Fundamentals are reused across dates while the replayed data matches
+        cache.record("fundamentals", "NVDA", "2025-06-02", _messages("2025-06-02"), "Fundamentals")
+        assert cache.lookup("fundamentals", "NVDA", "2025-06-09") == "Fundamentals"
+        print("✓ Fundamentals reused on a later date")
+
+        # A different prompt version (here: another compaction limit) misses
+        other = ReportCache(
+            directory, {"get_stock_data": get_stock_data}, "gpt-4o-mini", {"fundamentals": 500}
+        )
+        assert other.lookup("fundamentals", "NVDA", "2025-06-09") is None
+        assert cache.hits == 2 and cache.misses == 3
+
+
+def test_prompt_version_tracks_prompt_code():
+    """The prompt version hashes each analyst's own prompt code and settings."""
+    versions = {name: analyst_prompt_version(name) for name in ("market", "social", "news", "fundamentals")}
+    assert len(set(versions.values())) == 4
+    assert analyst_prompt_version("market") == versions["market"]
+    assert analyst_prompt_version("market", 2000) != versions["market"]
+    print(f"✓ Prompt versions: {versions}")
+
+
+def test_wrap_analyst():
+    """The wrapped node runs only on a miss and its report is recorded."""
+    PRICES["NVDA"] = "Date,Close\n2025-06-02,135.1"
+    runs = []
+
+    def analyst_node(state):
+        runs.append(state["trade_date"])
+        return {"messages": [AIMessage(content="Fresh report")], "market_report": "Fresh report"}
+
+    with tempfile.TemporaryDirectory() as directory:
+        cache = ReportCache(directory, {"get_stock_data": get_stock_data}, "gpt-4o-mini")
+        node = cache.wrap_analyst("market", analyst_node)
+        state = {"company_of_interest": "NVDA", "trade_date": "2025-06-02", "messages": _messages("2025-06-02")[:1]}
+
+        assert node(state)["market_report"] == "Fresh report"
+        # Recorded without tool calls; an identical replay (no calls) hits
+        assert node(state)["market_report"] == "Fresh report"
+        assert runs == ["2025-06-02"]
+        print("✓ Wrapped analyst served from the cache on the second run")
+
+
+if __name__ == "__main__":
+    test_fingerprint_ignores_fetch_time()
+    test_replay_and_invalidation()
+    test_prompt_version_tracks_prompt_code()
+    test_wrap_analyst()
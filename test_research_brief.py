@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""Test the research brief that condenses the analyst reports."""
+
+import sys
+sys.dont_write_bytecode = True
+
+from types import SimpleNamespace
+
+from tradingagents.agents import create_research_brief
+from tradingagents.agents.utils.agent_utils import get_research_context
+from tradingagents.agents.utils.token_utils import estimate_tokens
+from tradingagents.dataflows.config import set_config
+
+
+class BriefLLM:
+    """Stand-in model that records its prompts and returns a fixed answer."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.prompts = []
+
+    def invoke(self, prompt):
+        self.prompts.append(prompt)
+        return SimpleNamespace(content=self.answer)
+
+
+def _state(**reports):
+    return {"company_of_interest": "NVDA", "trade_date": "2025-06-02", **reports}
+
+
+def test_brief_condenses_reports():
+    """Present reports go into the prompt and the answer is capped at the budget."""
+    print("Testing research brief")
+    print("=" * 60)
+
+    set_config({"research_context": "brief", "research_brief_tokens": 100})
+    llm = BriefLLM("  Close 135.10 on 2025-06-02. " + "detail " * 500)
+    node = create_research_brief(llm)
+
+    state = _state(market_report="RSI 71, MACD rising", fundamentals_report="P/E 45")
+    brief = node(state)["research_brief"]
+
+    prompt = llm.prompts[0]
+    assert "### Market Analysis\nRSI 71, MACD rising" in prompt
+    assert "### Fundamentals\nP/E 45" in prompt
+    assert "Social Media Sentiment" not in prompt, "empty reports are left out"
+    assert "Stay under 75 words" in prompt
+    assert brief.startswith("Close 135.10 on 2025-06-02.")
+    assert estimate_tokens(brief) <= 110
+    print(f"✓ Brief truncated to ~{estimate_tokens(brief)} tokens")
+
+    context = get_research_context({**state, "research_brief": brief})
+    assert context.startswith("Research Brief (condensed from the analyst reports):")
+    assert "RSI 71" not in context
+    print("✓ Downstream agents read the brief instead of the reports")
+
+
+def test_brief_skipped():
+    """No model call without reports, or when downstream agents read full reports."""
+    print("\nTesting skipped research brief")
+    print("=" * 60)
+
+    llm = BriefLLM("unused")
+    node = create_research_brief(llm)
+
+    set_config({"research_context": "brief"})
+    assert node(_state()) == {"research_brief": ""}
+
+    set_config({"research_context": "full"})
+    state = _state(market_report="RSI 71")
+    assert node(state) == {"research_brief": ""}
+    assert get_research_context({**state, "research_brief": "stale"}).startswith(
+        "Market Research Report: RSI 71"
+    )
+    assert llm.prompts == []
+    print("✓ Skipped without calling the model")
+
+    set_config({"research_context": "brief", "research_brief_tokens": 1500})
+
+
+if __name__ == "__main__":
+    test_brief_condenses_reports()
+    test_brief_skipped()
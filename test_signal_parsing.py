@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""Test deterministic trade signal extraction."""
+
+import sys
+sys.dont_write_bytecode = True
+
+from types import SimpleNamespace
+
+from tradingagents.graph.signal_processing import SignalProcessor, parse_trade_signal
+
+
+class DecisionLLM:
+    """Stand-in model that answers with a fixed decision and counts calls."""
+
+    def __init__(self, answer):
+        self.answer = answer
+        self.calls = 0
+
+    def invoke(self, messages, config=None):
+        self.calls += 1
+        return SimpleNamespace(content=self.answer)
+
+
+FULL_DECISION = """**Clear Action**: Buy
+
+Entry price: $118-120. Price target: $135 - $140. Stop-loss at $110.50.
+Add 15% to position within the next 2 weeks.
+
+FINAL TRANSACTION PROPOSAL: **BUY**"""
+
+
+def test_parse_full_decision():
+    """All fields are extracted when the markers are present."""
+    print("Testing full decision parsing")
+    print("=" * 60)
+
+    signal = parse_trade_signal(FULL_DECISION)
+    assert signal["decision"] == "BUY"
+    assert signal["entry_prices"] == [118.0, 120.0]
+    assert signal["price_targets"] == [135.0, 140.0]
+    assert signal["stop_loss"] == 110.5
+    assert signal["position_pct"] == 15.0
+    print(f"✓ {signal}")
+
+
+def test_template_marker_is_not_a_decision():
+    """The instruction template "**BUY/HOLD/SELL**" is not mistaken for a decision."""
+    print("\nTesting template marker")
+    print("=" * 60)
+
+    signal = parse_trade_signal("End with FINAL TRANSACTION PROPOSAL: **BUY/HOLD/SELL**.")
+    assert signal["decision"] == ""
+    print("✓ Template ignored")
+
+
+def test_quoted_markers_are_not_decisions():
+    """Markers the judge quotes or credits to another speaker are ignored."""
+    print("\nTesting quoted and attributed markers")
+    print("=" * 60)
+
+    quoted = (
+        'The trader closed with "FINAL TRANSACTION PROPOSAL: **BUY**", but the guidance cut '
+        "is not priced in.\n\n1. **Clear Action**: **HOLD**"
+    )
+    assert parse_trade_signal(quoted)["decision"] == "HOLD"
+
+    blockquote = "> FINAL TRANSACTION PROPOSAL: **SELL**\n\nRecommendation: Buy"
+    assert parse_trade_signal(blockquote)["decision"] == "BUY"
+    print("✓ Quoted proposals skipped, the judge's own action kept")
+
+    attributed = (
+        "The Aggressive Analyst's recommendation: BUY is too risky after the guidance cut. "
+        "I advise we hold."
+    )
+    assert parse_trade_signal(attributed)["decision"] == ""
+
+    unmarked_quote = "Trader's plan:\nFINAL TRANSACTION PROPOSAL: **BUY**\n\n**Clear Action**: Hold"
+    assert parse_trade_signal(unmarked_quote)["decision"] == ""
+    print("✓ Attributed or disagreeing markers left to the LLM")
+
+
+def test_llm_fallback_only_when_ambiguous():
+    """The LLM is called only when the decision cannot be parsed."""
+    print("\nTesting LLM fallback")
+    print("=" * 60)
+
+    llm = DecisionLLM("Hold")
+    processor = SignalProcessor(llm)
+
+    assert processor.process_signal(FULL_DECISION) == "BUY"
+    assert llm.calls == 0
+    print("✓ Parsed without an LLM call")
+
+    conflicting = "Recommendation: Buy\n...\nFinal Decision: Sell"
+    signal = processor.extract_signal(conflicting)
+    assert signal["decision"] == "HOLD" and signal["source"] == "llm"
+    assert llm.calls == 1
+    print("✓ Fell back to the LLM for a conflicting decision")
+
+    attributed = "The Aggressive Analyst's recommendation: BUY is too risky. I advise we hold."
+    assert processor.extract_signal(attributed)["source"] == "llm"
+    assert llm.calls == 2
+    print("✓ Fell back to the LLM for a decision stated only in prose")
+
+
+if __name__ == "__main__":
+    test_parse_full_decision()
+    test_template_marker_is_not_a_decision()
+    test_quoted_markers_are_not_decisions()
+    test_llm_fallback_only_when_ambiguous()
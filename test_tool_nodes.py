@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""Test concurrent tool execution and the per-run tool call memo."""
+
+import sys
+sys.dont_write_bytecode = True
+
+import threading
+from typing import Annotated, TypedDict
+
+from langchain_core.messages import AIMessage
+from langchain_core.tools import tool
+from langgraph.graph import END, START, StateGraph
+from langgraph.graph.message import add_messages
+
+from tradingagents.dataflows.config import get_run_object
+from tradingagents.graph.tool_nodes import ParallelToolNode, ToolCallMemo
+
+
+CALLS = []
+BARRIER = threading.Barrier(2, timeout=5)
+
+
+@tool
+def get_prices(symbol: str) -> str:
+    """Price history for a ticker."""
+    CALLS.append(("get_prices", symbol))
+    BARRIER.wait()  # Only returns once the other call is running too
+    return f"{symbol} prices"
+
+
+@tool
+def get_news(symbol: str) -> str:
+    """News for a ticker, tagged with the run it was fetched for."""
+    CALLS.append(("get_news", symbol))
+    BARRIER.wait()
+    return f"{symbol} news for {get_run_object('run_label')}"
+
+
+@tool
+def get_flaky(symbol: str) -> str:
+    """Fails on every call."""
+    CALLS.append(("get_flaky", symbol))
+    raise ConnectionError("vendor down")
+
+
+def _call(name, call_id, symbol="NVDA"):
+    return {"name": name, "args": {"symbol": symbol}, "id": call_id}
+
+
+class State(TypedDict):
+    messages: Annotated[list, add_messages]
+
+
+def _graph(node):
+    builder = StateGraph(State)
+    builder.add_node("tools", node)
+    builder.add_edge(START, "tools")
+    builder.add_edge("tools", END)
+    return builder.compile()
+
+
+def test_parallel_calls_keep_run_config():
+    """Calls in one message run concurrently and see the node's run config."""
+    print("Testing ParallelToolNode")
+    print("=" * 60)
+    CALLS.clear()
+
+    node = ParallelToolNode([get_prices, get_news], max_workers=4)
+    message = AIMessage(
+        content="",
+        tool_calls=[_call("get_prices", "1"), _call("get_news", "2"), _call("get_prices", "3")],
+    )
+    result = _graph(node).invoke(
+        {"messages": [message]}, {"configurable": {"run_label": "run-a"}}
+    )
+
+    outputs = [m.content for m in result["messages"][1:]]
+    assert outputs == ["NVDA prices", "NVDA news for run-a", "NVDA prices"]
+    assert [m.tool_call_id for m in result["messages"][1:]] == ["1", "2", "3"]
+    assert sorted(CALLS) == [("get_news", "NVDA"), ("get_prices", "NVDA")]
+    print("✓ Two distinct calls ran concurrently; the duplicate was executed once")
+    print("✓ Worker threads see the run config")
+
+
+def test_memo_across_nodes():
+    """A shared memo serves repeated calls, skips failures and resets per run."""
+    print("\nTesting ToolCallMemo")
+    print("=" * 60)
+    CALLS.clear()
+
+    memo = ToolCallMemo()
+    market = ParallelToolNode([get_flaky], max_workers=1, memo=memo)
+    social = ParallelToolNode([get_flaky], max_workers=1, memo=memo)
+    state = {"messages": [AIMessage(content="", tool_calls=[_call("get_flaky", "1")])]}
+
+    for node in (market, social):
+        message = node(state)["messages"][0]
+        assert message.status == "error" and "vendor down" in message.content
+    assert len(CALLS) == 2, "failed calls are not memoized"
+
+    memo_key = ToolCallMemo.make_key("get_flaky", {"symbol": "NVDA"})
+    future, _ = memo.get_or_reserve(memo_key)
+    future.set_result("cached")
+    assert social(state)["messages"][0].content == "cached"
+    assert len(CALLS) == 2 and memo.hits == 1
+    print(f"✓ Memo hits {memo.hits}, misses {memo.misses}")
+
+    memo.reset()
+    assert (memo.hits, memo.misses) == (0, 0)
+    social(state)
+    assert len(CALLS) == 3, "reset drops memoized results"
+
+    invalid = market({"messages": [AIMessage(content="", tool_calls=[_call("get_quotes", "9")])]})
+    assert "not a valid tool" in invalid["messages"][0].content
+    print("✓ Reset and unknown tools")
+
+
+if __name__ == "__main__":
+    test_parallel_calls_keep_run_config()
+    test_memo_across_nodes()
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Test compaction of tool outputs the analyst has already written about."""
+
+import sys
+sys.dont_write_bytecode = True
+
+from langchain_core.messages import AIMessage, HumanMessage, ToolMessage
+
+from tradingagents.agents.utils.agent_utils import (
+    compact_consumed_tool_outputs,
+    digest_tool_output,
+)
+from tradingagents.dataflows.config import set_config
+from tradingagents.default_config import DEFAULT_CONFIG
+
+
+PRICES = "Date,Close\n" + "\n".join(f"2025-05-{day:02d},{100 + day}.5" for day in range(1, 31))
+INDICATORS = "Date,rsi\n" + "\n".join(f"2025-05-{day:02d},{40 + day}.25" for day in range(1, 31))
+
+
+def _round(call_id, name, content, text=""):
+    return [
+        AIMessage(content=text, tool_calls=[{"name": name, "args": {}, "id": call_id}]),
+        ToolMessage(content=content, tool_call_id=call_id),
+    ]
+
+
+def test_digest_keeps_head_and_tail():
+    """Digests keep the first and most recent lines within the budget."""
+    print("Testing digest_tool_output")
+    print("=" * 60)
+
+    digest = digest_tool_output(PRICES, 200)
+    lines = digest.splitlines()
+    assert lines[0].startswith(f"[Compacted tool output: {len(PRICES)} chars in 31 lines")
+    assert lines[1] == "Date,Close" and lines[-1] == "2025-05-30,130.5"
+    assert "lines omitted" in digest and len(digest) < 300
+
+    blob = '{"quarterlyReports": "' + "x" * 1000 + '"}'
+    digest = digest_tool_output(blob, 90)
+    assert digest.endswith('x"}') and "... [truncated] ..." in digest
+    print("✓ Head, tail and an omission marker")
+
+
+def test_chained_tool_calls_keep_raw_data():
+    """Outputs stay intact until the model has written text after them."""
+    print("\nTesting chained tool calls")
+    print("=" * 60)
+
+    set_config({"tool_output_compaction": {"market": 200}})
+    messages = [HumanMessage(content="NVDA")]
+    messages += _round("1", "get_stock_data", PRICES)
+    messages += _round("2", "get_indicators", INDICATORS)
+
+    assert compact_consumed_tool_outputs(messages, "market") == messages
+    print("✓ A chained tool call keeps the previous output intact")
+
+    # The model writes up the prices, then asks for indicators (the current round)
+    messages = [HumanMessage(content="NVDA")]
+    messages += _round("1", "get_stock_data", PRICES)
+    messages += _round("2", "get_indicators", INDICATORS, text="Prices trend up from 101.5 to 130.5.")
+    compacted = compact_consumed_tool_outputs(messages, "market")
+
+    assert compacted[2].content.startswith("[Compacted tool output:")
+    assert compacted[4].content == INDICATORS, "the current round is never compacted"
+    assert messages[2].content == PRICES, "the state keeps the full output"
+    print("✓ Analyzed output compacted, current round kept in full")
+
+    # Short outputs, other analysts and a disabled limit are left alone
+    assert compact_consumed_tool_outputs(messages, "news") == messages
+    set_config({"tool_output_compaction": {"market": 10000}})
+    assert compact_consumed_tool_outputs(messages, "market") == messages
+    set_config({"tool_output_compaction": DEFAULT_CONFIG["tool_output_compaction"]})
+    print("✓ Untouched below the limit or when disabled")
+
+
+def test_tool_loop_without_text():
+    """Outputs are compacted during a loop whose tool-call turns have no text."""
+    print("\nTesting compaction inside the tool loop")
+    print("=" * 60)
+
+    set_config({"tool_output_compaction": {"market": 200}, "tool_output_compaction_rounds": 2})
+    messages = [HumanMessage(content="NVDA")]
+    messages += _round("1", "get_stock_data", PRICES)
+    messages += _round("2", "get_indicators", INDICATORS)
+    messages += _round("3", "get_indicators", INDICATORS)
+    compacted = compact_consumed_tool_outputs(messages, "market")
+
+    assert compacted[2].content.startswith("[Compacted tool output:")
+    assert compacted[4].content == INDICATORS and compacted[6].content == INDICATORS
+    saved = sum(len(m.content) for m in messages) - sum(len(m.content) for m in compacted)
+    print(f"✓ First output compacted after two more tool rounds ({saved} chars saved)")
+
+    set_config({"tool_output_compaction_rounds": 1})
+    compacted = compact_consumed_tool_outputs(messages, "market")
+    assert compacted[4].content.startswith("[Compacted tool output:")
+    assert compacted[6].content == INDICATORS, "the current round is never compacted"
+    print("✓ One round compacts every output but the current round")
+
+    set_config(
+        {
+            "tool_output_compaction": DEFAULT_CONFIG["tool_output_compaction"],
+            "tool_output_compaction_rounds": DEFAULT_CONFIG["tool_output_compaction_rounds"],
+        }
+    )
+
+
+if __name__ == "__main__":
+    test_digest_keeps_head_and_tail()
+    test_chained_tool_calls_keep_raw_data()
+    test_tool_loop_without_text()
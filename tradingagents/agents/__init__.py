@@ -6,6 +6,7 @@ from .analysts.fundamentals_analyst import create_fundamentals_analyst
 from .analysts.market_analyst import create_market_analyst
 from .analysts.news_analyst import create_news_analyst
 from .analysts.social_media_analyst import create_social_media_analyst
+from .analysts.research_brief import create_research_brief
 
 from .researchers.bear_researcher import create_bear_researcher
 from .researchers.bull_researcher import create_bull_researcher
@@ -42,6 +43,7 @@ __all__ = [
     "create_risk_manager",
     "create_safe_debator",
     "create_social_media_analyst",
+    "create_research_brief",
     "create_trader",
     "create_short_term_predictor",
     "create_medium_term_predictor",
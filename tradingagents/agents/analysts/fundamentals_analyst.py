@@ -1,7 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement, get_insider_sentiment, get_insider_transactions
+from tradingagents.agents.utils.agent_utils import get_fundamentals, get_balance_sheet, get_cashflow, get_income_statement, get_insider_sentiment, get_insider_transactions, compact_consumed_tool_outputs
+from tradingagents.agents.utils.prompt_profiler import get_prompt_profiler
 from tradingagents.dataflows.config import get_config
 
 
@@ -48,7 +49,11 @@ def create_fundamentals_analyst(llm):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        messages = compact_consumed_tool_outputs(state["messages"], "fundamentals")
+        profiler = get_prompt_profiler()
+        if profiler is not None:
+            profiler.record(prompt.format_messages(messages=messages), tools=tools)
+        result = chain.invoke(messages)
 
         report = ""
 
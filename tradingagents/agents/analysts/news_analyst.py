@@ -1,7 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_news, get_global_news
+from tradingagents.agents.utils.agent_utils import get_news, get_global_news, compact_consumed_tool_outputs
+from tradingagents.agents.utils.prompt_profiler import get_prompt_profiler
 from tradingagents.dataflows.config import get_config
 
 
@@ -43,7 +44,11 @@ def create_news_analyst(llm):
         prompt = prompt.partial(ticker=ticker)
 
         chain = prompt | llm.bind_tools(tools)
-        result = chain.invoke(state["messages"])
+        messages = compact_consumed_tool_outputs(state["messages"], "news")
+        profiler = get_prompt_profiler()
+        if profiler is not None:
+            profiler.record(prompt.format_messages(messages=messages), tools=tools)
+        result = chain.invoke(messages)
 
         report = ""
 
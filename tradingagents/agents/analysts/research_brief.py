@@ -0,0 +1,55 @@
+from tradingagents.agents.utils.prompt_profiler import record_prompt
+from tradingagents.agents.utils.token_utils import truncate_to_tokens
+from tradingagents.dataflows.config import get_config
+
+
+def create_research_brief(llm):
+    """Create the node that condenses the analyst reports into one research brief.
+
+    Downstream agents read the brief instead of all four full reports (see
+    `get_research_context`), so each of them pays for a bounded summary
+    rather than the full analyst output. The full reports stay in the state.
+    """
+
+    def research_brief_node(state) -> dict:
+        config = get_config()
+        if config.get("research_context", "brief") != "brief":
+            return {"research_brief": ""}
+
+        max_tokens = config.get("research_brief_tokens", 1500)
+        company = state["company_of_interest"]
+        trade_date = state["trade_date"]
+
+        reports = [
+            ("Market Analysis", state.get("market_report", "")),
+            ("Social Media Sentiment", state.get("sentiment_report", "")),
+            ("News Analysis", state.get("news_report", "")),
+            ("Fundamentals", state.get("fundamentals_report", "")),
+        ]
+        reports_text = "\n\n".join(
+            f"### {title}\n{report}" for title, report in reports if report
+        )
+        if not reports_text:
+            return {"research_brief": ""}
+
+        prompt = f"""You are preparing a research brief on {company} as of {trade_date} for a team of researchers, traders, risk analysts and price predictors. They will rely on your brief instead of the full analyst reports below, so do not lose any decision-relevant information.
+
+Write a structured brief with these sections:
+1. **Price & Technicals**: the most recent closing price (exact figure and date), recent price range, trend, key moving averages, momentum indicators and support/resistance levels.
+2. **Sentiment**: overall tone and notable shifts.
+3. **News & Macro**: the specific events and macro factors that matter for the stock.
+4. **Fundamentals**: valuation, growth, margins, balance sheet and cash flow figures.
+5. **Key Signals**: bullish and bearish signals as short bullet lists.
+
+Keep exact numbers, dates and price levels. Drop narrative, repetition and generic commentary. Stay under {int(max_tokens * 0.75)} words.
+
+ANALYST REPORTS:
+
+{reports_text}"""
+
+        record_prompt(prompt, {"reports": reports_text})
+        response = llm.invoke(prompt)
+
+        return {"research_brief": truncate_to_tokens(response.content.strip(), max_tokens)}
+
+    return research_brief_node
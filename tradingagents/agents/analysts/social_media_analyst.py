@@ -1,7 +1,8 @@
 from langchain_core.prompts import ChatPromptTemplate, MessagesPlaceholder
 import time
 import json
-from tradingagents.agents.utils.agent_utils import get_news
+from tradingagents.agents.utils.agent_utils import get_news, compact_consumed_tool_outputs
+from tradingagents.agents.utils.prompt_profiler import get_prompt_profiler
 from tradingagents.dataflows.config import get_config
 
 
@@ -44,7 +45,11 @@ def create_social_media_analyst(llm):
 
         chain = prompt | llm.bind_tools(tools)
 
-        result = chain.invoke(state["messages"])
+        messages = compact_consumed_tool_outputs(state["messages"], "social")
+        profiler = get_prompt_profiler()
+        if profiler is not None:
+            profiler.record(prompt.format_messages(messages=messages), tools=tools)
+        result = chain.invoke(messages)
 
         report = ""
 
@@ -1,6 +1,8 @@
 import time
 import json
 
+from tradingagents.agents.utils.prompt_profiler import record_prompt
+
 
 def create_research_manager(llm, memory):
     def research_manager_node(state) -> dict:
@@ -36,6 +38,7 @@ Here are your past reflections on mistakes:
 Here is the debate:
 Debate History:
 {history}"""
+        record_prompt(prompt, {"memories": past_memory_str, "debate_history": history})
         response = llm.invoke(prompt)
 
         new_investment_debate_state = {
@@ -45,6 +48,8 @@ Debate History:
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": response.content,
             "count": investment_debate_state["count"],
+            "history_summary": investment_debate_state.get("history_summary", ""),
+            "summarized_turns": investment_debate_state.get("summarized_turns", 0),
         }
 
         return {
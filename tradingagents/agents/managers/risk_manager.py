@@ -1,6 +1,10 @@
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import resolve_current_price
+from tradingagents.agents.utils.prompt_profiler import record_prompt
+from tradingagents.dataflows.market_snapshot import format_market_snapshot
+
 
 def create_risk_manager(llm, memory):
     def risk_manager_node(state) -> dict:
@@ -11,30 +15,14 @@ def create_risk_manager(llm, memory):
         risk_debate_state = state["risk_debate_state"]
         market_research_report = state["market_report"]
         news_report = state["news_report"]
-        fundamentals_report = state["news_report"]
+        fundamentals_report = state["fundamentals_report"]
         sentiment_report = state["sentiment_report"]
         trader_plan = state["investment_plan"]
         shares_owned = state.get("shares_owned", 0)
         purchase_price = state.get("purchase_price", 0)
 
-        # Extract current price from market report
-        import re
-        current_price = None
-        price_patterns = [
-            r'Close Price[:\s]+\$?(\d+\.?\d*)',
-            r'price at the close[^$]*?was\s+\$?(\d+\.?\d*)',
-            r'close on[^$]*?was\s+\$?(\d+\.?\d*)',
-            r'current price[^$]*?\$?(\d+\.?\d*)',
-            r'\|\s*Close\s*\|\s*(\d+\.?\d+)',
-        ]
-        for pattern in price_patterns:
-            match = re.search(pattern, market_research_report, re.IGNORECASE)
-            if match:
-                try:
-                    current_price = float(match.group(1))
-                    break
-                except (ValueError, IndexError):
-                    continue
+        current_price = resolve_current_price(state)
+        snapshot_line = format_market_snapshot(state.get("market_snapshot"))
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
         past_memories = memory.get_memories(curr_situation, n_matches=2)
@@ -125,6 +113,7 @@ Guidelines for Decision-Making:
 4. **Learn from Past Mistakes**: Use lessons from **{past_memory_str}** to address prior misjudgments and improve the decision you are making now to make sure you don't make a wrong BUY/SELL/HOLD call that loses money.
 
 {position_context}
+{snapshot_line}
 
 Deliverables (ALL REQUIRED):
 1. **Clear Action**: Buy, Sell, or Hold
@@ -153,6 +142,16 @@ Deliverables (ALL REQUIRED):
 
 Focus on actionable insights with SPECIFIC PRICE TARGETS. Build on past lessons, critically evaluate all perspectives, and ensure each decision advances better outcomes with precise execution guidance."""
 
+        record_prompt(
+            prompt,
+            {
+                "decisions": trader_plan,
+                "memories": past_memory_str,
+                "position": position_context,
+                "market_snapshot": snapshot_line,
+                "debate_history": history,
+            },
+        )
         response = llm.invoke(prompt)
 
         new_risk_debate_state = {
@@ -166,6 +165,8 @@ Focus on actionable insights with SPECIFIC PRICE TARGETS. Build on past lessons,
             "current_safe_response": risk_debate_state["current_safe_response"],
             "current_neutral_response": risk_debate_state["current_neutral_response"],
             "count": risk_debate_state["count"],
+            "history_summary": risk_debate_state.get("history_summary", ""),
+            "summarized_turns": risk_debate_state.get("summarized_turns", 0),
         }
 
         return {
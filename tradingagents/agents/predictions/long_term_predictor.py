@@ -1,5 +1,8 @@
 """Long-term (90-day) price prediction agent."""
 
+from tradingagents.agents.utils.prompt_builder import invoke_with_shared_prefix
+from tradingagents.agents.utils.debate_compaction import compact_debate_history
+
 
 def create_long_term_predictor(llm, memory=None):
     """Create a long-term (90-day) price prediction agent.
@@ -19,10 +22,6 @@ def create_long_term_predictor(llm, memory=None):
         # Get all previous analysis
         company = state["company_of_interest"]
         trade_date = state["trade_date"]
-        market_report = state.get("market_report", "")
-        sentiment_report = state.get("sentiment_report", "")
-        news_report = state.get("news_report", "")
-        fundamentals_report = state.get("fundamentals_report", "")
 
         investment_debate_state = state.get("investment_debate_state", {})
         bull_analysis = investment_debate_state.get("bull_history", "")
@@ -38,33 +37,28 @@ def create_long_term_predictor(llm, memory=None):
         memory_context = ""
         if memory:
             try:
-                past_experiences = memory.get_memories(
-                    f"Long-term prediction for {company}", n_matches=3
+                # Reflections are stored against the analyst reports, so
+                # match on those and inject only the distilled lessons
+                curr_situation = "\n\n".join(
+                    state.get(key, "")
+                    for key in ("market_report", "sentiment_report", "news_report", "fundamentals_report")
                 )
+                past_experiences = memory.get_memories(curr_situation, n_matches=3)
                 if past_experiences:
                     memory_text = "\n".join([
-                        f"- Previous: {exp['matched_situation']}\n  Outcome: {exp['recommendation']}"
+                        f"- {exp['recommendation']}"
                         for exp in past_experiences
                     ])
                     memory_context = f"\n\nPast Prediction Performance:\n{memory_text}\n"
             except Exception:
                 memory_context = ""
 
-        prompt = f"""You are the Long-Term Price Predictor (90-day horizon). Your role is to analyze all available data and provide a detailed 90-day price forecast for {company} as of {trade_date}.
-
-COMPREHENSIVE ANALYSIS AVAILABLE:
+        # Older turns are folded into a running summary once over budget
+        debate_history, compaction = compact_debate_history(llm, prediction_debate_state, "prediction")
 
-Market Analysis:
-{market_report}
-
-Sentiment Analysis:
-{sentiment_report}
-
-News Analysis:
-{news_report}
+        prompt = f"""You are the Long-Term Price Predictor (90-day horizon). Your role is to analyze all available data and provide a detailed 90-day price forecast for {company} as of {trade_date}.
 
-Fundamentals:
-{fundamentals_report}
+COMPREHENSIVE ANALYSIS AVAILABLE (in addition to the shared research above):
 
 Bull Case:
 {bull_analysis}
@@ -87,7 +81,7 @@ Short-Term (14-day) Predictor: {current_short_term_response if current_short_ter
 Medium-Term (30-day) Predictor: {current_medium_term_response if current_medium_term_response else "Not yet available"}
 
 DEBATE HISTORY:
-{history if history else "First round of predictions"}
+{debate_history if debate_history else "First round of predictions"}
 
 YOUR TASK:
 Provide a comprehensive LONG-TERM (90-day) price prediction with the following structure:
@@ -114,7 +108,16 @@ Start your response with "Long-Term Predictor (90-day):" and present your analys
 
 Remember: Focus on LONG-TERM structural factors, fundamental trends, and strategic developments that will materialize over 90 days. Look beyond short-term noise to identify sustainable trends."""
 
-        response = llm.invoke(prompt)
+        response = invoke_with_shared_prefix(
+            llm,
+            state,
+            prompt,
+            sections={
+                "debate_history": [bull_analysis, bear_analysis, debate_history, current_short_term_response, current_medium_term_response],
+                "decisions": [research_decision, trader_plan, final_decision],
+                "memories": memory_context,
+            },
+        )
 
         argument = f"Long-Term Predictor (90-day): {response.content}"
 
@@ -129,6 +132,7 @@ Remember: Focus on LONG-TERM structural factors, fundamental trends, and strateg
             "current_long_term_response": argument,
             "final_predictions": prediction_debate_state.get("final_predictions", ""),
             "count": prediction_debate_state.get("count", 0) + 1,
+            **compaction,
         }
 
         return {"prediction_debate_state": new_prediction_debate_state}
@@ -2,6 +2,8 @@
 
 import re
 
+from tradingagents.agents.utils.prompt_profiler import record_prompt
+
 
 def create_prediction_manager(llm, memory=None):
     """Create a prediction manager that consolidates all timeframe predictions.
@@ -24,12 +26,16 @@ def create_prediction_manager(llm, memory=None):
         memory_context = ""
         if memory:
             try:
-                past_experiences = memory.get_memories(
-                    f"Prediction management for {company}", n_matches=3
+                # Reflections are stored against the analyst reports, so
+                # match on those and inject only the distilled lessons
+                curr_situation = "\n\n".join(
+                    state.get(key, "")
+                    for key in ("market_report", "sentiment_report", "news_report", "fundamentals_report")
                 )
+                past_experiences = memory.get_memories(curr_situation, n_matches=3)
                 if past_experiences:
                     memory_text = "\n".join([
-                        f"- Previous: {exp['matched_situation']}\n  Outcome: {exp['recommendation']}"
+                        f"- {exp['recommendation']}"
                         for exp in past_experiences
                     ])
                     memory_context = f"\n\nPast Prediction Consolidation Performance:\n{memory_text}\n"
@@ -91,6 +97,13 @@ Current Price: $XX.XX (from market data)
 
 Be precise with numbers extracted from the predictor responses. If probabilities don't sum to 100%, normalize them and note the adjustment."""
 
+        record_prompt(
+            prompt,
+            {
+                "debate_history": [short_term_response, medium_term_response, long_term_response],
+                "memories": memory_context,
+            },
+        )
         response = llm.invoke(prompt)
 
         final_predictions_content = response.content
@@ -107,6 +120,8 @@ Be precise with numbers extracted from the predictor responses. If probabilities
             "current_long_term_response": long_term_response,
             "final_predictions": final_predictions_content,
             "count": prediction_debate_state.get("count", 0) + 1,
+            "history_summary": prediction_debate_state.get("history_summary", ""),
+            "summarized_turns": prediction_debate_state.get("summarized_turns", 0),
         }
 
         return {
@@ -1,6 +1,8 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from tradingagents.agents.utils.prompt_builder import invoke_with_shared_prefix
+from tradingagents.agents.utils.debate_compaction import compact_debate_history
 
 
 def create_bear_researcher(llm, memory):
@@ -22,6 +24,9 @@ def create_bear_researcher(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        # Older turns are folded into a running summary once over budget
+        debate_history, compaction = compact_debate_history(llm, investment_debate_state, "investment")
+
         prompt = f"""You are a Bear Analyst making the case against investing in the stock. Your goal is to present a well-reasoned argument emphasizing risks, challenges, and negative indicators. Leverage the provided research and data to highlight potential downsides and counter bullish arguments effectively.
 
 Key points to focus on:
@@ -34,17 +39,22 @@ Key points to focus on:
 
 Resources available:
 
-Market research report: {market_research_report}
-Social media sentiment report: {sentiment_report}
-Latest world affairs news: {news_report}
-Company fundamentals report: {fundamentals_report}
-Conversation history of the debate: {history}
+The shared research above.
+Conversation history of the debate: {debate_history}
 Last bull argument: {current_response}
 Reflections from similar situations and lessons learned: {past_memory_str}
 Use this information to deliver a compelling bear argument, refute the bull's claims, and engage in a dynamic debate that demonstrates the risks and weaknesses of investing in the stock. You must also address reflections and learn from lessons and mistakes you made in the past.
 """
 
-        response = llm.invoke(prompt)
+        response = invoke_with_shared_prefix(
+            llm,
+            state,
+            prompt,
+            sections={
+                "debate_history": [debate_history, current_response],
+                "memories": past_memory_str,
+            },
+        )
 
         argument = f"Bear Analyst: {response.content}"
 
@@ -54,6 +64,7 @@ Use this information to deliver a compelling bear argument, refute the bull's cl
             "bull_history": investment_debate_state.get("bull_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            **compaction,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
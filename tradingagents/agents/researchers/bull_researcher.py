@@ -1,6 +1,8 @@
 from langchain_core.messages import AIMessage
 import time
 import json
+from tradingagents.agents.utils.prompt_builder import invoke_with_shared_prefix
+from tradingagents.agents.utils.debate_compaction import compact_debate_history
 
 
 def create_bull_researcher(llm, memory):
@@ -22,6 +24,9 @@ def create_bull_researcher(llm, memory):
         for i, rec in enumerate(past_memories, 1):
             past_memory_str += rec["recommendation"] + "\n\n"
 
+        # Older turns are folded into a running summary once over budget
+        debate_history, compaction = compact_debate_history(llm, investment_debate_state, "investment")
+
         prompt = f"""You are a Bull Analyst advocating for investing in the stock. Your task is to build a strong, evidence-based case emphasizing growth potential, competitive advantages, and positive market indicators. Leverage the provided research and data to address concerns and counter bearish arguments effectively.
 
 Key points to focus on:
@@ -32,17 +37,22 @@ Key points to focus on:
 - Engagement: Present your argument in a conversational style, engaging directly with the bear analyst's points and debating effectively rather than just listing data.
 
 Resources available:
-Market research report: {market_research_report}
-Social media sentiment report: {sentiment_report}
-Latest world affairs news: {news_report}
-Company fundamentals report: {fundamentals_report}
-Conversation history of the debate: {history}
+The shared research above.
+Conversation history of the debate: {debate_history}
 Last bear argument: {current_response}
 Reflections from similar situations and lessons learned: {past_memory_str}
 Use this information to deliver a compelling bull argument, refute the bear's concerns, and engage in a dynamic debate that demonstrates the strengths of the bull position. You must also address reflections and learn from lessons and mistakes you made in the past.
 """
 
-        response = llm.invoke(prompt)
+        response = invoke_with_shared_prefix(
+            llm,
+            state,
+            prompt,
+            sections={
+                "debate_history": [debate_history, current_response],
+                "memories": past_memory_str,
+            },
+        )
 
         argument = f"Bull Analyst: {response.content}"
 
@@ -52,6 +62,7 @@ Use this information to deliver a compelling bull argument, refute the bear's co
             "bear_history": investment_debate_state.get("bear_history", ""),
             "current_response": argument,
             "count": investment_debate_state["count"] + 1,
+            **compaction,
         }
 
         return {"investment_debate_state": new_investment_debate_state}
@@ -2,6 +2,10 @@ import functools
 import time
 import json
 
+from tradingagents.agents.utils.agent_utils import resolve_current_price
+from tradingagents.agents.utils.prompt_profiler import record_prompt
+from tradingagents.dataflows.market_snapshot import format_market_snapshot
+
 
 def create_trader(llm, memory):
     def trader_node(state, name):
@@ -14,24 +18,8 @@ def create_trader(llm, memory):
         shares_owned = state.get("shares_owned", 0)
         purchase_price = state.get("purchase_price", 0)
 
-        # Extract current price from market report
-        import re
-        current_price = None
-        price_patterns = [
-            r'Close Price[:\s]+\$?(\d+\.?\d*)',
-            r'price at the close[^$]*?was\s+\$?(\d+\.?\d*)',
-            r'close on[^$]*?was\s+\$?(\d+\.?\d*)',
-            r'current price[^$]*?\$?(\d+\.?\d*)',
-            r'\|\s*Close\s*\|\s*(\d+\.?\d+)',
-        ]
-        for pattern in price_patterns:
-            match = re.search(pattern, market_research_report, re.IGNORECASE)
-            if match:
-                try:
-                    current_price = float(match.group(1))
-                    break
-                except (ValueError, IndexError):
-                    continue
+        current_price = resolve_current_price(state)
+        snapshot_line = format_market_snapshot(state.get("market_snapshot"))
 
         curr_situation = f"{market_research_report}\n\n{sentiment_report}\n\n{news_report}\n\n{fundamentals_report}"
         past_memories = memory.get_memories(curr_situation, n_matches=2)
@@ -65,6 +53,9 @@ def create_trader(llm, memory):
                 position_context += f"**CRITICAL**: The current market price is ${current_price:.2f}. All your price targets must be relative to THIS price.\n\n"
             position_context += "You must provide:\n1. Specific PRICE TARGET relative to current market price (e.g., 'Buy at $X-Y' or 'Wait for pullback to $X')\n2. Percentage of planned position to establish\n3. Timeframe for execution"
 
+        if snapshot_line:
+            position_context += f"\n\n{snapshot_line}"
+
         context = {
             "role": "user",
             "content": f"Based on a comprehensive analysis by a team of analysts, here is an investment plan tailored for {company_name}. This plan incorporates insights from current technical market trends, macroeconomic indicators, and social media sentiment. Use this plan as a foundation for evaluating your next trading decision.\n\nProposed Investment Plan: {investment_plan}{position_context}\n\nLeverage these insights to make an informed and strategic decision.",
@@ -100,6 +91,14 @@ Do not forget to utilize lessons from past decisions to learn from your mistakes
             context,
         ]
 
+        record_prompt(
+            messages,
+            {
+                "memories": past_memory_str,
+                "decisions": investment_plan,
+                "position": position_context,
+            },
+        )
         result = llm.invoke(messages)
 
         return {
@@ -5,6 +5,7 @@ from langchain_openai import ChatOpenAI
 from tradingagents.agents import *
 from langgraph.prebuilt import ToolNode
 from langgraph.graph import END, StateGraph, START, MessagesState
+from tradingagents.dataflows.market_snapshot import MarketSnapshot
 
 
 # Researcher team state
@@ -19,6 +20,8 @@ class InvestDebateState(TypedDict):
     current_response: Annotated[str, "Latest response"]  # Last response
     judge_decision: Annotated[str, "Final judge decision"]  # Last response
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    history_summary: Annotated[str, "Running summary of compacted earlier turns"]
+    summarized_turns: Annotated[int, "Number of turns folded into the summary"]
 
 
 # Risk management team state
@@ -45,6 +48,8 @@ class RiskDebateState(TypedDict):
     ]  # Last response
     judge_decision: Annotated[str, "Judge's decision"]
     count: Annotated[int, "Length of the current conversation"]  # Conversation length
+    history_summary: Annotated[str, "Running summary of compacted earlier turns"]
+    summarized_turns: Annotated[int, "Number of turns folded into the summary"]
 
 
 # Prediction team state
@@ -71,6 +76,8 @@ class PredictionDebateState(TypedDict):
     ]
     final_predictions: Annotated[str, "Consolidated predictions summary"]
     count: Annotated[int, "Length of the current conversation"]
+    history_summary: Annotated[str, "Running summary of compacted earlier turns"]
+    summarized_turns: Annotated[int, "Number of turns folded into the summary"]
 
 
 class AgentState(MessagesState):
@@ -78,6 +85,9 @@ class AgentState(MessagesState):
     trade_date: Annotated[str, "What date we are trading at"]
     shares_owned: Annotated[float, "Number of shares currently owned"]
     purchase_price: Annotated[float, "Price per share at which current position was purchased"]
+    market_snapshot: Annotated[
+        Optional[MarketSnapshot], "Price snapshot at the trade date (None if unavailable)"
+    ]
 
     sender: Annotated[str, "Agent that sent this message"]
 
@@ -88,6 +98,9 @@ class AgentState(MessagesState):
         str, "Report from the News Researcher of current world affairs"
     ]
     fundamentals_report: Annotated[str, "Report from the Fundamentals Researcher"]
+    research_brief: Annotated[
+        str, "Condensed brief of the analyst reports for downstream agents"
+    ]
 
     # researcher team discussion step
     investment_debate_state: Annotated[
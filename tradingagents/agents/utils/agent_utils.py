@@ -1,4 +1,6 @@
-from langchain_core.messages import HumanMessage, RemoveMessage
+import re
+
+from langchain_core.messages import AIMessage, HumanMessage, RemoveMessage, ToolMessage
 
 # Import tools from separate utility files
 from tradingagents.agents.utils.core_stock_tools import (
@@ -19,6 +21,8 @@ from tradingagents.agents.utils.news_data_tools import (
     get_insider_transactions,
     get_global_news
 )
+from tradingagents.dataflows.config import get_config
+from tradingagents.dataflows.market_snapshot import format_market_snapshot
 
 def create_msg_delete():
     def delete_messages(state):
@@ -36,4 +40,162 @@ def create_msg_delete():
     return delete_messages
 
 
-        
\ No newline at end of file
+        
+
+
+# Fallbacks for runs without a market snapshot: prices quoted in the market report
+_REPORT_PRICE_PATTERNS = [
+    r'Close Price[:\s]+\$?(\d+\.?\d*)',
+    r'price at the close[^$]*?was\s+\$?(\d+\.?\d*)',
+    r'close on[^$]*?was\s+\$?(\d+\.?\d*)',
+    r'current price[^$]*?\$?(\d+\.?\d*)',
+    r'\|\s*Close\s*\|\s*(\d+\.?\d+)',
+]
+
+
+def resolve_current_price(state):
+    """Return the current price for the state's ticker, or None if unknown.
+
+    Uses the last close from the market snapshot and only falls back to
+    scanning the market report when no snapshot is available.
+    """
+    snapshot = state.get("market_snapshot")
+    if snapshot:
+        return snapshot["last_close"]
+
+    market_report = state.get("market_report", "")
+    for pattern in _REPORT_PRICE_PATTERNS:
+        match = re.search(pattern, market_report, re.IGNORECASE)
+        if match:
+            try:
+                return float(match.group(1))
+            except (ValueError, IndexError):
+                continue
+    return None
+
+
+def get_research_context(state):
+    """Return the analyst research to include in a downstream agent's prompt.
+
+    By default this is the condensed research brief. With `research_context`
+    set to "full" in the config (or when no brief was produced), the four full
+    analyst reports are returned instead. The market snapshot, when
+    available, is placed first.
+    """
+    snapshot = format_market_snapshot(state.get("market_snapshot"))
+    prefix = f"{snapshot}\n\n" if snapshot else ""
+
+    brief = state.get("research_brief", "")
+    if brief and get_config().get("research_context", "brief") == "brief":
+        return f"{prefix}Research Brief (condensed from the analyst reports):\n{brief}"
+
+    return (
+        f"{prefix}"
+        f"Market Research Report: {state.get('market_report', '')}\n"
+        f"Social Media Sentiment Report: {state.get('sentiment_report', '')}\n"
+        f"Latest World Affairs Report: {state.get('news_report', '')}\n"
+        f"Company Fundamentals Report: {state.get('fundamentals_report', '')}"
+    )
+
+
+def research_context_sections(state):
+    """The parts of `get_research_context` by prompt section, for profiling."""
+    sections = {"market_snapshot": format_market_snapshot(state.get("market_snapshot"))}
+
+    brief = state.get("research_brief", "")
+    if brief and get_config().get("research_context", "brief") == "brief":
+        sections["research_brief"] = brief
+    else:
+        sections["reports"] = [
+            state.get(key, "")
+            for key in ("market_report", "sentiment_report", "news_report", "fundamentals_report")
+        ]
+    return sections
+
+
+def digest_tool_output(content: str, max_chars: int) -> str:
+    """Shorten a tool output to roughly `max_chars`, keeping its first and last lines."""
+    lines = content.splitlines()
+    head, tail = [], []
+    head_budget, tail_budget = max_chars * 2 // 3, max_chars // 3
+
+    for line in lines:
+        if head_budget - len(line) < 0:
+            break
+        head.append(line)
+        head_budget -= len(line) + 1
+    for line in reversed(lines[len(head):]):
+        if tail_budget - len(line) < 0:
+            break
+        tail.insert(0, line)
+        tail_budget -= len(line) + 1
+
+    omitted = len(lines) - len(head) - len(tail)
+    if not head:
+        # A few very long lines (e.g. raw JSON): cut by characters instead
+        return (
+            f"[Compacted tool output: {len(content)} chars; already analyzed in full]\n"
+            f"{content[:max_chars * 2 // 3]}\n... [truncated] ...\n{content[-(max_chars // 3):]}"
+        )
+    return "\n".join(
+        [f"[Compacted tool output: {len(content)} chars in {len(lines)} lines; already analyzed in full]"]
+        + head
+        + [f"... [{omitted} lines omitted] ..."]
+        + tail
+    )
+
+
+def _has_text(message) -> bool:
+    """Whether a message has non-empty text content (not just tool calls)."""
+    content = message.content
+    if isinstance(content, list):
+        content = "".join(
+            block if isinstance(block, str) else str(block.get("text", ""))
+            for block in content
+        )
+    return bool(str(content or "").strip())
+
+
+def compact_consumed_tool_outputs(messages, analyst: str):
+    """Replace large tool outputs the model has already analyzed with digests.
+
+    Within an analyst loop every ToolMessage is otherwise resent on each later
+    LLM call, so tokens grow quadratically with the number of tool calls. A
+    tool output counts as analyzed once an AIMessage with text content
+    follows it, or once `tool_output_compaction_rounds` later AIMessages do.
+    Tool-call turns usually have empty content, so the second rule is what
+    compacts outputs during the tool loop; with the default of 2, an output
+    stays intact for the turn that reads it and one chained call after it,
+    and the current tool round is never compacted. Outputs longer than the
+    analyst's limit in `tool_output_compaction` (characters; None disables)
+    are replaced in the prompt only; the state keeps the full output.
+    """
+    config = get_config()
+    max_chars = config.get("tool_output_compaction", {}).get(analyst)
+    if not max_chars:
+        return messages
+    max_rounds = config.get("tool_output_compaction_rounds", 2)
+
+    # Walk backwards, counting the model turns that follow each message
+    consumed = [False] * len(messages)
+    later_turns, analyzed = 0, False
+    for i in range(len(messages) - 1, -1, -1):
+        message = messages[i]
+        consumed[i] = analyzed or later_turns >= max_rounds
+        if isinstance(message, AIMessage):
+            later_turns += 1
+            analyzed = analyzed or _has_text(message)
+
+    compacted = []
+    for i, message in enumerate(messages):
+        if (
+            consumed[i]
+            and isinstance(message, ToolMessage)
+            and isinstance(message.content, str)
+            and len(message.content) > max_chars
+        ):
+            message = message.model_copy(
+                update={"content": digest_tool_output(message.content, max_chars)}
+            )
+        compacted.append(message)
+    return compacted
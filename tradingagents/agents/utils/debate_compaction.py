@@ -0,0 +1,109 @@
+"""Rolling compaction of debate histories.
+
+Every debater resends the whole debate `history` on each turn, so prompt size
+grows quadratically with the number of rounds. Once a stage's history exceeds
+its token budget, turns older than the last `keep_last_turns` are folded into
+a bounded running summary stored on the debate state (`history_summary` and
+`summarized_turns`). The full `history` is still kept for the judges, the
+logs and the UI; only the text sent to the debaters is compacted.
+"""
+
+import re
+from typing import Any, Dict, List, Tuple
+
+from tradingagents.dataflows.config import get_config
+
+from .prompt_profiler import record_prompt
+from .token_utils import estimate_tokens, truncate_to_tokens
+
+
+# Labels each debater prefixes to its turn when appending it to `history`
+TURN_LABELS = (
+    "Bull Analyst:",
+    "Bear Analyst:",
+    "Risky Analyst:",
+    "Safe Analyst:",
+    "Neutral Analyst:",
+    "Short-Term Predictor (14-day):",
+    "Medium-Term Predictor (30-day):",
+    "Long-Term Predictor (90-day):",
+)
+
+_TURN_SPLIT = re.compile(
+    r"\n+(?=(?:" + "|".join(re.escape(label) for label in TURN_LABELS) + "))"
+)
+
+DEFAULT_COMPACTION = {
+    "max_history_tokens": 4000,  # Compact once the history exceeds this; None disables
+    "keep_last_turns": 3,  # Most recent turns always sent verbatim
+    "summary_tokens": 800,  # Upper bound on the running summary
+}
+
+
+def get_compaction_settings(stage: str) -> Dict[str, Any]:
+    """Compaction settings for a debate stage ("investment", "risk" or "prediction")."""
+    overrides = get_config().get("debate_compaction", {}).get(stage, {})
+    return {**DEFAULT_COMPACTION, **overrides}
+
+
+def split_turns(history: str) -> List[str]:
+    """Split a debate history into individual labelled turns."""
+    return [turn.strip() for turn in _TURN_SPLIT.split(history) if turn.strip()]
+
+
+def _summarize_turns(llm, summary: str, turns: List[str], summary_tokens: int) -> str:
+    """Fold `turns` into the running `summary`."""
+    prompt = f"""You maintain a running summary of a multi-agent investment debate. Update the summary below with the new turns.
+
+Keep each participant's key claims, the specific numbers, price levels and evidence they cited, and the points of disagreement that are still open. Drop repetition and rhetoric. Attribute points to their speaker. Stay under {int(summary_tokens * 0.75)} words.
+
+Current summary:
+{summary if summary else "(none yet)"}
+
+New turns:
+{chr(10).join(turns)}
+
+Return only the updated summary."""
+
+    record_prompt(prompt, {"debate_history": [summary, *turns]})
+    response = llm.invoke(prompt)
+    return truncate_to_tokens(response.content.strip(), summary_tokens)
+
+
+def compact_debate_history(
+    llm, debate_state: Dict[str, Any], stage: str
+) -> Tuple[str, Dict[str, Any]]:
+    """Build the debate history to put in a debater's prompt.
+
+    Args:
+        llm: Model used to update the running summary
+        debate_state: The stage's current debate state
+        stage: "investment", "risk" or "prediction"
+
+    Returns:
+        The history text for the prompt, and the `history_summary` /
+        `summarized_turns` fields to store on the new debate state.
+    """
+    history = debate_state.get("history", "")
+    summary = debate_state.get("history_summary", "")
+    summarized_turns = debate_state.get("summarized_turns", 0)
+
+    settings = get_compaction_settings(stage)
+    max_tokens = settings["max_history_tokens"]
+    if max_tokens is None or estimate_tokens(history) <= max_tokens:
+        return history, {"history_summary": summary, "summarized_turns": summarized_turns}
+
+    turns = split_turns(history)
+    fold_until = len(turns) - settings["keep_last_turns"]
+    if fold_until > summarized_turns:
+        summary = _summarize_turns(
+            llm, summary, turns[summarized_turns:fold_until], settings["summary_tokens"]
+        )
+        summarized_turns = fold_until
+
+    recent = "\n".join(turns[summarized_turns:])
+    compacted = (
+        f"Summary of earlier turns:\n{summary}\n\n"
+        f"Most recent turns (verbatim):\n{recent}"
+    )
+    return compacted, {"history_summary": summary, "summarized_turns": summarized_turns}
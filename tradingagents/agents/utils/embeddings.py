@@ -0,0 +1,101 @@
+"""Embedding backends for agent memories.
+
+An embedder exposes `model`, a name that identifies its vector space (used
+in cache keys and stored with persistent memories), and `embed(texts)`,
+which encodes a batch of texts in one call.
+
+- "openai": the OpenAI-compatible embeddings endpoint at `backend_url`
+  (`nomic-embed-text` on Ollama, `text-embedding-3-small` otherwise)
+- "hashing": a local, dependency-free bag-of-words embedder. Word unigrams
+  and bigrams are hashed into `hashing_embedding_dim` signed buckets with
+  sublinear term frequency and L2-normalized, so cosine similarity measures
+  term overlap. It needs no network or fitted vocabulary and encodes a full
+  set of analyst reports in a few milliseconds.
+"""
+
+import hashlib
+import re
+from functools import lru_cache
+from typing import Any, Dict, List, Sequence, Tuple
+
+import numpy as np
+
+
+EMBEDDING_BACKENDS = ("openai", "hashing")
+
+_TOKEN = re.compile(r"[a-z0-9]+(?:[.'][a-z0-9]+)*")
+# Words that carry no signal for matching market situations
+_STOP_WORDS = frozenset(
+    "a an and are as at be been but by for from has have in is it its of on or "
+    "that the their this to was were will with".split()
+)
+
+
+class OpenAIEmbedder:
+    """Embeddings from an OpenAI-compatible endpoint."""
+
+    def __init__(self, backend_url: str):
+        # Imported here so the local backend works without the OpenAI client
+        from openai import OpenAI
+
+        if backend_url == "http://localhost:11434/v1":
+            self.model = "nomic-embed-text"
+        else:
+            self.model = "text-embedding-3-small"
+        self.client = OpenAI(base_url=backend_url)
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        if not texts:
+            return []
+        response = self.client.embeddings.create(model=self.model, input=list(texts))
+        return [item.embedding for item in sorted(response.data, key=lambda d: d.index)]
+
+
+@lru_cache(maxsize=200_000)
+def _bucket(feature: str, dim: int) -> Tuple[int, float]:
+    # A stable hash (unlike hash()) keeps vectors comparable across processes
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    value = int.from_bytes(digest, "little")
+    return value % dim, 1.0 if value >> 63 else -1.0
+
+
+class HashingEmbedder:
+    """Local hashed bag-of-words embeddings computed with NumPy."""
+
+    def __init__(self, dim: int = 1024):
+        self.dim = dim
+        self.model = f"hashing-{dim}"
+
+    def _features(self, text: str) -> List[str]:
+        words = [w for w in _TOKEN.findall(text.lower()) if w not in _STOP_WORDS]
+        return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+    def embed(self, texts: Sequence[str]) -> List[List[float]]:
+        matrix = np.zeros((len(texts), self.dim), dtype=np.float32)
+        for row, text in enumerate(texts):
+            counts: Dict[str, int] = {}
+            for feature in self._features(text):
+                counts[feature] = counts.get(feature, 0) + 1
+            if not counts:
+                continue
+            buckets = [_bucket(feature, self.dim) for feature in counts]
+            columns = np.fromiter((b[0] for b in buckets), dtype=np.int64, count=len(buckets))
+            signs = np.fromiter((b[1] for b in buckets), dtype=np.float32, count=len(buckets))
+            weights = 1.0 + np.log(np.fromiter(counts.values(), dtype=np.float32, count=len(counts)))
+            np.add.at(matrix[row], columns, signs * weights)
+
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        matrix /= np.where(norms == 0, 1.0, norms)
+        return matrix.tolist()
+
+
+def create_embedder(config: Dict[str, Any]):
+    """Create the embedder selected by `embedding_backend` in the config."""
+    backend = config.get("embedding_backend", "openai")
+    if backend == "openai":
+        return OpenAIEmbedder(config["backend_url"])
+    if backend == "hashing":
+        return HashingEmbedder(config.get("hashing_embedding_dim", 1024))
+    raise ValueError(
+        f"Unsupported embedding backend: {backend}. Options: {EMBEDDING_BACKENDS}"
+    )
@@ -1,69 +1,681 @@
+import hashlib
+import itertools
+import os
+import sqlite3
+import threading
+import uuid
+from array import array
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence
+
 import chromadb
+import numpy as np
 from chromadb.config import Settings
-from openai import OpenAI
 
+from .embeddings import create_embedder
+from .memory_store import PersistentCollection
+from .token_utils import split_into_chunks
 
-class FinancialSituationMemory:
-    def __init__(self, name, config):
-        if config["backend_url"] == "http://localhost:11434/v1":
-            self.embedding = "nomic-embed-text"
+
+MEMORY_BACKENDS = ("chroma", "persistent", "numpy")
+CHUNK_AGGREGATIONS = ("max", "mean")
+VECTOR_DTYPES = ("float32", "float16", "int8")
+EVICTION_POLICIES = ("lru", "age")
+# Memoized query results kept per memory
+RETRIEVAL_CACHE_SIZE = 256
+
+
+class NumpyCollection:
+    """In-process vector store over contiguous NumPy arrays.
+
+    Implements the subset of the Chroma collection API used by
+    `FinancialSituationMemory` (`count`, `add`, `query`) plus `touch`.
+    Vectors are L2-normalized and stored as float32, float16 or int8 (with
+    one float32 scale per row), and searched with a single matrix-vector
+    product, so distances are cosine distances. int8 is the default: it is
+    the smallest and, unlike float16, upcasts quickly for the product.
+
+    Entries are situations: rows sharing the `situation_id` metadata (the
+    chunks of one situation) are deduplicated and evicted together. An added
+    situation whose chunks all have cosine similarity of at least
+    `dedup_threshold` with the chunks of a stored situation replaces that
+    situation's metadata instead of being stored again. Above `max_entries`
+    situations, the least recently matched ("lru") or oldest ("age") are
+    evicted.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        dtype: str = "int8",
+        max_entries: Optional[int] = None,
+        eviction: str = "lru",
+        dedup_threshold: Optional[float] = 0.98,
+    ):
+        if dtype not in VECTOR_DTYPES:
+            raise ValueError(f"Unsupported vector dtype: {dtype}. Options: {VECTOR_DTYPES}")
+        if eviction not in EVICTION_POLICIES:
+            raise ValueError(f"Unsupported eviction policy: {eviction}. Options: {EVICTION_POLICIES}")
+
+        self.name = name
+        self.dtype = dtype
+        self.max_entries = max_entries
+        self.eviction = eviction
+        self.dedup_threshold = dedup_threshold
+
+        self._lock = threading.Lock()
+        self._clock = itertools.count()
+        self._vectors: Optional[np.ndarray] = None
+        self._scales: Optional[np.ndarray] = None  # int8 only
+        self._ids: List[str] = []
+        self._documents: List[str] = []
+        self._metadatas: List[Dict[str, Any]] = []
+        self._groups: List[str] = []  # situation id of each row
+        self._added: Dict[str, int] = {}  # situation id -> insertion tick
+        self._used: Dict[str, int] = {}  # situation id -> last match tick
+        self.updates = 0  # number of add() calls, for readers' memoization
+
+    # ------------------------------------------------------------------
+    # Encoding
+    # ------------------------------------------------------------------
+
+    def _encode(self, vectors: np.ndarray):
+        if self.dtype == "int8":
+            scales = np.abs(vectors).max(axis=1) / 127
+            scales[scales == 0] = 1.0
+            return np.round(vectors / scales[:, None]).astype(np.int8), scales.astype(np.float32)
+        return vectors.astype(self.dtype), None
+
+    def _similarities(self, queries: np.ndarray) -> np.ndarray:
+        """Cosine similarity of each (normalized) query with every row."""
+        if self._vectors is None:
+            return np.zeros((len(queries), 0), dtype=np.float32)
+        similarities = queries @ self._vectors.astype(np.float32).T
+        if self._scales is not None:
+            similarities *= self._scales
+        return similarities
+
+    @staticmethod
+    def _normalize(embeddings: Sequence[Sequence[float]]) -> np.ndarray:
+        vectors = np.asarray(embeddings, dtype=np.float32)
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        return vectors / np.where(norms == 0, 1.0, norms)
+
+    # ------------------------------------------------------------------
+    # Collection API
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._ids)
+
+    def add(
+        self,
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: Sequence[Sequence[float]],
+        ids: Sequence[str],
+    ) -> None:
+        vectors = self._normalize(embeddings)
+        with self._lock:
+            # Group the new rows by situation, keeping their order
+            new_groups: Dict[str, List[int]] = {}
+            for i, (row_id, metadata) in enumerate(zip(ids, metadatas)):
+                new_groups.setdefault(metadata.get("situation_id", row_id), []).append(i)
+
+            keep = []
+            for group, rows in new_groups.items():
+                duplicate = self._find_duplicate(vectors[rows])
+                if duplicate is None:
+                    keep.extend(rows)
+                    self._added[group] = next(self._clock)
+                    continue
+                # Same situation again: the newer advice wins
+                existing = [i for i, g in enumerate(self._groups) if g == duplicate]
+                for row, i in zip(rows, existing):
+                    self._metadatas[i] = {**metadatas[row], "situation_id": duplicate}
+                self._added[duplicate] = next(self._clock)
+
+            if keep:
+                encoded, scales = self._encode(vectors[keep])
+                if self._vectors is None:
+                    self._vectors, self._scales = encoded, scales
+                else:
+                    self._vectors = np.concatenate([self._vectors, encoded])
+                    if scales is not None:
+                        self._scales = np.concatenate([self._scales, scales])
+                for i in keep:
+                    self._ids.append(ids[i])
+                    self._documents.append(documents[i])
+                    self._metadatas.append(metadatas[i])
+                    self._groups.append(metadatas[i].get("situation_id", ids[i]))
+
+            self._evict()
+            self.updates += 1
+
+    def _find_duplicate(self, vectors: np.ndarray) -> Optional[str]:
+        """Return the stored situation whose chunks all match `vectors`, if any."""
+        if self.dedup_threshold is None or self._vectors is None:
+            return None
+        similarities = self._similarities(vectors[:1])[0]
+        for row in np.flatnonzero(similarities >= self.dedup_threshold):
+            group = self._groups[row]
+            rows = [i for i, g in enumerate(self._groups) if g == group]
+            if len(rows) != len(vectors):
+                continue
+            pairwise = self._similarities(vectors)[:, rows]
+            if np.all(np.diag(pairwise) >= self.dedup_threshold):
+                return group
+        return None
+
+    def _evict(self) -> None:
+        groups = list(dict.fromkeys(self._groups))
+        if self.max_entries is None or len(groups) <= self.max_entries:
+            return
+
+        def last_used(group):
+            if self.eviction == "lru":
+                return max(self._used.get(group, -1), self._added.get(group, -1))
+            return self._added.get(group, -1)
+
+        evicted = set(sorted(groups, key=last_used)[: len(groups) - self.max_entries])
+        keep = [i for i, g in enumerate(self._groups) if g not in evicted]
+        self._vectors = self._vectors[keep]
+        if self._scales is not None:
+            self._scales = self._scales[keep]
+        self._ids = [self._ids[i] for i in keep]
+        self._documents = [self._documents[i] for i in keep]
+        self._metadatas = [self._metadatas[i] for i in keep]
+        self._groups = [self._groups[i] for i in keep]
+        for group in evicted:
+            self._added.pop(group, None)
+            self._used.pop(group, None)
+
+    def touch(self, situation_ids: Sequence[str]) -> None:
+        """Mark situations as recently matched for LRU eviction."""
+        with self._lock:
+            for situation_id in situation_ids:
+                self._used[situation_id] = next(self._clock)
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 1,
+        include: Sequence[str] = ("metadatas", "documents", "distances"),
+    ) -> Dict[str, List[List[Any]]]:
+        """Return the nearest rows by cosine distance, shaped like Chroma results."""
+        queries = self._normalize(query_embeddings)
+        with self._lock:
+            similarities = self._similarities(queries)
+            results: Dict[str, List[List[Any]]] = {
+                "ids": [],
+                "documents": [],
+                "metadatas": [],
+                "distances": [],
+            }
+            k = min(n_results, len(self._ids))
+            for row in similarities:
+                top = np.argpartition(-row, k - 1)[:k] if k else np.array([], dtype=int)
+                top = top[np.argsort(-row[top])]
+                results["ids"].append([self._ids[i] for i in top])
+                results["documents"].append([self._documents[i] for i in top])
+                results["metadatas"].append([dict(self._metadatas[i]) for i in top])
+                results["distances"].append([float(1 - row[i]) for i in top])
+            return results
+
+    def nbytes(self) -> int:
+        """Bytes held by the vector arrays."""
+        with self._lock:
+            if self._vectors is None:
+                return 0
+            return self._vectors.nbytes + (self._scales.nbytes if self._scales is not None else 0)
+
+
+class EmbeddingCache:
+    """Thread-safe embedding cache keyed by a hash of the model and text.
+
+    One instance is shared by all memories using the same cache settings, so
+    the situation string that several agents query in the same run is
+    embedded once. At most `max_entries` embeddings are held in memory
+    (least recently used are dropped first). With a `path`, embeddings are
+    also stored in SQLite and reused across runs.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_entries: int = 20000):
+        self.path = path
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, array]" = OrderedDict()
+        self._conn = None
+
+        if path:
+            os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+            self._conn = sqlite3.connect(path, check_same_thread=False)
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS embeddings (key TEXT PRIMARY KEY, vector BLOB NOT NULL)"
+            )
+            self._conn.commit()
+
+    @staticmethod
+    def make_key(model: str, text: str) -> str:
+        return hashlib.sha256(f"{model}\x00{text}".encode("utf-8")).hexdigest()
+
+    def get(self, model: str, text: str) -> Optional[List[float]]:
+        key = self.make_key(model, text)
+        with self._lock:
+            embedding = self._entries.get(key)
+            if embedding is not None:
+                self._entries.move_to_end(key)
+            elif self._conn is not None:
+                row = self._conn.execute(
+                    "SELECT vector FROM embeddings WHERE key = ?", (key,)
+                ).fetchone()
+                if row is not None:
+                    embedding = array("d", row[0])
+                    self._remember(key, embedding)
+            if embedding is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            return embedding.tolist()
+
+    def _remember(self, key: str, embedding: array) -> None:
+        self._entries[key] = embedding
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def put(self, model: str, text: str, embedding: List[float]) -> None:
+        key = self.make_key(model, text)
+        with self._lock:
+            self._remember(key, array("d", embedding))
+            if self._conn is not None:
+                self._conn.execute(
+                    "INSERT OR REPLACE INTO embeddings (key, vector) VALUES (?, ?)",
+                    (key, array("d", embedding).tobytes()),
+                )
+                self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"hits": self.hits, "misses": self.misses, "entries": len(self._entries)}
+
+
+def create_embedding_cache(config: Dict[str, Any]) -> Optional[EmbeddingCache]:
+    """Create the embedding cache described by the config.
+
+    Reads `embedding_cache` ("off", "memory" or "disk") and
+    `embedding_cache_path` (defaults to `<results_dir>/embedding_cache.sqlite`
+    for "disk"). Returns None when caching is off.
+    """
+    mode = config.get("embedding_cache", "memory")
+    if mode == "off":
+        return None
+    if mode == "memory":
+        return EmbeddingCache()
+    if mode == "disk":
+        return EmbeddingCache(
+            config.get("embedding_cache_path")
+            or os.path.join(config["results_dir"], "embedding_cache.sqlite")
+        )
+    raise ValueError(f"Unsupported embedding cache mode: {mode}. Options: off, memory, disk")
+
+
+def resolve_memory_dir(config: Dict[str, Any]) -> str:
+    """Directory of the persistent memory backend (`memory_dir`, or `<results_dir>/memory`)."""
+    return config.get("memory_dir") or os.path.join(config["results_dir"], "memory")
+
+
+class MemoryRegistry:
+    """Thread-safe, process-wide owner of memory collections.
+
+    Collections are keyed by namespace and memory name, so several graphs
+    (or tenants) can hold a "bull_memory" each in one process while sharing
+    a single Chroma client. Asking again for the same namespace and name
+    returns the same collection, and embedding caches are shared by every
+    memory using the same cache settings.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._chroma_client = None
+        self._collections: Dict[tuple, Any] = {}
+        self._namespaces: Dict[tuple, Optional[str]] = {}
+        self._embedding_caches: Dict[tuple, Optional[EmbeddingCache]] = {}
+
+    @property
+    def chroma_client(self):
+        with self._lock:
+            if self._chroma_client is None:
+                self._chroma_client = chromadb.Client(Settings(allow_reset=True))
+            return self._chroma_client
+
+    @staticmethod
+    def _chroma_name(namespace: Optional[str], name: str) -> str:
+        if not namespace:
+            return name
+        full_name = f"{namespace}_{name}"
+        if len(full_name) <= 63:  # Chroma's limit
+            return full_name
+        digest = hashlib.sha256(namespace.encode("utf-8")).hexdigest()[:16]
+        return f"{digest}_{name}"[:63]
+
+    def get_or_create_collection(
+        self, name: str, config: Dict[str, Any], namespace: Optional[str] = None, model: Optional[str] = None
+    ):
+        """Return the collection for `name` in `namespace` on the configured `memory_backend`.
+
+        "chroma" keeps memories in the shared in-process Chroma client;
+        "numpy" keeps them in a compact in-process `NumpyCollection`;
+        "persistent" stores them under `memory_dir` (defaults to
+        `<results_dir>/memory`, with one subdirectory per namespace) so they
+        survive restarts.
+        """
+        backend = config.get("memory_backend", "chroma")
+        if backend == "persistent":
+            location = os.path.abspath(
+                os.path.join(resolve_memory_dir(config), namespace or "", name)
+            )
+        elif backend in MEMORY_BACKENDS:
+            location = self._chroma_name(namespace, name)
         else:
-            self.embedding = "text-embedding-3-small"
-        self.client = OpenAI(base_url=config["backend_url"])
-        self.chroma_client = chromadb.Client(Settings(allow_reset=True))
-        self.situation_collection = self.chroma_client.create_collection(name=name)
+            raise ValueError(
+                f"Unsupported memory backend: {backend}. Options: {MEMORY_BACKENDS}"
+            )
 
-    def get_embedding(self, text):
-        """Get OpenAI embedding for a text"""
-        
-        response = self.client.embeddings.create(
-            model=self.embedding, input=text
+        key = (backend, location)
+        with self._lock:
+            collection = self._collections.get(key)
+            if collection is not None:
+                return collection
+
+            if backend == "chroma":
+                collection = self.chroma_client.get_or_create_collection(
+                    name=location, metadata={"hnsw:space": "cosine"}
+                )
+            elif backend == "persistent":
+                collection = PersistentCollection(location, model=model)
+            else:
+                collection = NumpyCollection(
+                    location,
+                    dtype=config.get("memory_vector_dtype", "int8"),
+                    max_entries=config.get("memory_max_entries"),
+                    eviction=config.get("memory_eviction", "lru"),
+                    dedup_threshold=config.get("memory_dedup_threshold", 0.98),
+                )
+            self._collections[key] = collection
+            self._namespaces[key] = namespace
+            return collection
+
+    def drop_namespace(self, namespace: str) -> None:
+        """Release the in-process collections of a namespace (files are kept)."""
+        with self._lock:
+            for key in [k for k, ns in self._namespaces.items() if ns == namespace]:
+                backend, location = key
+                if backend == "chroma":
+                    self.chroma_client.delete_collection(location)
+                del self._collections[key]
+                del self._namespaces[key]
+
+    def get_embedding_cache(self, config: Dict[str, Any]) -> Optional[EmbeddingCache]:
+        """Return the process-wide embedding cache for the config's cache settings."""
+        mode = config.get("embedding_cache", "memory")
+        path = None
+        if mode == "disk":
+            path = os.path.abspath(
+                config.get("embedding_cache_path")
+                or os.path.join(config["results_dir"], "embedding_cache.sqlite")
+            )
+        with self._lock:
+            if (mode, path) not in self._embedding_caches:
+                self._embedding_caches[(mode, path)] = create_embedding_cache(config)
+            return self._embedding_caches[(mode, path)]
+
+
+# Shared by every TradingAgentsGraph in the process
+memory_registry = MemoryRegistry()
+
+
+def memory_namespace(config: Dict[str, Any]) -> Optional[str]:
+    """Return the namespace for a new graph's memories.
+
+    `memory_namespace` in the config names a tenant whose graphs share their
+    memories. Without it, in-process backends get a fresh namespace per graph
+    (memories start empty, as before), while the persistent backend uses the
+    top level of `memory_dir` so memories survive restarts.
+    """
+    namespace = config.get("memory_namespace")
+    if namespace:
+        return namespace
+    if config.get("memory_backend", "chroma") == "persistent":
+        return None
+    return f"g{uuid.uuid4().hex[:12]}"
+
+
+class FinancialSituationMemory:
+    def __init__(
+        self,
+        name,
+        config,
+        embedding_cache: Optional[EmbeddingCache] = None,
+        namespace: Optional[str] = None,
+        registry: Optional[MemoryRegistry] = None,
+    ):
+        self.name = name
+        self.embedder = create_embedder(config)
+        self.embedding = self.embedder.model
+        self.registry = registry or memory_registry
+        self.namespace = namespace
+        self.situation_collection = self.registry.get_or_create_collection(
+            name, config, namespace=namespace, model=self.embedding
         )
-        return response.data[0].embedding
+        self.embedding_cache = embedding_cache
+        self.chunk_tokens = config.get("memory_chunk_tokens", 800)
+        self.chunk_aggregation = config.get("memory_chunk_aggregation", "max")
+        self.min_similarity = config.get("memory_min_similarity")
+        if self.chunk_aggregation not in CHUNK_AGGREGATIONS:
+            raise ValueError(
+                f"Unsupported chunk aggregation: {self.chunk_aggregation}. "
+                f"Options: {CHUNK_AGGREGATIONS}"
+            )
+        # Query results keyed by (query hash, n_matches, collection state). The
+        # state changes with every add, including adds by other graphs sharing
+        # the collection, so a hit always reflects the current collection.
+        # Stale states are never hit again; least recently used entries are
+        # evicted beyond RETRIEVAL_CACHE_SIZE.
+        self._retrieval_cache: "OrderedDict[tuple, List[Dict[str, Any]]]" = OrderedDict()
+        self._retrieval_lock = threading.Lock()
 
-    def add_situations(self, situations_and_advice):
-        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)"""
+    def get_embedding(self, text):
+        """Get the embedding for a text, using the shared cache when set"""
+        return self.get_embeddings([text])[0]
 
-        situations = []
-        advice = []
-        ids = []
-        embeddings = []
+    def get_embeddings(self, texts):
+        """Embed several texts, sending only cache misses to the embedder in one batch"""
+        embeddings = [None] * len(texts)
+        missing = []
+        for i, text in enumerate(texts):
+            if self.embedding_cache is not None:
+                embeddings[i] = self.embedding_cache.get(self.embedding, text)
+            if embeddings[i] is None:
+                missing.append(i)
+
+        if missing:
+            computed = self.embedder.embed([texts[i] for i in missing])
+            for i, embedding in zip(missing, computed):
+                embeddings[i] = embedding
+                if self.embedding_cache is not None:
+                    self.embedding_cache.put(self.embedding, texts[i], embedding)
+        return embeddings
+
+    def embed_situations(self, situations):
+        """Chunk and embed situations in one batch.
 
-        offset = self.situation_collection.count()
+        Returns {situation: (chunks, embeddings)}, which can be passed to
+        `add_situations` of every memory using the same embedding model so a
+        situation shared by several memories is embedded once.
+        """
+        unique = list(dict.fromkeys(situations))
+        chunked = [split_into_chunks(situation, self.chunk_tokens) for situation in unique]
+        embeddings = self.get_embeddings([chunk for chunks in chunked for chunk in chunks])
+
+        embedded, offset = {}, 0
+        for situation, chunks in zip(unique, chunked):
+            embedded[situation] = (chunks, embeddings[offset : offset + len(chunks)])
+            offset += len(chunks)
+        return embedded
+
+    def add_situations(self, situations_and_advice, embedded=None):
+        """Add financial situations and their corresponding advice. Parameter is a list of tuples (situation, rec)
+
+        A tuple may carry a third item, the full reflection the advice was
+        distilled from; it is stored with the situation for audit but never
+        returned by `get_memories`.
+
+        Each situation is split into chunks of at most `memory_chunk_tokens`
+        and stored as one row per chunk; all chunks are embedded in one batch
+        unless `embedded` (from `embed_situations`) already holds them. All
+        rows are inserted in one write.
+        """
+        situations = [item[0] for item in situations_and_advice]
+        if embedded is None or any(situation not in embedded for situation in situations):
+            embedded = self.embed_situations(situations)
+
+        chunks = []
+        embeddings = []
+        metadatas = []
+        ids = []
 
-        for i, (situation, recommendation) in enumerate(situations_and_advice):
-            situations.append(situation)
-            advice.append(recommendation)
-            ids.append(str(offset + i))
-            embeddings.append(self.get_embedding(situation))
+        for situation, recommendation, *reflection in situations_and_advice:
+            # Unique ids: collections that deduplicate or evict shrink
+            situation_id = uuid.uuid4().hex
+            situation_chunks, situation_embeddings = embedded[situation]
+            for j, chunk in enumerate(situation_chunks):
+                chunks.append(chunk)
+                embeddings.append(situation_embeddings[j])
+                ids.append(f"{situation_id}-{j}")
+                metadata = {
+                    "recommendation": recommendation,
+                    "situation_id": situation_id,
+                    "chunk_index": j,
+                }
+                if reflection and j == 0:
+                    metadata["reflection"] = reflection[0]
+                metadatas.append(metadata)
+        if not chunks:
+            return
 
         self.situation_collection.add(
-            documents=situations,
-            metadatas=[{"recommendation": rec} for rec in advice],
+            documents=chunks,
+            metadatas=metadatas,
             embeddings=embeddings,
             ids=ids,
         )
+        self.clear_retrieval_cache()
+
+    def clear_retrieval_cache(self):
+        """Forget memoized query results."""
+        with self._retrieval_lock:
+            self._retrieval_cache = OrderedDict()
+
+    def _collection_state(self):
+        # Row count, plus in-place updates on stores that deduplicate
+        collection = self.situation_collection
+        return collection.count(), getattr(collection, "updates", 0)
+
+    def _aggregate_matches(self, results, n_matches):
+        """Score each stored situation from its chunk similarities.
+
+        Returns the best `n_matches` as (situation id, match) pairs.
 
-    def get_memories(self, current_situation, n_matches=1):
-        """Find matching recommendations using OpenAI embeddings"""
-        query_embedding = self.get_embedding(current_situation)
+        With "max" aggregation a situation scores its single best chunk match
+        over all query chunks; with "mean" each query chunk takes its best
+        matching chunk of the situation and those similarities are averaged.
+        Rows stored before chunking count as single-chunk situations.
+        """
+        situations = {}
+        for q, (row_ids, documents, metadatas, distances) in enumerate(
+            zip(results["ids"], results["documents"], results["metadatas"], results["distances"])
+        ):
+            for row_id, document, metadata, distance in zip(row_ids, documents, metadatas, distances):
+                situation = situations.setdefault(
+                    metadata.get("situation_id", row_id),
+                    {"recommendation": metadata["recommendation"], "chunks": {}, "best": {}},
+                )
+                situation["chunks"][metadata.get("chunk_index", 0)] = document
+                similarity = 1 - distance
+                situation["best"][q] = max(situation["best"].get(q, -1.0), similarity)
 
-        results = self.situation_collection.query(
-            query_embeddings=[query_embedding],
-            n_results=n_matches,
-            include=["metadatas", "documents", "distances"],
+        scored = []
+        for situation_id, situation in situations.items():
+            best = list(situation["best"].values())
+            score = max(best) if self.chunk_aggregation == "max" else sum(best) / len(best)
+            scored.append(
+                (
+                    situation_id,
+                    {
+                        "matched_situation": "".join(
+                            situation["chunks"][j] for j in sorted(situation["chunks"])
+                        ),
+                        "recommendation": situation["recommendation"],
+                        "similarity_score": score,
+                    },
+                )
+            )
+        scored.sort(key=lambda item: item[1]["similarity_score"], reverse=True)
+        return scored[:n_matches]
+
+    def get_memories(self, current_situation, n_matches=1, min_similarity=None):
+        """Find matching recommendations by embedding similarity
+
+        Matches scoring below `min_similarity` (default: `memory_min_similarity`
+        from the config, None keeps every match) are dropped, so agents are not
+        prompted with lessons from unrelated situations.
+        """
+        if min_similarity is None:
+            min_similarity = self.min_similarity
+        key = (
+            EmbeddingCache.make_key(self.embedding, current_situation),
+            n_matches,
+            self._collection_state(),
         )
+        with self._retrieval_lock:
+            cached = self._retrieval_cache.get(key)
+            if cached is not None:
+                self._retrieval_cache.move_to_end(key)
+        if cached is None:
+            cached = self._query_memories(current_situation, n_matches)
+            with self._retrieval_lock:
+                self._retrieval_cache[key] = cached
+                while len(self._retrieval_cache) > RETRIEVAL_CACHE_SIZE:
+                    self._retrieval_cache.popitem(last=False)
 
+        if min_similarity is not None:
+            cached = [
+                (situation_id, match)
+                for situation_id, match in cached
+                if match["similarity_score"] >= min_similarity
+            ]
+        touch = getattr(self.situation_collection, "touch", None)
+        if touch is not None:
+            touch([situation_id for situation_id, _ in cached])
+        return [dict(match) for _, match in cached]
+
+    def _query_memories(self, current_situation, n_matches):
         matched_results = []
-        for i in range(len(results["documents"][0])):
-            matched_results.append(
-                {
-                    "matched_situation": results["documents"][0][i],
-                    "recommendation": results["metadatas"][0][i]["recommendation"],
-                    "similarity_score": 1 - results["distances"][0][i],
-                }
+        n_rows = self.situation_collection.count()
+        if n_rows:
+            query_chunks = split_into_chunks(current_situation, self.chunk_tokens)
+            # Every stored chunk is scored so each situation can be aggregated
+            # over all of its chunks
+            results = self.situation_collection.query(
+                query_embeddings=self.get_embeddings(query_chunks),
+                n_results=n_rows,
+                include=["metadatas", "documents", "distances"],
             )
-
+            matched_results = self._aggregate_matches(results, n_matches)
         return matched_results
 
 
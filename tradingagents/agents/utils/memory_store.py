@@ -0,0 +1,383 @@
+"""Persistent on-disk store for agent memories.
+
+Each collection is a directory with three files:
+
+- `vectors.f32`: embeddings as consecutive float32 rows, memory-mapped on read
+- `records.jsonl`: one JSON line per row with its id, document and metadata
+- `meta.json`: the embedding dimension and model
+
+Rows are only ever appended. A write appends and fsyncs the vectors before
+the records, so a row exists once its record line is complete. On open, a
+torn trailing record line or vectors without a record (left by a crash
+mid-write) are cut off. Writers serialize on an exclusive file lock;
+readers in other processes pick up new rows on their next query.
+
+Because rows are never rewritten, a point-in-time snapshot of a memory is
+just the row count of each of its files. Snapshot manifests map each memory
+to those (directory, rows) segments; a worker opens them as read-only
+prefixes layered under its own writable directory (`LayeredCollection`), so
+walk-forward backtests can be sharded by date without leaking later
+lessons.
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: in-process locking only
+    fcntl = None
+
+
+VECTORS_FILE = "vectors.f32"
+RECORDS_FILE = "records.jsonl"
+META_FILE = "meta.json"
+LOCK_FILE = "lock"
+
+
+class _FileLock:
+    """Exclusive inter-process lock on a file (a no-op without fcntl)."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        self._handle = open(self.path, "a")
+        if fcntl is not None:
+            fcntl.flock(self._handle, fcntl.LOCK_EX)
+        return self
+
+    def __exit__(self, *exc):
+        if fcntl is not None:
+            fcntl.flock(self._handle, fcntl.LOCK_UN)
+        self._handle.close()
+
+
+class PersistentCollection:
+    """Append-only vector collection with the subset of the Chroma collection
+    API used by `FinancialSituationMemory` (`count`, `add`, `query`).
+
+    Distances are cosine distances, so `1 - distance` is the cosine
+    similarity.
+    """
+
+    def __init__(self, directory: str, model: Optional[str] = None, max_rows: Optional[int] = None):
+        """Open (or create) the collection stored in `directory`.
+
+        Args:
+            directory: Collection directory
+            model: Embedding model of the vectors; opening a collection
+                written with a different model raises ValueError
+            max_rows: Open a read-only view of the first `max_rows` rows, as
+                recorded by a memory snapshot
+        """
+        self.directory = directory
+        self.model = model
+        self.max_rows = max_rows
+        self.name = os.path.basename(os.path.normpath(directory))
+        os.makedirs(directory, exist_ok=True)
+
+        self._lock = threading.RLock()
+        self._file_lock = _FileLock(os.path.join(directory, LOCK_FILE))
+        self._vectors_path = os.path.join(directory, VECTORS_FILE)
+        self._records_path = os.path.join(directory, RECORDS_FILE)
+        self._meta_path = os.path.join(directory, META_FILE)
+
+        self.dim: Optional[int] = None
+        self._records: List[Dict[str, Any]] = []
+        self._records_offset = 0
+        self._vectors: Optional[np.ndarray] = None
+        self._norms: Optional[np.ndarray] = None
+
+        with self._file_lock:
+            self._recover()
+        self._refresh()
+
+        if os.path.exists(self._meta_path) and model is not None:
+            with open(self._meta_path) as f:
+                stored_model = json.load(f).get("model")
+            if stored_model not in (None, model):
+                raise ValueError(
+                    f"Collection '{self.name}' holds {stored_model} embeddings, "
+                    f"not {model}; use another memory_dir for this embedding backend"
+                )
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _load_dim(self) -> Optional[int]:
+        if self.dim is None and os.path.exists(self._meta_path):
+            with open(self._meta_path) as f:
+                self.dim = json.load(f)["dim"]
+        return self.dim
+
+    def _recover(self) -> None:
+        """Cut off a torn trailing record and vectors without a record."""
+        if not os.path.exists(self._records_path):
+            open(self._records_path, "ab").close()
+        with open(self._records_path, "rb+") as f:
+            data = f.read()
+            complete = data.rfind(b"\n") + 1
+            if complete != len(data):
+                f.truncate(complete)
+                f.flush()
+                os.fsync(f.fileno())
+            n_records = data[:complete].count(b"\n")
+
+        dim = self._load_dim()
+        if dim and os.path.exists(self._vectors_path):
+            expected = n_records * dim * 4
+            if os.path.getsize(self._vectors_path) > expected:
+                with open(self._vectors_path, "rb+") as f:
+                    f.truncate(expected)
+                    os.fsync(f.fileno())
+
+    def _refresh(self) -> None:
+        """Read record lines appended since the last load and remap the vectors."""
+        with self._lock:
+            if os.path.getsize(self._records_path) == self._records_offset or (
+                self.max_rows is not None and len(self._records) >= self.max_rows
+            ):
+                return
+            with open(self._records_path, "rb") as f:
+                f.seek(self._records_offset)
+                data = f.read()
+            # Another process may be mid-write: only take complete lines
+            complete = data.rfind(b"\n") + 1
+            for line in data[:complete].splitlines(keepends=True):
+                if self.max_rows is not None and len(self._records) >= self.max_rows:
+                    break
+                self._records.append(json.loads(line))
+                self._records_offset += len(line)
+
+            dim = self._load_dim()
+            if dim and self._records:
+                vectors = np.memmap(
+                    self._vectors_path,
+                    dtype=np.float32,
+                    mode="r",
+                    shape=(len(self._records), dim),
+                )
+                self._vectors = vectors
+                self._norms = np.linalg.norm(vectors, axis=1)
+
+    # ------------------------------------------------------------------
+    # Collection API
+    # ------------------------------------------------------------------
+
+    def count(self) -> int:
+        self._refresh()
+        return len(self._records)
+
+    def add(
+        self,
+        documents: Sequence[str],
+        metadatas: Sequence[Dict[str, Any]],
+        embeddings: Sequence[Sequence[float]],
+        ids: Sequence[str],
+    ) -> None:
+        """Durably append rows; they are visible to readers once this returns."""
+        if self.max_rows is not None:
+            raise ValueError(f"Snapshot view of collection '{self.name}' is read-only")
+        if not documents:
+            return
+        vectors = np.asarray(embeddings, dtype=np.float32)
+
+        with self._lock, self._file_lock:
+            dim = self._load_dim()
+            if dim is None:
+                dim = self.dim = vectors.shape[1]
+                tmp_path = self._meta_path + ".tmp"
+                with open(tmp_path, "w") as f:
+                    json.dump({"dim": dim, "model": self.model}, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self._meta_path)
+            elif vectors.shape[1] != dim:
+                raise ValueError(
+                    f"Embedding dimension {vectors.shape[1]} does not match "
+                    f"collection '{self.name}' ({dim})"
+                )
+
+            # Rows written by other processes must be counted before appending
+            self._recover()
+            with open(self._vectors_path, "ab") as f:
+                f.write(vectors.tobytes())
+                f.flush()
+                os.fsync(f.fileno())
+            lines = "".join(
+                json.dumps({"id": id_, "document": doc, "metadata": meta}) + "\n"
+                for id_, doc, meta in zip(ids, documents, metadatas)
+            )
+            with open(self._records_path, "ab") as f:
+                f.write(lines.encode("utf-8"))
+                f.flush()
+                os.fsync(f.fileno())
+
+        self._refresh()
+
+    def query(
+        self,
+        query_embeddings: Sequence[Sequence[float]],
+        n_results: int = 1,
+        include: Sequence[str] = ("metadatas", "documents", "distances"),
+    ) -> Dict[str, List[List[Any]]]:
+        """Return the nearest rows by cosine distance, shaped like Chroma results."""
+        self._refresh()
+        results: Dict[str, List[List[Any]]] = {
+            "ids": [],
+            "documents": [],
+            "metadatas": [],
+            "distances": [],
+        }
+        with self._lock:
+            records, vectors, norms = self._records, self._vectors, self._norms
+
+        for query in query_embeddings:
+            if vectors is None:
+                for key in results:
+                    results[key].append([])
+                continue
+            query = np.asarray(query, dtype=np.float32)
+            denominator = norms * (np.linalg.norm(query) or 1.0)
+            similarity = (vectors @ query) / np.where(denominator == 0, 1.0, denominator)
+            # Rows read by a concurrent refresh may not be mapped yet
+            k = min(n_results, len(vectors))
+            top = np.argpartition(-similarity, k - 1)[:k]
+            top = top[np.argsort(-similarity[top])]
+
+            results["ids"].append([records[i]["id"] for i in top])
+            results["documents"].append([records[i]["document"] for i in top])
+            results["metadatas"].append([records[i]["metadata"] for i in top])
+            results["distances"].append([float(1 - similarity[i]) for i in top])
+        return results
+
+    def snapshot_segments(self) -> List[Dict[str, Any]]:
+        """Describe the current rows for a snapshot manifest."""
+        return [{"directory": os.path.abspath(self.directory), "rows": self.count()}]
+
+
+def merge_query_results(
+    results: Sequence[Dict[str, List[List[Any]]]], n_results: int
+) -> Dict[str, List[List[Any]]]:
+    """Merge per-collection query results into the overall nearest rows."""
+    keys = ("ids", "documents", "metadatas", "distances")
+    merged: Dict[str, List[List[Any]]] = {key: [] for key in keys}
+    for q in range(len(results[0]["ids"])):
+        rows = [
+            tuple(result[key][q][i] for key in keys)
+            for result in results
+            for i in range(len(result["ids"][q]))
+        ]
+        rows.sort(key=lambda row: row[3])
+        for j, key in enumerate(keys):
+            merged[key].append([row[j] for row in rows[:n_results]])
+    return merged
+
+
+class LayeredCollection:
+    """Copy-on-write collection: read-only snapshot segments plus a writable top.
+
+    Reads cover the snapshot rows and everything written since; writes only
+    go to `top`, so the snapshot itself never changes.
+    """
+
+    def __init__(self, segments: Sequence[PersistentCollection], top: PersistentCollection):
+        self.segments = list(segments)
+        self.top = top
+        self.name = top.name
+        self.model = top.model
+
+    def count(self) -> int:
+        return sum(segment.count() for segment in self.segments) + self.top.count()
+
+    def add(self, documents, metadatas, embeddings, ids) -> None:
+        self.top.add(documents=documents, metadatas=metadatas, embeddings=embeddings, ids=ids)
+
+    def query(self, query_embeddings, n_results=1, include=("metadatas", "documents", "distances")):
+        return merge_query_results(
+            [
+                collection.query(query_embeddings=query_embeddings, n_results=n_results)
+                for collection in self.segments + [self.top]
+            ],
+            n_results,
+        )
+
+    def snapshot_segments(self) -> List[Dict[str, Any]]:
+        segments = []
+        for segment in self.segments:
+            segments.extend(segment.snapshot_segments())
+        return segments + self.top.snapshot_segments()
+
+
+# ---------------------------------------------------------------------------
+# Snapshots
+# ---------------------------------------------------------------------------
+
+
+def _manifest_path(snapshot_dir: str, tag: str) -> str:
+    return os.path.join(snapshot_dir, f"{tag}.json")
+
+
+def save_snapshot_manifest(snapshot_dir: str, tag: str, collections: Dict[str, Any]) -> str:
+    """Record the current rows of each collection under `tag`.
+
+    Collections are append-only, so a snapshot only stores each segment's
+    directory and row count: it is written in milliseconds and never copies
+    vectors. Returns the manifest path.
+    """
+    os.makedirs(snapshot_dir, exist_ok=True)
+    manifest = {
+        "tag": tag,
+        "memories": {
+            name: {
+                "model": collection.model,
+                "segments": collection.snapshot_segments(),
+            }
+            for name, collection in collections.items()
+        },
+    }
+    path = _manifest_path(snapshot_dir, tag)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as f:
+        json.dump(manifest, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+    return path
+
+
+def list_snapshot_tags(snapshot_dir: str) -> List[str]:
+    """Return the snapshot tags in `snapshot_dir`, sorted."""
+    if not os.path.isdir(snapshot_dir):
+        return []
+    return sorted(name[: -len(".json")] for name in os.listdir(snapshot_dir) if name.endswith(".json"))
+
+
+def find_snapshot_tag(snapshot_dir: str, as_of: str) -> Optional[str]:
+    """Return the latest tag not after `as_of` (tags compare as strings, e.g. ISO dates)."""
+    tags = [tag for tag in list_snapshot_tags(snapshot_dir) if tag <= as_of]
+    return tags[-1] if tags else None
+
+
+def load_snapshot_manifest(snapshot_dir: str, tag: str) -> Dict[str, Any]:
+    path = _manifest_path(snapshot_dir, tag)
+    if not os.path.exists(path):
+        raise ValueError(f"No memory snapshot '{tag}' in {snapshot_dir}")
+    with open(path) as f:
+        return json.load(f)
+
+
+def open_snapshot_collection(entry: Dict[str, Any], overlay_dir: str) -> LayeredCollection:
+    """Open a snapshot entry with new rows written to `overlay_dir`."""
+    segments = [
+        PersistentCollection(segment["directory"], model=entry.get("model"), max_rows=segment["rows"])
+        for segment in entry["segments"]
+        if segment["rows"]
+    ]
+    return LayeredCollection(segments, PersistentCollection(overlay_dir, model=entry.get("model")))
@@ -0,0 +1,119 @@
+"""Prompt assembly with a shared, cache-friendly prefix.
+
+Provider-side prompt caches (OpenAI and Anthropic prompt caching, Ollama KV
+reuse) only help when requests start with an identical prefix. The agents
+that read the team's research, namely the bull and bear researchers, the
+three risk debaters and the three price predictors, therefore send it first,
+as a byte-identical system message, with their role-specific instructions,
+memories and debate history after it. Every call after the first in a run
+can then reuse the cached prefix.
+
+The analysts, the research and risk managers, the trader, the prediction
+manager and the reflector are not covered: they do not include the shared
+research in their prompts, so a prefix would only add tokens.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional
+
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+from tradingagents.dataflows.config import get_config, get_run_object
+
+from .agent_utils import get_research_context, research_context_sections
+from .prompt_profiler import get_prompt_profiler
+
+
+SHARED_PREFIX_TEMPLATE = """You are one of several specialist agents on a trading team analyzing {company} for the trading date {trade_date}. The research below is shared by the whole team. Your role and task follow after it.
+
+{research_context}"""
+
+# Providers that accept explicit cache breakpoints on message content
+CACHE_CONTROL_PROVIDERS = ("anthropic",)
+
+
+def build_shared_prefix(state) -> str:
+    """Return the team-wide prompt prefix for the current state.
+
+    The prefix depends only on the ticker, date and research context, so it
+    is byte-identical for every downstream agent in a run.
+    """
+    return SHARED_PREFIX_TEMPLATE.format(
+        company=state["company_of_interest"],
+        trade_date=state["trade_date"],
+        research_context=get_research_context(state),
+    )
+
+
+def build_prompt_messages(state, role_prompt: str) -> List[BaseMessage]:
+    """Assemble an agent's prompt as [shared prefix, role-specific content].
+
+    Args:
+        state: Current agent state
+        role_prompt: The agent's own instructions and volatile context. Keep
+            content that changes between turns (debate history, latest
+            responses) towards the end.
+    """
+    prefix = build_shared_prefix(state)
+
+    if get_config().get("llm_provider", "").lower() in CACHE_CONTROL_PROVIDERS:
+        system_message = SystemMessage(
+            content=[
+                {"type": "text", "text": prefix, "cache_control": {"type": "ephemeral"}}
+            ]
+        )
+    else:
+        system_message = SystemMessage(content=prefix)
+
+    return [system_message, HumanMessage(content=role_prompt)]
+
+
+class PromptCacheStats:
+    """Thread-safe tally of input tokens served from provider prompt caches."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self.calls = 0
+            self.input_tokens = 0
+            self.cached_tokens = 0
+
+    def record(self, response: Any) -> None:
+        """Add the token usage reported on an LLM response, if any."""
+        usage = getattr(response, "usage_metadata", None) or {}
+        details = usage.get("input_token_details") or {}
+        with self._lock:
+            self.calls += 1
+            self.input_tokens += usage.get("input_tokens", 0) or 0
+            self.cached_tokens += details.get("cache_read", 0) or 0
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            ratio = self.cached_tokens / self.input_tokens if self.input_tokens else 0.0
+            return {
+                "calls": self.calls,
+                "input_tokens": self.input_tokens,
+                "cached_tokens": self.cached_tokens,
+                "cached_ratio": round(ratio, 4),
+            }
+
+
+def invoke_with_shared_prefix(llm, state, role_prompt: str, sections: Optional[Dict[str, Any]] = None):
+    """Invoke `llm` on a prefix-first prompt and record its cache usage.
+
+    Usage is added to the run's `PromptCacheStats` (the "prompt_cache_stats"
+    entry of the run config), if any. `sections` tags the parts of
+    `role_prompt` for the prompt profiler; the shared research is tagged here.
+    """
+    messages = build_prompt_messages(state, role_prompt)
+    profiler = get_prompt_profiler()
+    if profiler is not None:
+        profiler.record(messages, {**research_context_sections(state), **(sections or {})})
+    response = llm.invoke(messages)
+    stats = get_run_object("prompt_cache_stats")
+    if stats is not None:
+        stats.record(response)
+    return response
@@ -0,0 +1,215 @@
+"""Opt-in token breakdown of agent prompts by section.
+
+Agents tag the variable parts of each prompt as they assemble it (reports,
+debate history, memories, ...). `PromptProfiler.record` estimates the tokens
+of every tagged section with the local tokenizer estimate and counts whatever
+is left of the prompt as static "instructions". Tool outputs and earlier
+model turns in a message list, and the schemas of bound tools, are tagged
+automatically. Totals are kept per graph node, so a run (or a batch of runs)
+shows where input tokens actually go.
+
+Each TradingAgentsGraph owns a profiler and passes it to its agents in the
+run config; agents report through `record_prompt`, which is a no-op when the
+running graph has profiling off.
+"""
+
+import json
+import threading
+from typing import Any, Dict, Iterable, List, Optional, Union
+
+from langchain_core.messages import AIMessage, BaseMessage, ToolMessage
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langgraph.config import get_config as get_run_config
+
+from tradingagents.dataflows.config import get_run_object
+
+from .token_utils import estimate_tokens
+
+
+INSTRUCTIONS = "instructions"
+OUTSIDE_GRAPH = "(outside graph)"
+
+SectionText = Union[str, Iterable[str]]
+
+
+def _text(content: Any) -> str:
+    """Text of a message content (string or list of content blocks)."""
+    if isinstance(content, str):
+        return content
+    if isinstance(content, list):
+        return "\n".join(
+            block if isinstance(block, str) else str(block.get("text", ""))
+            for block in content
+        )
+    return str(content or "")
+
+
+def _tokens(text: SectionText) -> int:
+    if isinstance(text, str):
+        return estimate_tokens(text)
+    return sum(estimate_tokens(part) for part in text if part)
+
+
+def prompt_anatomy(
+    prompt: Union[str, List[Any]],
+    sections: Optional[Dict[str, SectionText]] = None,
+    tools: Optional[List[Any]] = None,
+) -> Dict[str, int]:
+    """Estimated tokens per section of an assembled prompt.
+
+    Args:
+        prompt: The prompt string, or the message list sent to the model
+            (messages, role dicts or (role, text) tuples)
+        sections: Section name to the text (or texts) interpolated into the
+            prompt under that name. The rest of the system and user text is
+            counted as "instructions".
+        tools: Tools bound to the model; their schemas count as "tool_schemas"
+    """
+    assembled, counts = [], {}
+    for message in [prompt] if isinstance(prompt, str) else prompt:
+        if isinstance(message, ToolMessage):
+            counts["tool_outputs"] = counts.get("tool_outputs", 0) + estimate_tokens(_text(message.content))
+        elif isinstance(message, AIMessage):
+            turn = _text(message.content) + "".join(json.dumps(call["args"]) for call in message.tool_calls)
+            counts["conversation"] = counts.get("conversation", 0) + estimate_tokens(turn)
+        elif isinstance(message, BaseMessage):
+            assembled.append(_text(message.content))
+        elif isinstance(message, dict):
+            assembled.append(_text(message.get("content")))
+        elif isinstance(message, tuple):
+            assembled.append(_text(message[1]))
+        else:
+            assembled.append(_text(message))
+
+    remaining = _tokens(assembled)
+    for name, text in (sections or {}).items():
+        tokens = _tokens(text)
+        if tokens:
+            counts[name] = counts.get(name, 0) + tokens
+            remaining -= tokens
+    # Per-part estimates do not add up exactly to the whole
+    counts[INSTRUCTIONS] = max(remaining, 0)
+
+    if tools:
+        counts["tool_schemas"] = sum(
+            estimate_tokens(json.dumps(convert_to_openai_tool(tool))) for tool in tools
+        )
+    return counts
+
+
+def _current_node() -> str:
+    try:
+        return get_run_config().get("metadata", {}).get("langgraph_node") or OUTSIDE_GRAPH
+    except RuntimeError:  # Not inside a runnable
+        return OUTSIDE_GRAPH
+
+
+class PromptProfiler:
+    """Thread-safe per-node, per-section tally of prompt tokens.
+
+    Disabled by default; `record` is a no-op unless `enabled` is set.
+    """
+
+    def __init__(self, enabled: bool = False):
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes: Dict[str, Dict[str, Any]] = {}
+
+    def record(
+        self,
+        prompt: Union[str, List[Any]],
+        sections: Optional[Dict[str, SectionText]] = None,
+        tools: Optional[List[Any]] = None,
+        node: Optional[str] = None,
+    ) -> None:
+        """Add the anatomy of one prompt (see `prompt_anatomy`) to its node's totals.
+
+        The node defaults to the LangGraph node currently running.
+        """
+        if not self.enabled:
+            return
+        counts = prompt_anatomy(prompt, sections, tools)
+        node = node or _current_node()
+        with self._lock:
+            stats = self._nodes.setdefault(node, {"calls": 0, "sections": {}})
+            stats["calls"] += 1
+            for name, tokens in counts.items():
+                stats["sections"][name] = stats["sections"].get(name, 0) + tokens
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            nodes = {
+                node: {"calls": stats["calls"], "sections": dict(stats["sections"])}
+                for node, stats in self._nodes.items()
+            }
+        return merge_prompt_profiles([{"runs": 1, "nodes": nodes}])
+
+
+def get_prompt_profiler() -> Optional[PromptProfiler]:
+    """The enabled profiler of the graph run in progress, if any.
+
+    Lets agents skip assembling a prompt copy just for profiling.
+    """
+    profiler = get_run_object("prompt_profiler")
+    return profiler if profiler is not None and profiler.enabled else None
+
+
+def record_prompt(
+    prompt: Union[str, List[Any]],
+    sections: Optional[Dict[str, SectionText]] = None,
+    tools: Optional[List[Any]] = None,
+) -> None:
+    """Record a prompt with the running graph's profiler (see `PromptProfiler.record`)."""
+    profiler = get_prompt_profiler()
+    if profiler is not None:
+        profiler.record(prompt, sections, tools)
+
+
+def merge_prompt_profiles(profiles: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """Combine profile snapshots (e.g. of every run in a batch) into one."""
+    nodes: Dict[str, Dict[str, Any]] = {}
+    for profile in profiles:
+        for node, stats in profile["nodes"].items():
+            merged = nodes.setdefault(node, {"calls": 0, "sections": {}})
+            merged["calls"] += stats["calls"]
+            for name, tokens in stats["sections"].items():
+                merged["sections"][name] = merged["sections"].get(name, 0) + tokens
+
+    sections: Dict[str, int] = {}
+    for stats in nodes.values():
+        stats["sections"] = dict(sorted(stats["sections"].items(), key=lambda item: -item[1]))
+        stats["tokens"] = sum(stats["sections"].values())
+        for name, tokens in stats["sections"].items():
+            sections[name] = sections.get(name, 0) + tokens
+
+    return {
+        "runs": sum(profile.get("runs", 1) for profile in profiles),
+        "prompts": sum(stats["calls"] for stats in nodes.values()),
+        "tokens": sum(sections.values()),
+        "sections": dict(sorted(sections.items(), key=lambda item: -item[1])),
+        "nodes": dict(sorted(nodes.items(), key=lambda item: -item[1]["tokens"])),
+    }
+
+
+def format_prompt_profile(profile: Dict[str, Any], title: str = "Prompt anatomy") -> str:
+    """Render a profile as a plain-text breakdown by section and by node."""
+    total = profile["tokens"] or 1
+    lines = [
+        f"{title}: {profile['prompts']} prompts, ~{profile['tokens']:,} input tokens",
+        f"  {'Section':<22}{'Tokens':>10}{'Share':>8}",
+    ]
+    for name, tokens in profile["sections"].items():
+        lines.append(f"  {name:<22}{tokens:>10,}{tokens / total:>8.1%}")
+
+    lines.append(f"  {'Node':<22}{'Prompts':>10}{'Tokens':>10}  Largest sections")
+    for node, stats in profile["nodes"].items():
+        top = ", ".join(
+            f"{name} {tokens / (stats['tokens'] or 1):.0%}"
+            for name, tokens in list(stats["sections"].items())[:3]
+        )
+        lines.append(f"  {node:<22}{stats['calls']:>10}{stats['tokens']:>10,}  {top}")
+    return "\n".join(lines)
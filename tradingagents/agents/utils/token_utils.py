@@ -0,0 +1,72 @@
+"""Approximate token counting for prompt budgeting."""
+
+import re
+from typing import List
+
+try:
+    import tiktoken
+
+    _ENCODING = tiktoken.get_encoding("cl100k_base")
+except Exception:  # tiktoken is optional (or its encoding may be unavailable offline)
+    _ENCODING = None
+
+
+def estimate_tokens(text: str) -> int:
+    """Estimate the number of tokens in `text`.
+
+    Uses tiktoken's cl100k_base encoding when available, otherwise assumes
+    roughly four characters per token. Budgets only need to be approximate,
+    so the same estimate is used for every provider.
+    """
+    if not text:
+        return 0
+    if _ENCODING is not None:
+        return len(_ENCODING.encode(text, disallowed_special=()))
+    return (len(text) + 3) // 4
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Cut `text` down to at most `max_tokens` (approximately)."""
+    if estimate_tokens(text) <= max_tokens:
+        return text
+    if _ENCODING is not None:
+        return _ENCODING.decode(_ENCODING.encode(text, disallowed_special=())[:max_tokens])
+    return text[: max_tokens * 4]
+
+
+def _split_long(text: str, max_tokens: int) -> List[str]:
+    if _ENCODING is not None:
+        tokens = _ENCODING.encode(text, disallowed_special=())
+        return [
+            _ENCODING.decode(tokens[i : i + max_tokens])
+            for i in range(0, len(tokens), max_tokens)
+        ]
+    step = max_tokens * 4
+    return [text[i : i + step] for i in range(0, len(text), step)]
+
+
+def split_into_chunks(text: str, max_tokens: int) -> List[str]:
+    """Split `text` into consecutive chunks of at most `max_tokens` (approximately).
+
+    Paragraphs are packed greedily and only paragraphs longer than the limit
+    are cut mid-text, so the chunks joined with "" give back the text.
+    """
+    if not text or estimate_tokens(text) <= max_tokens:
+        return [text]
+
+    # Keep each blank-line separator attached to the paragraph before it
+    pieces = [p for p in re.split(r"(?<=\n\n)", text) if p]
+    chunks, current, current_tokens = [], "", 0
+    for piece in pieces:
+        piece_tokens = estimate_tokens(piece)
+        if current and current_tokens + piece_tokens > max_tokens:
+            chunks.append(current)
+            current, current_tokens = "", 0
+        if piece_tokens > max_tokens:
+            chunks.extend(_split_long(piece, max_tokens))
+            continue
+        current += piece
+        current_tokens += piece_tokens
+    if current:
+        chunks.append(current)
+    return chunks
@@ -1,5 +1,7 @@
 import tradingagents.default_config as default_config
-from typing import Dict, Optional
+from typing import Any, Dict, Optional
+
+from langgraph.config import get_config as get_run_config
 
 # Use default config but allow it to be overridden
 _config: Optional[Dict] = None
@@ -30,5 +32,18 @@ def get_config() -> Dict:
     return _config.copy()
 
 
+def get_run_object(key: str) -> Any:
+    """Get a per-run object from the `configurable` of the graph run in progress.
+
+    TradingAgentsGraph passes its stats collectors in the run config (see
+    `TradingAgentsGraph.get_run_args`), so that agents and tools report into
+    the graph that is running them. Returns None outside a graph run.
+    """
+    try:
+        return get_run_config().get("configurable", {}).get(key)
+    except RuntimeError:  # Not inside a runnable
+        return None
+
+
 # Initialize with default config
 initialize_config()
@@ -0,0 +1,401 @@
+"""Output formatting for data tools.
+
+Vendor functions return whatever their source produces: full OHLCV CSV,
+raw Alpha Vantage JSON, `str(pandas.Series)` with boilerplate paragraphs, or
+a DataFrame for local price data. `route_to_vendor` passes every result
+through `format_tool_output`, which reshapes it according to the tool's
+output profile and enforces a hard token cap per call:
+
+- "raw": unchanged
+- "compact": same data with less overhead (numbers rounded to 2 decimals, or
+  4 significant digits below 1, no all-zero or empty columns, minified JSON
+  without null fields, no boilerplate)
+- "summary": summary statistics for tabular data plus the most recent rows;
+  long JSON lists are cut to their most recent entries
+- "fields": projection to a whitelist of columns / JSON keys
+
+Profiles are configured like vendors: `output_format` is the default and
+`tool_output_formats` overrides it per tool, either with a profile name or
+a dict such as {"profile": "fields", "fields": [...], "max_tokens": 2000}.
+"""
+
+import io
+import json
+import re
+import threading
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from .config import get_config, get_run_object
+
+
+OUTPUT_PROFILES = ("raw", "compact", "summary", "fields")
+
+# Boilerplate appended to local SimFin statements
+_BOILERPLATE = re.compile(r"\n\nThis includes metadata like.*\Z", re.DOTALL)
+
+
+def _estimate_tokens(text: str) -> int:
+    # Imported lazily: tradingagents.agents imports this package at load time
+    from tradingagents.agents.utils.token_utils import estimate_tokens
+
+    return estimate_tokens(text)
+
+
+def _truncate_to_tokens(text: str, max_tokens: int) -> str:
+    from tradingagents.agents.utils.token_utils import truncate_to_tokens
+
+    return truncate_to_tokens(text, max_tokens)
+
+
+def get_output_settings(method: str) -> Dict[str, Any]:
+    """Resolve the output profile, fields and token cap for a tool."""
+    config = get_config()
+    settings = {
+        "profile": config.get("output_format", "compact"),
+        "fields": None,
+        "recent_rows": config.get("output_recent_rows", 10),
+        "max_tokens": config.get("tool_output_max_tokens", 6000),
+    }
+    override = config.get("tool_output_formats", {}).get(method)
+    if isinstance(override, str):
+        settings["profile"] = override
+    elif isinstance(override, dict):
+        settings.update(override)
+
+    if settings["profile"] not in OUTPUT_PROFILES:
+        raise ValueError(
+            f"Unsupported output profile '{settings['profile']}' for {method}. "
+            f"Options: {OUTPUT_PROFILES}"
+        )
+    return settings
+
+
+# ---------------------------------------------------------------------------
+# Parsing helpers
+# ---------------------------------------------------------------------------
+
+
+def _split_csv(text: str):
+    """Split text into (comment lines, DataFrame) if its body is CSV, else None."""
+    lines = text.strip().splitlines()
+    comments = []
+    while lines and (lines[0].startswith("#") or not lines[0].strip()):
+        comments.append(lines.pop(0))
+    if len(lines) < 2 or "," not in lines[0]:
+        return None
+
+    n_columns = lines[0].count(",")
+    if any(line.count(",") != n_columns for line in lines[1:6]):
+        return None
+    try:
+        frame = pd.read_csv(io.StringIO("\n".join(lines)))
+    except Exception:
+        return None
+    return [c for c in comments if c.strip()], frame
+
+
+def _parse_json(text: str):
+    stripped = text.strip()
+    if not stripped or stripped[0] not in "[{":
+        return None
+    try:
+        return json.loads(stripped)
+    except ValueError:
+        return None
+
+
+def _keep_comment(line: str) -> bool:
+    # Fetch timestamps carry no information for the model
+    return "Data retrieved on" not in line
+
+
+# ---------------------------------------------------------------------------
+# Tabular data
+# ---------------------------------------------------------------------------
+
+
+def _round_number(value: float) -> float:
+    """Round to 2 decimals, keeping 4 significant digits for magnitudes below 1.
+
+    Prices and volumes lose nothing at 2 decimals, but small indicator
+    values (MACD, ratios, returns) would collapse to 0.0.
+    """
+    if pd.isna(value) or abs(value) >= 1:
+        return round(value, 2)
+    return float(f"{value:.4g}")
+
+
+def _compact_frame(frame: pd.DataFrame) -> pd.DataFrame:
+    frame = frame.copy()
+    for column in frame.columns:
+        series = frame[column]
+        if pd.api.types.is_numeric_dtype(series):
+            if series.fillna(0).eq(0).all():
+                frame = frame.drop(columns=column)
+            elif pd.api.types.is_float_dtype(series):
+                frame[column] = series.map(_round_number)
+        elif series.isna().all():
+            frame = frame.drop(columns=column)
+        elif series.astype(str).str.match(r"^\d{4}-\d{2}-\d{2}[ T]00:00:00").all():
+            frame[column] = series.astype(str).str[:10]
+    return frame
+
+
+def _frame_to_csv(frame: pd.DataFrame) -> str:
+    return frame.to_csv(index=False).strip()
+
+
+def _format_number(value: float) -> str:
+    if 0 < abs(value) < 1:
+        return f"{value:.4g}"
+    return f"{value:.2f}".rstrip("0").rstrip(".")
+
+
+def _newest_first(frame: pd.DataFrame) -> bool:
+    """Whether rows are dated in descending order (latest first)."""
+    if frame.empty:
+        return False
+    try:
+        first, last = pd.to_datetime(frame.iloc[[0, -1], 0])
+    except (ValueError, TypeError):
+        return False
+    return first > last
+
+
+def _cap_csv(text: str, max_tokens: int):
+    """Fit CSV within `max_tokens`, keeping the header and the most recent rows.
+
+    Returns None if `text` is not CSV. Plain truncation would keep the oldest
+    bars of an oldest-first price or indicator series and drop the latest.
+    """
+    parsed = _split_csv(text)
+    if parsed is None:
+        return None
+    lines = text.strip().splitlines()
+    start = next(i for i, line in enumerate(lines) if line.strip() and not line.startswith("#"))
+    comments, header, rows = lines[:start], lines[start], lines[start + 1 :]
+    newest_first = _newest_first(parsed[1])
+    recent = rows if newest_first else rows[::-1]
+
+    budget = max_tokens - _estimate_tokens("\n".join(comments + [header])) - 20
+    kept = []
+    for row in recent:
+        budget -= _estimate_tokens(row) + 1
+        if budget < 0:
+            break
+        kept.append(row)
+    if not newest_first:
+        kept.reverse()
+    note = f"# {len(rows) - len(kept)} older rows omitted to fit {max_tokens} tokens"
+    return "\n".join(comments + [note, header] + kept)
+
+
+def _summarize_frame(frame: pd.DataFrame, recent_rows: int) -> str:
+    frame = _compact_frame(frame)
+    numeric = frame.select_dtypes("number")
+    lines = [f"Rows: {len(frame)}"]
+    if len(frame.columns) and not numeric.empty:
+        first_column = frame.columns[0]
+        if first_column not in numeric.columns:
+            lines.append(
+                f"Range: {frame[first_column].iloc[0]} to {frame[first_column].iloc[-1]}"
+            )
+        lines.append("column,first,last,min,max,mean,change_pct")
+        for column in numeric.columns:
+            series = numeric[column].dropna()
+            if series.empty:
+                continue
+            first, last = series.iloc[0], series.iloc[-1]
+            change = f"{(last - first) / first * 100:.2f}" if first else ""
+            values = (first, last, series.min(), series.max(), series.mean())
+            lines.append(
+                f"{column},{','.join(_format_number(v) for v in values)},{change}"
+            )
+    lines.append(f"Most recent {min(recent_rows, len(frame))} rows:")
+    lines.append(_frame_to_csv(frame.tail(recent_rows)))
+    return "\n".join(lines)
+
+
+def _project_frame(frame: pd.DataFrame, fields: List[str]) -> pd.DataFrame:
+    # Always keep the leading key column (usually the date)
+    keep = [frame.columns[0]] + [c for c in frame.columns[1:] if c in fields]
+    return frame[keep]
+
+
+# ---------------------------------------------------------------------------
+# JSON data
+# ---------------------------------------------------------------------------
+
+
+def _compact_json(value: Any) -> Any:
+    """Drop null / empty / "None" values recursively."""
+    if isinstance(value, dict):
+        compacted = {k: _compact_json(v) for k, v in value.items()}
+        return {k: v for k, v in compacted.items() if v not in (None, "", "None", [], {})}
+    if isinstance(value, list):
+        return [_compact_json(v) for v in value]
+    return value
+
+
+def _summarize_json(value: Any, recent_rows: int) -> Any:
+    """Cut long lists (statement periods, news feeds) to their first entries.
+
+    Alpha Vantage lists reports and articles newest first.
+    """
+    if isinstance(value, dict):
+        return {k: _summarize_json(v, recent_rows) for k, v in value.items()}
+    if isinstance(value, list):
+        return [_summarize_json(v, recent_rows) for v in value[:recent_rows]]
+    return value
+
+
+def _project_json(value: Any, fields: List[str]) -> Any:
+    """Keep whitelisted keys; containers are descended into to find them."""
+    if isinstance(value, dict):
+        projected = {}
+        for key, item in value.items():
+            if key in fields:
+                projected[key] = item
+            elif isinstance(item, (dict, list)):
+                nested = _project_json(item, fields)
+                if nested:
+                    projected[key] = nested
+        return projected
+    if isinstance(value, list):
+        return [p for p in (_project_json(v, fields) for v in value) if p]
+    return value
+
+
+def _dump_json(value: Any) -> str:
+    return json.dumps(value, separators=(",", ":"), ensure_ascii=False)
+
+
+# ---------------------------------------------------------------------------
+# Text
+# ---------------------------------------------------------------------------
+
+
+def _compact_text(text: str) -> str:
+    text = _BOILERPLATE.sub("", text)
+    # `str(pandas.Series)` pads labels and values with runs of spaces
+    lines = [re.sub(r" {2,}", " ", line).rstrip() for line in text.splitlines()]
+    text = "\n".join(line for line in lines if _keep_comment(line))
+    return re.sub(r"\n{3,}", "\n\n", text).strip()
+
+
+def _project_text(text: str, fields: List[str]) -> str:
+    """Keep header lines and `label value` lines whose label is whitelisted."""
+    kept = []
+    for line in _compact_text(text).splitlines():
+        if line.startswith("#") or any(line.startswith(field) for field in fields):
+            kept.append(line)
+    return "\n".join(kept)
+
+
+# ---------------------------------------------------------------------------
+# Entry point
+# ---------------------------------------------------------------------------
+
+
+def _apply_profile(result: Any, settings: Dict[str, Any]) -> str:
+    profile = settings["profile"]
+    fields = settings.get("fields") or []
+    recent_rows = settings["recent_rows"]
+
+    if isinstance(result, pd.DataFrame):
+        comments, frame = [], result
+    elif isinstance(result, str):
+        parsed = _split_csv(result)
+        if parsed is None:
+            data = _parse_json(result)
+            if data is not None:
+                data = _compact_json(data)
+                if profile == "summary":
+                    data = _summarize_json(data, recent_rows)
+                elif profile == "fields" and fields:
+                    data = _project_json(data, fields)
+                return _dump_json(data)
+            if profile == "fields" and fields:
+                return _project_text(result, fields)
+            return _compact_text(result)
+        comments, frame = parsed
+    else:
+        return _compact_text(str(result))
+
+    header = "\n".join(c for c in comments if _keep_comment(c))
+    if profile == "summary":
+        body = _summarize_frame(frame, recent_rows)
+    else:
+        if profile == "fields" and fields:
+            frame = _project_frame(frame, fields)
+        body = _frame_to_csv(_compact_frame(frame))
+    return f"{header}\n{body}" if header else body
+
+
+def format_tool_output(method: str, result: Any) -> Any:
+    """Reshape a vendor result according to the tool's output settings.
+
+    Args:
+        method: Tool method name, e.g. "get_stock_data"
+        result: Value returned by the vendor implementation
+
+    Returns:
+        The formatted output, capped at the tool's `max_tokens` (CSV keeps
+        its header and most recent rows). With the "raw" profile and no cap
+        the result is returned unchanged.
+    """
+    settings = get_output_settings(method)
+    raw_text = _frame_to_csv(result) if isinstance(result, pd.DataFrame) else str(result)
+
+    if settings["profile"] == "raw":
+        output = result if settings["max_tokens"] is None else raw_text
+    else:
+        try:
+            output = _apply_profile(result, settings)
+        except Exception:
+            # Never lose data over a formatting problem
+            output = raw_text
+
+    max_tokens = settings["max_tokens"]
+    if max_tokens is not None and _estimate_tokens(output) > max_tokens:
+        output = _cap_csv(output, max_tokens) or (
+            _truncate_to_tokens(output, max_tokens)
+            + f"\n... [output truncated to {max_tokens} tokens]"
+        )
+
+    stats = get_run_object("tool_output_stats")
+    if stats is not None:
+        stats.record(method, raw_text, output if isinstance(output, str) else raw_text)
+    return output
+
+
+class ToolOutputStats:
+    """Thread-safe per-tool accounting of tokens fetched and emitted.
+
+    `format_tool_output` records into the instance found in the run config
+    under "tool_output_stats" (see `TradingAgentsGraph.get_run_args`).
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stats: Dict[str, Dict[str, int]] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._stats = {}
+
+    def record(self, method: str, raw_text: str, output: str) -> None:
+        raw_tokens, emitted_tokens = _estimate_tokens(raw_text), _estimate_tokens(output)
+        with self._lock:
+            stats = self._stats.setdefault(
+                method, {"calls": 0, "raw_tokens": 0, "emitted_tokens": 0}
+            )
+            stats["calls"] += 1
+            stats["raw_tokens"] += raw_tokens
+            stats["emitted_tokens"] += emitted_tokens
+
+    def snapshot(self) -> Dict[str, Dict[str, int]]:
+        with self._lock:
+            return {method: dict(stats) for method, stats in self._stats.items()}
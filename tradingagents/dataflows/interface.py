@@ -19,6 +19,7 @@ from .alpha_vantage_common import AlphaVantageRateLimitError
 
 # Configuration and routing logic
 from .config import get_config
+from .formatting import format_tool_output
 
 # Tools organized by category
 TOOLS_CATEGORIES = {
@@ -236,6 +237,9 @@ def route_to_vendor(method: str, *args, **kwargs):
     else:
         print(f"FINAL: Method '{method}' completed with {len(results)} result(s) from {vendor_attempt_count} vendor attempt(s)")
 
+    # Shape each result to the tool's output profile and token cap
+    results = [format_tool_output(method, result) for result in results]
+
     # Return single result if only one, otherwise concatenate as string
     if len(results) == 1:
         return results[0]
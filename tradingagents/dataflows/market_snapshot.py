@@ -0,0 +1,89 @@
+"""Structured price snapshot computed once per run from the price store."""
+
+from typing import Optional
+
+import pandas as pd
+from typing_extensions import TypedDict
+
+from .config import get_config
+from .stockstats_utils import load_price_history
+
+
+ATR_PERIOD = 14
+TRADING_DAYS_PER_YEAR = 252
+
+
+class MarketSnapshot(TypedDict):
+    as_of: str  # date of the last close, on or before the trade date
+    last_close: float
+    previous_close: Optional[float]
+    change_pct: Optional[float]  # last close vs previous close
+    week52_high: float
+    week52_low: float
+    atr14: Optional[float]  # 14-day average true range
+
+
+def compute_market_snapshot(
+    data: pd.DataFrame, trade_date: str
+) -> Optional[MarketSnapshot]:
+    """Compute the snapshot from daily OHLCV rows up to and including `trade_date`.
+
+    Returns None when there is no price data on or before the trade date.
+    """
+    frame = data.copy()
+    frame["Date"] = pd.to_datetime(frame["Date"]).dt.tz_localize(None)
+    frame = frame[frame["Date"] <= pd.Timestamp(trade_date)]
+    frame = frame.dropna(subset=["Close"]).sort_values("Date")
+    if frame.empty:
+        return None
+
+    year = frame.tail(TRADING_DAYS_PER_YEAR)
+    previous_close = frame["Close"].shift(1)
+    true_range = pd.concat(
+        [
+            frame["High"] - frame["Low"],
+            (frame["High"] - previous_close).abs(),
+            (frame["Low"] - previous_close).abs(),
+        ],
+        axis=1,
+    ).max(axis=1)
+
+    last_close = float(frame["Close"].iloc[-1])
+    prev_close = float(frame["Close"].iloc[-2]) if len(frame) > 1 else None
+    atr = true_range.tail(ATR_PERIOD).mean() if len(frame) > ATR_PERIOD else None
+
+    return MarketSnapshot(
+        as_of=frame["Date"].iloc[-1].strftime("%Y-%m-%d"),
+        last_close=round(last_close, 2),
+        previous_close=round(prev_close, 2) if prev_close is not None else None,
+        change_pct=(
+            round((last_close - prev_close) / prev_close * 100, 2) if prev_close else None
+        ),
+        week52_high=round(float(year["High"].max()), 2),
+        week52_low=round(float(year["Low"].min()), 2),
+        atr14=round(float(atr), 2) if atr is not None else None,
+    )
+
+
+def get_market_snapshot(symbol: str, trade_date: str) -> Optional[MarketSnapshot]:
+    """Load the price history for `symbol` and compute its snapshot at `trade_date`."""
+    online = get_config()["data_vendors"]["core_stock_apis"] != "local"
+    return compute_market_snapshot(load_price_history(symbol, online), trade_date)
+
+
+def format_market_snapshot(snapshot: Optional[MarketSnapshot]) -> str:
+    """Render a snapshot as one line for agent prompts ("" when unavailable)."""
+    if not snapshot:
+        return ""
+    parts = [f"Last close ${snapshot['last_close']:.2f} on {snapshot['as_of']}"]
+    if snapshot["previous_close"] is not None:
+        previous = f"previous close ${snapshot['previous_close']:.2f}"
+        if snapshot["change_pct"] is not None:
+            previous += f" ({snapshot['change_pct']:+.2f}%)"
+        parts.append(previous)
+    parts.append(
+        f"52-week range ${snapshot['week52_low']:.2f}-${snapshot['week52_high']:.2f}"
+    )
+    if snapshot["atr14"] is not None:
+        parts.append(f"ATR(14) ${snapshot['atr14']:.2f}")
+    return "Market Snapshot: " + "; ".join(parts)
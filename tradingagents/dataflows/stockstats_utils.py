@@ -6,6 +6,58 @@ import os
 from .config import get_config, DATA_DIR
 
 
+def load_price_history(symbol: str, online: bool = True) -> pd.DataFrame:
+    """Load the daily OHLCV history for a symbol from the local price store.
+
+    Offline this is the bundled Yahoo Finance CSV. Online, 15 years of
+    history up to today are downloaded once per day and cached under
+    `data_cache_dir`, so indicator lookups and the market snapshot share one
+    download.
+    """
+    config = get_config()
+    if not online:
+        try:
+            return pd.read_csv(
+                os.path.join(
+                    DATA_DIR,
+                    f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
+                )
+            )
+        except FileNotFoundError:
+            raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
+
+    # Get today's date as YYYY-mm-dd to add to cache
+    today_date = pd.Timestamp.today()
+    end_date = today_date
+    start_date = today_date - pd.DateOffset(years=15)
+    start_date = start_date.strftime("%Y-%m-%d")
+    end_date = end_date.strftime("%Y-%m-%d")
+
+    # Get config and ensure cache directory exists
+    os.makedirs(config["data_cache_dir"], exist_ok=True)
+
+    data_file = os.path.join(
+        config["data_cache_dir"],
+        f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
+    )
+
+    if os.path.exists(data_file):
+        data = pd.read_csv(data_file)
+        data["Date"] = pd.to_datetime(data["Date"])
+    else:
+        data = yf.download(
+            symbol,
+            start=start_date,
+            end=end_date,
+            multi_level_index=False,
+            progress=False,
+            auto_adjust=True,
+        )
+        data = data.reset_index()
+        data.to_csv(data_file, index=False)
+    return data
+
+
 class StockstatsUtils:
     @staticmethod
     def get_stock_stats(
@@ -21,56 +73,11 @@ class StockstatsUtils:
         config = get_config()
         online = config["data_vendors"]["technical_indicators"] != "local"
 
-        df = None
-        data = None
-
-        if not online:
-            try:
-                data = pd.read_csv(
-                    os.path.join(
-                        DATA_DIR,
-                        f"{symbol}-YFin-data-2015-01-01-2025-03-25.csv",
-                    )
-                )
-                df = wrap(data)
-            except FileNotFoundError:
-                raise Exception("Stockstats fail: Yahoo Finance data not fetched yet!")
-        else:
-            # Get today's date as YYYY-mm-dd to add to cache
-            today_date = pd.Timestamp.today()
-            curr_date = pd.to_datetime(curr_date)
-
-            end_date = today_date
-            start_date = today_date - pd.DateOffset(years=15)
-            start_date = start_date.strftime("%Y-%m-%d")
-            end_date = end_date.strftime("%Y-%m-%d")
-
-            # Get config and ensure cache directory exists
-            os.makedirs(config["data_cache_dir"], exist_ok=True)
-
-            data_file = os.path.join(
-                config["data_cache_dir"],
-                f"{symbol}-YFin-data-{start_date}-{end_date}.csv",
-            )
-
-            if os.path.exists(data_file):
-                data = pd.read_csv(data_file)
-                data["Date"] = pd.to_datetime(data["Date"])
-            else:
-                data = yf.download(
-                    symbol,
-                    start=start_date,
-                    end=end_date,
-                    multi_level_index=False,
-                    progress=False,
-                    auto_adjust=True,
-                )
-                data = data.reset_index()
-                data.to_csv(data_file, index=False)
-
-            df = wrap(data)
+        data = load_price_history(symbol, online)
+        df = wrap(data)
+        if online:
             df["Date"] = df["Date"].dt.strftime("%Y-%m-%d")
-            curr_date = curr_date.strftime("%Y-%m-%d")
+            curr_date = pd.to_datetime(curr_date).strftime("%Y-%m-%d")
 
         df[indicator]  # trigger stockstats to calculate the indicator
         matching_rows = df[df["Date"].str.startswith(curr_date)]
@@ -18,6 +18,102 @@ DEFAULT_CONFIG = {
     "max_risk_discuss_rounds": 1,
     "max_prediction_rounds": 1,  # Prediction team debate rounds
     "max_recur_limit": 100,
+    # Research context for downstream agents: "brief" sends a condensed brief
+    # of the analyst reports (at most research_brief_tokens), "full" sends the
+    # full reports
+    "research_context": "brief",
+    "research_brief_tokens": 1500,
+    # Compute last close, previous close, 52-week range and ATR(14) from the
+    # price store once per run and give them to the downstream agents
+    "market_snapshot_enabled": True,
+    # Debate history compaction per stage: once a stage's history exceeds
+    # max_history_tokens, turns older than the last keep_last_turns are folded
+    # into a running summary of at most summary_tokens (None disables)
+    "debate_compaction": {
+        "investment": {"max_history_tokens": 4000, "keep_last_turns": 2, "summary_tokens": 800},
+        "risk": {"max_history_tokens": 4000, "keep_last_turns": 3, "summary_tokens": 800},
+        "prediction": {"max_history_tokens": 6000, "keep_last_turns": 3, "summary_tokens": 1000},
+    },
+    # Checkpointing (resume interrupted runs from the last completed node)
+    "checkpoint_enabled": False,
+    "checkpoint_db": None,  # Defaults to <results_dir>/checkpoints.sqlite
+    # LLM response cache (exact match on model, parameters, messages and tools)
+    "llm_cache_mode": "off",  # Options: off, read_only, read_write
+    "llm_cache_path": None,  # Defaults to <results_dir>/llm_cache.sqlite
+    "llm_cache_max_mb": 512,  # Least-recently-used entries are evicted above this size
+    # Concurrent reflection LLM calls in reflect_and_remember (None: one per memory)
+    "reflection_max_workers": None,
+    # Memories store a lesson of at most reflection_lesson_tokens distilled from
+    # each reflection (the full text is kept as metadata); retrieved matches
+    # with cosine similarity below memory_min_similarity are not injected
+    "reflection_lesson_tokens": 150,
+    "memory_min_similarity": 0.25,
+    # Per-node latency, token, tool-call and cost metrics for each propagate run
+    # (TradingAgentsGraph.run_metrics, the run log and export_run_metrics).
+    # llm_pricing overrides or extends the USD per million token table in
+    # graph/instrumentation.py, e.g. {"my-model": [0.5, 0.25, 1.5]} for
+    # input, cached input and output
+    "instrumentation_enabled": True,
+    "llm_pricing": {},
+    # Estimate prompt tokens per section (reports, debate history, memories,
+    # instructions, tool outputs, ...) and node, print the breakdown after each
+    # run and keep it in the run log (see TradingAgentsGraph.prompt_profile_summary)
+    "prompt_profiling": False,
+    # Agent memory backend: "chroma" or "numpy" (in-process, lost on exit) or
+    # "persistent" (append-only files per memory under memory_dir, kept across runs)
+    "memory_backend": "chroma",
+    "memory_dir": None,  # Defaults to <results_dir>/memory
+    # Graphs with the same namespace share memories (e.g. one per tenant). None
+    # gives each graph its own, except on the persistent backend which then
+    # uses the top level of memory_dir
+    "memory_namespace": None,
+    # Point-in-time memory snapshots (persistent backend), see
+    # TradingAgentsGraph.save_memory_snapshot / load_memory_snapshot
+    "memory_snapshot_dir": None,  # Defaults to <memory_dir>/snapshots
+    # "numpy" backend: in-process arrays with quantization, deduplication of
+    # near-identical situations and a per-memory capacity
+    "memory_vector_dtype": "int8",  # Options: float32, float16, int8
+    "memory_max_entries": None,  # Situations kept per memory (None: unlimited)
+    "memory_eviction": "lru",  # Options: lru (least recently matched), age
+    "memory_dedup_threshold": 0.98,  # Cosine similarity; None disables
+    # Embeddings for memory retrieval: "openai" (remote endpoint at backend_url)
+    # or "hashing" (local hashed bag-of-words, no network)
+    "embedding_backend": "openai",
+    "hashing_embedding_dim": 1024,
+    # Situations are embedded in chunks of at most memory_chunk_tokens; a stored
+    # situation scores its best chunk match ("max") or the mean over query
+    # chunks of their best match ("mean")
+    "memory_chunk_tokens": 800,
+    "memory_chunk_aggregation": "max",
+    # Embedding cache shared by all agent memories of a graph
+    "embedding_cache": "memory",  # Options: off, memory, disk
+    "embedding_cache_path": None,  # Defaults to <results_dir>/embedding_cache.sqlite
+    # Analyst report cache (reports are reused while their tool data is unchanged)
+    "report_cache_enabled": False,
+    "report_cache_dir": None,  # Defaults to <results_dir>/report_cache
+    # Analyst tool execution: concurrent calls per message and per-run memoization
+    "tool_max_workers": 4,
+    "tool_memoize": True,
+    # Per-analyst size limit (characters) above which tool outputs the model has
+    # already responded to are replaced by a digest in later prompts (None disables)
+    "tool_output_compaction": {
+        "market": 2000,
+        "social": 3000,
+        "news": 3000,
+        "fundamentals": 3000,
+    },
+    # Model turns after a tool output before it counts as analyzed (a turn
+    # with text content counts at once)
+    "tool_output_compaction_rounds": 2,
+    # Data tool output formatting. Profiles: raw, compact, summary (statistics
+    # plus the most recent output_recent_rows rows) and fields (whitelist).
+    # tool_output_formats overrides per tool, e.g.
+    #   "get_stock_data": "summary",
+    #   "get_balance_sheet": {"profile": "fields", "fields": ["totalAssets"], "max_tokens": 1500},
+    "output_format": "compact",
+    "output_recent_rows": 10,
+    "tool_output_max_tokens": 6000,  # Hard cap per tool call (None disables)
+    "tool_output_formats": {},
     # Data vendor configuration
     # Category-level configuration (default for all tools in category)
     "data_vendors": {
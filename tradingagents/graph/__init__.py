@@ -5,7 +5,9 @@ from .conditional_logic import ConditionalLogic
 from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
-from .signal_processing import SignalProcessor
+from .signal_processing import SignalProcessor, TradeSignal
+from .forking import Forker
+from .instrumentation import RunMetrics
 
 __all__ = [
     "TradingAgentsGraph",
@@ -14,4 +16,7 @@ __all__ = [
     "Propagator",
     "Reflector",
     "SignalProcessor",
+    "TradeSignal",
+    "Forker",
+    "RunMetrics",
 ]
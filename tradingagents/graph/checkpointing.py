@@ -0,0 +1,113 @@
+# TradingAgents/graph/checkpointing.py
+
+import asyncio
+import os
+import sqlite3
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from langgraph.checkpoint.base import BaseCheckpointSaver
+
+try:
+    from langgraph.checkpoint.sqlite import SqliteSaver
+except ImportError:  # langgraph-checkpoint-sqlite is optional
+    SqliteSaver = None
+
+
+if SqliteSaver is not None:
+
+    class LocalSqliteSaver(SqliteSaver):
+        """SqliteSaver that also serves the async API used by `graph.astream`.
+
+        The stock SqliteSaver raises on its async methods. Local SQLite writes
+        are fast, so the async variants simply run the sync ones in a worker
+        thread; this lets the web UI stream a checkpointed graph unchanged.
+        """
+
+        async def aget_tuple(self, config):
+            return await asyncio.to_thread(self.get_tuple, config)
+
+        async def alist(self, config, *, filter=None, before=None, limit=None):
+            items = await asyncio.to_thread(
+                lambda: list(self.list(config, filter=filter, before=before, limit=limit))
+            )
+            for item in items:
+                yield item
+
+        async def aput(self, config, checkpoint, metadata, new_versions):
+            return await asyncio.to_thread(
+                self.put, config, checkpoint, metadata, new_versions
+            )
+
+        async def aput_writes(self, config, writes, task_id, task_path=""):
+            return await asyncio.to_thread(
+                self.put_writes, config, writes, task_id, task_path
+            )
+
+else:
+    LocalSqliteSaver = None
+
+
+def create_checkpointer(config: Dict[str, Any]) -> Optional[BaseCheckpointSaver]:
+    """Create the local checkpointer described by the config, if enabled.
+
+    Args:
+        config: Configuration dictionary. Reads `checkpoint_enabled` and
+            `checkpoint_db` (defaults to `<results_dir>/checkpoints.sqlite`).
+
+    Returns:
+        A SQLite-backed checkpointer, or None when checkpointing is disabled.
+    """
+    if not config.get("checkpoint_enabled", False):
+        return None
+
+    if LocalSqliteSaver is None:
+        raise ImportError(
+            "Checkpointing requires the 'langgraph-checkpoint-sqlite' package. "
+            "Install it with `pip install langgraph-checkpoint-sqlite`."
+        )
+
+    db_path = config.get("checkpoint_db") or os.path.join(
+        config["results_dir"], "checkpoints.sqlite"
+    )
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+
+    conn = sqlite3.connect(db_path, check_same_thread=False)
+    return LocalSqliteSaver(conn)
+
+
+def new_run_id() -> str:
+    """Generate a sortable, unique run id."""
+    return f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def make_thread_id(ticker: str, trade_date: str, run_id: str) -> str:
+    """Build the checkpoint thread id for a (ticker, trade_date, run id) triple."""
+    return f"{ticker.upper()}:{trade_date}:{run_id}"
+
+
+def list_run_ids(
+    checkpointer: BaseCheckpointSaver, ticker: str, trade_date: str
+) -> List[str]:
+    """List the run ids that have checkpoints for a ticker and date, newest first."""
+    prefix = make_thread_id(ticker, trade_date, "")
+
+    if SqliteSaver is not None and isinstance(checkpointer, SqliteSaver):
+        # Only the thread ids are needed; listing would load every checkpoint
+        with checkpointer.cursor(transaction=False) as cur:
+            cur.execute(
+                "SELECT DISTINCT thread_id FROM checkpoints WHERE substr(thread_id, 1, ?) = ?",
+                (len(prefix), prefix),
+            )
+            thread_ids = [row[0] for row in cur.fetchall()]
+    else:
+        thread_ids = {
+            checkpoint_tuple.config["configurable"].get("thread_id", "")
+            for checkpoint_tuple in checkpointer.list(None)
+        }
+
+    run_ids = {
+        thread_id[len(prefix):] for thread_id in thread_ids if thread_id.startswith(prefix)
+    }
+    return sorted(run_ids, reverse=True)
@@ -0,0 +1,209 @@
+# TradingAgents/graph/forking.py
+
+import copy
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from langgraph.checkpoint.memory import MemorySaver
+
+from .checkpointing import make_thread_id, new_run_id
+from .conditional_logic import ConditionalLogic
+from .propagation import Propagator
+from .setup import GraphSetup
+
+
+# State fields a variant may override when forking
+POSITION_FIELDS = ("shares_owned", "purchase_price")
+
+# Config keys a variant may override: the variant graph reuses the agents,
+# models and memories of the base graph and only changes its routing
+VARIANT_CONFIG_KEYS = (
+    "max_debate_rounds",
+    "max_risk_discuss_rounds",
+    "max_prediction_rounds",
+    "enable_prediction_team",
+)
+
+
+def validate_variant(variant: Dict[str, Any]) -> None:
+    """Raise ValueError for overrides a forked variant cannot apply."""
+    unknown = set(variant) - set(POSITION_FIELDS) - {"config"}
+    if unknown:
+        raise ValueError(
+            f"Unsupported variant keys {sorted(unknown)}; "
+            f"use {list(POSITION_FIELDS)} or 'config'"
+        )
+    unsupported = set(variant.get("config", {})) - set(VARIANT_CONFIG_KEYS)
+    if unsupported:
+        raise ValueError(
+            f"Variant config overrides {sorted(unsupported)} are not supported; "
+            f"only {list(VARIANT_CONFIG_KEYS)} can change between variants. "
+            "Build a separate TradingAgentsGraph for other settings."
+        )
+
+
+class Forker:
+    """Snapshots graph state after a node and fans out downstream variants.
+
+    The analyst reports and the bull/bear debate do not depend on the
+    portfolio position, so they can be computed once and shared by every
+    position size or downstream config that is evaluated for a ticker/date.
+    """
+
+    def __init__(
+        self,
+        graph_setup: GraphSetup,
+        propagator: Propagator,
+        config: Dict[str, Any],
+        selected_analysts: List[str],
+        checkpointer=None,
+        process_signal: Optional[Callable[[str], Any]] = None,
+        run_args: Optional[Callable[..., Dict[str, Any]]] = None,
+    ):
+        """Initialize with the components used to build variant graphs.
+
+        `run_args(thread_id, new_run)` returns the invocation args for a run
+        (see `TradingAgentsGraph.get_run_args`); it defaults to the
+        propagator's plain graph args.
+        """
+        self.graph_setup = graph_setup
+        self.propagator = propagator
+        self.config = config
+        self.selected_analysts = selected_analysts
+        self.checkpointer = checkpointer or MemorySaver()
+        self.process_signal = process_signal
+        self.run_args = run_args or (
+            lambda thread_id, new_run=True: propagator.get_graph_args(thread_id)
+        )
+        self._base_graph = None
+
+    def _build_graph(self, config: Dict[str, Any]):
+        """Compile a graph whose routing follows the given config."""
+        setup = copy.copy(self.graph_setup)
+        setup.conditional_logic = ConditionalLogic(config)
+        return setup.setup_graph(
+            self.selected_analysts,
+            config.get("enable_prediction_team", True),
+            self.checkpointer,
+        )
+
+    def snapshot(
+        self,
+        company_name: str,
+        trade_date: str,
+        after_node: str = "Research Manager",
+        shares_owned: float = 0,
+        purchase_price: float = 0,
+    ) -> Dict[str, Any]:
+        """Run the graph up to and including `after_node` and capture its state.
+
+        Args:
+            company_name: Ticker symbol to analyze
+            trade_date: Analysis date
+            after_node: Node after which execution stops. Every node up to it
+                must not depend on the inputs that variants will change.
+            shares_owned: Position used for the shared upstream run
+            purchase_price: Position price used for the shared upstream run
+
+        Returns:
+            A snapshot dict to pass to `run_variants`.
+        """
+        if self._base_graph is None:
+            self._base_graph = self._build_graph(self.config)
+
+        run_id = new_run_id()
+        thread_id = make_thread_id(company_name, str(trade_date), run_id)
+        args = self.run_args(thread_id)
+
+        init_agent_state = self.propagator.create_initial_state(
+            company_name, trade_date, shares_owned, purchase_price
+        )
+        self._base_graph.invoke(
+            init_agent_state, config=args["config"], interrupt_after=[after_node]
+        )
+
+        state = self._base_graph.get_state(args["config"])
+        if not state.next:
+            raise ValueError(f"Graph finished before reaching '{after_node}'")
+
+        return {
+            "company_name": company_name,
+            "trade_date": str(trade_date),
+            "after_node": after_node,
+            "run_id": run_id,
+            "values": state.values,
+        }
+
+    def run_variant(
+        self, snapshot: Dict[str, Any], variant: Dict[str, Any], index: int = 0
+    ) -> Tuple[Dict[str, Any], Any]:
+        """Run the downstream stages of the graph for a single variant.
+
+        Args:
+            snapshot: Snapshot returned by `snapshot`
+            variant: Overrides for this branch. `shares_owned` and
+                `purchase_price` replace the position inputs; `config` holds
+                routing overrides (see VARIANT_CONFIG_KEYS). Anything else
+                raises ValueError.
+            index: Position of the variant, used to name its checkpoint thread
+
+        Returns:
+            The final state and processed signal, as returned by `propagate`.
+        """
+        validate_variant(variant)
+        variant_config = {**self.config, **variant.get("config", {})}
+        graph = self._build_graph(variant_config)
+
+        thread_id = make_thread_id(
+            snapshot["company_name"],
+            snapshot["trade_date"],
+            f"{snapshot['run_id']}-v{index}",
+        )
+        # Variants count into the run started by the snapshot
+        args = self.run_args(thread_id, new_run=False)
+
+        values = dict(snapshot["values"])
+        for field in POSITION_FIELDS:
+            if field in variant:
+                values[field] = variant[field]
+
+        graph.update_state(args["config"], values, as_node=snapshot["after_node"])
+        final_state = graph.invoke(None, **args)
+
+        signal = None
+        if self.process_signal is not None:
+            signal = self.process_signal(final_state["final_trade_decision"])
+        return final_state, signal
+
+    def run_variants(
+        self,
+        snapshot: Dict[str, Any],
+        variants: List[Dict[str, Any]],
+        max_workers: int = 1,
+    ) -> List[Tuple[Dict[str, Any], Any]]:
+        """Fan out several downstream variants from one snapshot.
+
+        Args:
+            snapshot: Snapshot returned by `snapshot`
+            variants: One overrides dict per variant (see `run_variant`)
+            max_workers: Number of variants to run concurrently
+
+        Returns:
+            A (final_state, signal) tuple per variant, in input order.
+        """
+        # Reject bad overrides before any variant runs
+        for variant in variants:
+            validate_variant(variant)
+
+        if max_workers <= 1:
+            return [
+                self.run_variant(snapshot, variant, i)
+                for i, variant in enumerate(variants)
+            ]
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                executor.submit(self.run_variant, snapshot, variant, i)
+                for i, variant in enumerate(variants)
+            ]
+            return [future.result() for future in futures]
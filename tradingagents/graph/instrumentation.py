@@ -0,0 +1,306 @@
+# TradingAgents/graph/instrumentation.py
+
+import json
+import threading
+import time
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+
+# USD per million tokens: (input, cached input, output). Model names are
+# matched by longest prefix after any "provider/" prefix, so dated and
+# "-latest" variants share their family's price. Override or extend with
+# `llm_pricing` in the config.
+MODEL_PRICING: Dict[str, Tuple[float, float, float]] = {
+    "gpt-4o-mini": (0.15, 0.075, 0.60),
+    "gpt-4o": (2.50, 1.25, 10.00),
+    "gpt-4.1-nano": (0.10, 0.025, 0.40),
+    "gpt-4.1-mini": (0.40, 0.10, 1.60),
+    "gpt-4.1": (2.00, 0.50, 8.00),
+    "o4-mini": (1.10, 0.275, 4.40),
+    "o3-mini": (1.10, 0.55, 4.40),
+    "o3": (2.00, 0.50, 8.00),
+    "o1": (15.00, 7.50, 60.00),
+    "claude-3-5-haiku": (0.80, 0.08, 4.00),
+    "claude-3-5-sonnet": (3.00, 0.30, 15.00),
+    "claude-3-7-sonnet": (3.00, 0.30, 15.00),
+    "claude-sonnet-4": (3.00, 0.30, 15.00),
+    "claude-opus-4": (15.00, 1.50, 75.00),
+    "gemini-2.0-flash-lite": (0.075, 0.019, 0.30),
+    "gemini-2.0-flash": (0.10, 0.025, 0.40),
+    "gemini-2.5-flash": (0.30, 0.075, 2.50),
+    "gemini-2.5-pro": (1.25, 0.31, 10.00),
+}
+
+# Node label for LLM calls made outside the graph (reflection, signal fallback)
+OUTSIDE_GRAPH = "(outside graph)"
+
+_NODE_FIELDS = ("calls", "errors", "wall_ms")
+_LLM_FIELDS = (
+    "llm_calls",
+    "llm_errors",
+    "llm_cache_hits",
+    "llm_ms",
+    "input_tokens",
+    "output_tokens",
+    "cached_tokens",
+    "tool_calls",
+    "cost_usd",
+)
+
+
+def _resolve_pricing(pricing: Optional[Dict[str, Any]]) -> Dict[str, Tuple[float, float, float]]:
+    resolved = dict(MODEL_PRICING)
+    for model, price in (pricing or {}).items():
+        if isinstance(price, dict):
+            price = (price["input"], price.get("cached_input", price["input"]), price["output"])
+        resolved[model] = tuple(price)
+    return resolved
+
+
+def _model_name(serialized, metadata, kwargs) -> str:
+    params = kwargs.get("invocation_params") or {}
+    return str(
+        (metadata or {}).get("ls_model_name")
+        or params.get("model")
+        or params.get("model_name")
+        or ((serialized or {}).get("kwargs") or {}).get("model_name")
+        or params.get("_type")
+        or "unknown"
+    )
+
+
+def _usage(response) -> Dict[str, Any]:
+    """Token usage and tool calls of an LLMResult."""
+    usage = {"input_tokens": 0, "output_tokens": 0, "cached_tokens": 0, "tools": [], "cache_hit": False}
+    for generations in response.generations:
+        for generation in generations:
+            message = getattr(generation, "message", None)
+            metadata = getattr(message, "usage_metadata", None) or {}
+            details = metadata.get("input_token_details") or {}
+            usage["input_tokens"] += metadata.get("input_tokens", 0) or 0
+            usage["output_tokens"] += metadata.get("output_tokens", 0) or 0
+            usage["cached_tokens"] += details.get("cache_read", 0) or 0
+            usage["tools"].extend(call["name"] for call in getattr(message, "tool_calls", None) or [])
+            # LangChain zeroes total_cost on responses served from the LLM cache
+            if "total_cost" in metadata and not metadata["total_cost"]:
+                usage["cache_hit"] = True
+
+    if not usage["input_tokens"] and not usage["output_tokens"]:
+        # Providers that only report usage in llm_output
+        token_usage = (response.llm_output or {}).get("token_usage") or {}
+        details = token_usage.get("prompt_tokens_details") or {}
+        usage["input_tokens"] = token_usage.get("prompt_tokens", 0) or 0
+        usage["output_tokens"] = token_usage.get("completion_tokens", 0) or 0
+        usage["cached_tokens"] = details.get("cached_tokens", 0) or 0
+    return usage
+
+
+class RunMetrics(BaseCallbackHandler):
+    """Callback handler recording latency, tokens, tool calls and cost per graph node.
+
+    `TradingAgentsGraph` passes it in the run config callbacks (see
+    `get_run_args`), so every node and the LLM calls inside it are attributed
+    via LangGraph's `langgraph_node` metadata. Calls made outside the graph,
+    by `Reflector` and the `SignalProcessor` fallback, receive it through
+    their `callbacks` and are recorded under OUTSIDE_GRAPH. The LLMs
+    themselves are not modified, so several graphs can share a model.
+    """
+
+    def __init__(self, pricing: Optional[Dict[str, Any]] = None):
+        self.pricing = _resolve_pricing(pricing)
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._nodes: Dict[str, Dict[str, float]] = {}
+            self._models: Dict[str, Dict[str, float]] = {}
+            self._tools: Dict[str, int] = {}
+            self._unpriced: set = set()
+            self._open_nodes: Dict[Any, Tuple[str, float]] = {}
+            self._open_llms: Dict[Any, Tuple[str, str, float]] = {}
+
+    def price(self, model: str) -> Optional[Tuple[float, float, float]]:
+        """(input, cached input, output) USD per million tokens, or None if unknown."""
+        name = model.split("/")[-1]
+        matches = [prefix for prefix in self.pricing if name.startswith(prefix)]
+        return self.pricing[max(matches, key=len)] if matches else None
+
+    def _bucket(self, table, key, fields):
+        return table.setdefault(key, {field: 0 for field in fields})
+
+    # Graph nodes
+
+    def on_chain_start(self, serialized, inputs, *, run_id, metadata=None, **kwargs):
+        node = (metadata or {}).get("langgraph_node")
+        # Each node run is a chain named after the node; runnables inside it
+        # carry the same metadata under their own names
+        if node and kwargs.get("name") == node:
+            with self._lock:
+                self._open_nodes[run_id] = (node, time.perf_counter())
+
+    def _close_node(self, run_id, error: bool) -> None:
+        with self._lock:
+            opened = self._open_nodes.pop(run_id, None)
+            if opened is None:
+                return
+            node, start = opened
+            stats = self._bucket(self._nodes, node, _NODE_FIELDS + _LLM_FIELDS)
+            stats["calls"] += 1
+            stats["errors"] += int(error)
+            stats["wall_ms"] += (time.perf_counter() - start) * 1000
+
+    def on_chain_end(self, outputs, *, run_id, **kwargs):
+        self._close_node(run_id, error=False)
+
+    def on_chain_error(self, error, *, run_id, **kwargs):
+        self._close_node(run_id, error=True)
+
+    # LLM calls
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, metadata=None, **kwargs):
+        self._open_llm(run_id, serialized, metadata, kwargs)
+
+    def on_llm_start(self, serialized, prompts, *, run_id, metadata=None, **kwargs):
+        self._open_llm(run_id, serialized, metadata, kwargs)
+
+    def _open_llm(self, run_id, serialized, metadata, kwargs) -> None:
+        node = (metadata or {}).get("langgraph_node") or OUTSIDE_GRAPH
+        model = _model_name(serialized, metadata, kwargs)
+        with self._lock:
+            self._open_llms[run_id] = (node, model, time.perf_counter())
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            opened = self._open_llms.pop(run_id, None)
+        if opened is None:
+            return
+        node, model, start = opened
+        elapsed_ms = (time.perf_counter() - start) * 1000
+        usage = _usage(response)
+
+        price = self.price(model)
+        cost = 0.0
+        if usage["cache_hit"]:
+            # Served from the local LLM cache: no provider tokens were billed
+            usage.update(input_tokens=0, output_tokens=0, cached_tokens=0)
+        elif price is not None:
+            cost = (
+                (usage["input_tokens"] - usage["cached_tokens"]) * price[0]
+                + usage["cached_tokens"] * price[1]
+                + usage["output_tokens"] * price[2]
+            ) / 1e6
+
+        with self._lock:
+            if price is None:
+                self._unpriced.add(model)
+            for tool in usage["tools"]:
+                self._tools[tool] = self._tools.get(tool, 0) + 1
+            for stats in (
+                self._bucket(self._nodes, node, _NODE_FIELDS + _LLM_FIELDS),
+                self._bucket(self._models, model, _LLM_FIELDS),
+            ):
+                stats["llm_calls"] += 1
+                stats["llm_cache_hits"] += int(usage["cache_hit"])
+                stats["llm_ms"] += elapsed_ms
+                stats["input_tokens"] += usage["input_tokens"]
+                stats["output_tokens"] += usage["output_tokens"]
+                stats["cached_tokens"] += usage["cached_tokens"]
+                stats["tool_calls"] += len(usage["tools"])
+                stats["cost_usd"] += cost
+
+    def on_llm_error(self, error, *, run_id, **kwargs):
+        with self._lock:
+            opened = self._open_llms.pop(run_id, None)
+            if opened is None:
+                return
+            node, model, start = opened
+            elapsed_ms = (time.perf_counter() - start) * 1000
+            for stats in (
+                self._bucket(self._nodes, node, _NODE_FIELDS + _LLM_FIELDS),
+                self._bucket(self._models, model, _LLM_FIELDS),
+            ):
+                stats["llm_errors"] += 1
+                stats["llm_ms"] += elapsed_ms
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Per-node, per-model and per-tool metrics plus run totals."""
+
+        def rounded(stats):
+            return {
+                key: round(value, 6 if key == "cost_usd" else 3) if isinstance(value, float) else value
+                for key, value in stats.items()
+            }
+
+        with self._lock:
+            nodes = {name: rounded(stats) for name, stats in self._nodes.items()}
+            models = {name: rounded(stats) for name, stats in self._models.items()}
+            tools = dict(sorted(self._tools.items()))
+            unpriced = sorted(self._unpriced)
+
+        totals = {field: 0 for field in _NODE_FIELDS + _LLM_FIELDS}
+        for stats in nodes.values():
+            for field in totals:
+                totals[field] += stats[field]
+        totals = rounded(totals)
+        totals["unpriced_models"] = unpriced
+        return {"nodes": nodes, "models": models, "tools": tools, "totals": totals}
+
+
+def metrics_to_json(snapshot: Dict[str, Any], **labels: Any) -> str:
+    """Serialize a RunMetrics snapshot, with run labels, as JSON."""
+    return json.dumps({"labels": labels, **snapshot}, indent=2)
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _series(name: str, labels: Dict[str, Any], value: float) -> str:
+    rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+    return f"{name}{{{rendered}}} {value}"
+
+
+_PROMETHEUS_METRICS: Iterable[Tuple[str, str, str, str]] = (
+    # (metric, table, field, help)
+    ("tradingagents_node_runs_total", "nodes", "calls", "Graph node executions"),
+    ("tradingagents_node_errors_total", "nodes", "errors", "Graph node executions that raised"),
+    ("tradingagents_node_wall_seconds_total", "nodes", "wall_ms", "Wall time spent in graph nodes"),
+    ("tradingagents_llm_calls_total", "nodes", "llm_calls", "LLM calls per node"),
+    ("tradingagents_llm_errors_total", "nodes", "llm_errors", "Failed LLM calls per node"),
+    ("tradingagents_llm_cache_hits_total", "nodes", "llm_cache_hits", "LLM calls served from the local response cache"),
+    ("tradingagents_llm_latency_seconds_total", "nodes", "llm_ms", "LLM call latency per node"),
+    ("tradingagents_llm_input_tokens_total", "nodes", "input_tokens", "LLM input tokens per node"),
+    ("tradingagents_llm_output_tokens_total", "nodes", "output_tokens", "LLM output tokens per node"),
+    ("tradingagents_llm_cached_tokens_total", "nodes", "cached_tokens", "Input tokens served from provider caches"),
+    ("tradingagents_llm_tool_calls_total", "nodes", "tool_calls", "Tool calls requested by the LLM per node"),
+    ("tradingagents_llm_cost_usd_total", "nodes", "cost_usd", "Estimated LLM cost per node"),
+    ("tradingagents_model_calls_total", "models", "llm_calls", "LLM calls per model"),
+    ("tradingagents_model_input_tokens_total", "models", "input_tokens", "LLM input tokens per model"),
+    ("tradingagents_model_output_tokens_total", "models", "output_tokens", "LLM output tokens per model"),
+    ("tradingagents_model_cost_usd_total", "models", "cost_usd", "Estimated LLM cost per model"),
+)
+
+
+def metrics_to_prometheus(snapshot: Dict[str, Any], **labels: Any) -> str:
+    """Render a RunMetrics snapshot in the Prometheus text exposition format.
+
+    Extra keyword arguments (e.g. ticker, trade_date) are added as labels on
+    every series. Millisecond fields are exported in seconds.
+    """
+    lines = []
+    for metric, table, field, help_text in _PROMETHEUS_METRICS:
+        key = "node" if table == "nodes" else "model"
+        lines.append(f"# HELP {metric} {help_text}")
+        lines.append(f"# TYPE {metric} counter")
+        for name, stats in snapshot[table].items():
+            value = stats[field] / 1000 if field.endswith("_ms") else stats[field]
+            lines.append(_series(metric, {**labels, key: name}, value))
+    metric = "tradingagents_tool_requests_total"
+    lines.append(f"# HELP {metric} Tool calls requested by the LLMs per tool")
+    lines.append(f"# TYPE {metric} counter")
+    for tool, count in snapshot["tools"].items():
+        lines.append(_series(metric, {**labels, "tool": tool}, count))
+    return "\n".join(lines) + "\n"
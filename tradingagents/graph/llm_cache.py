@@ -0,0 +1,155 @@
+# TradingAgents/graph/llm_cache.py
+
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Optional
+
+from langchain_core.caches import BaseCache, RETURN_VAL_TYPE
+from langchain_core.load import dumps, loads
+
+
+CACHE_MODES = ("off", "read_only", "read_write")
+
+
+class SQLiteLLMCache(BaseCache):
+    """Persistent exact-match cache for LLM responses.
+
+    LangChain chat models consult the cache with the serialized messages as
+    `prompt` and a description of the model, its parameters and any bound
+    tools as `llm_string`, so a hit requires an identical request. Entries are
+    evicted least-recently-used first once the cache exceeds `max_bytes`.
+    """
+
+    def __init__(self, path: str, mode: str = "read_write", max_bytes: int = 512 * 1024 * 1024):
+        """Open (or create) the cache database.
+
+        Args:
+            path: SQLite database file
+            mode: "read_only" serves hits without storing new responses,
+                "read_write" also stores them
+            max_bytes: Total size of cached responses before eviction starts
+        """
+        if mode not in ("read_only", "read_write"):
+            raise ValueError(f"Unsupported LLM cache mode: {mode}")
+
+        self.path = path
+        self.mode = mode
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS llm_cache (
+                key TEXT PRIMARY KEY,
+                value TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                created_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache (accessed_at)"
+        )
+        self._conn.commit()
+
+    @staticmethod
+    def _make_key(prompt: str, llm_string: str) -> str:
+        return hashlib.sha256(f"{llm_string}\x00{prompt}".encode("utf-8")).hexdigest()
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        """Return the cached generations for an identical request, if any."""
+        key = self._make_key(prompt, llm_string)
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            if self.mode == "read_write":
+                self._conn.execute(
+                    "UPDATE llm_cache SET accessed_at = ? WHERE key = ?",
+                    (time.time(), key),
+                )
+                self._conn.commit()
+
+        return [loads(generation) for generation in json.loads(row[0])]
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        """Store the generations for a request (no-op in read-only mode)."""
+        if self.mode != "read_write":
+            return
+
+        key = self._make_key(prompt, llm_string)
+        value = json.dumps([dumps(generation) for generation in return_val])
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (key, value, len(value), now, now),
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        """Drop least-recently-used entries until the cache fits in max_bytes."""
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+
+        rows = self._conn.execute(
+            "SELECT key, size FROM llm_cache ORDER BY accessed_at ASC"
+        ).fetchall()
+        stale_keys = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale_keys.append((key,))
+            total -= size
+        self._conn.executemany("DELETE FROM llm_cache WHERE key = ?", stale_keys)
+
+    def clear(self, **kwargs: Any) -> None:
+        """Remove every cached response."""
+        with self._lock:
+            self._conn.execute("DELETE FROM llm_cache")
+            self._conn.commit()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters for this process and the current cache size."""
+        with self._lock:
+            entries, size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM llm_cache"
+            ).fetchone()
+        return {"hits": self.hits, "misses": self.misses, "entries": entries, "bytes": size}
+
+
+def create_llm_cache(config: Dict[str, Any]) -> Optional[SQLiteLLMCache]:
+    """Create the LLM response cache described by the config.
+
+    Reads `llm_cache_mode` ("off", "read_only" or "read_write"),
+    `llm_cache_path` (defaults to `<results_dir>/llm_cache.sqlite`) and
+    `llm_cache_max_mb`. Returns None when caching is off.
+    """
+    mode = config.get("llm_cache_mode", "off")
+    if mode not in CACHE_MODES:
+        raise ValueError(f"Unsupported LLM cache mode: {mode}. Options: {CACHE_MODES}")
+    if mode == "off":
+        return None
+
+    path = config.get("llm_cache_path") or os.path.join(
+        config["results_dir"], "llm_cache.sqlite"
+    )
+    max_bytes = int(config.get("llm_cache_max_mb", 512) * 1024 * 1024)
+    return SQLiteLLMCache(path, mode=mode, max_bytes=max_bytes)
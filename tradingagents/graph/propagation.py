@@ -1,19 +1,45 @@
 # TradingAgents/graph/propagation.py
 
-from typing import Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
+from tradingagents.dataflows.market_snapshot import MarketSnapshot
 
 
 class Propagator:
     """Handles state initialization and propagation through the graph."""
 
-    def __init__(self, max_recur_limit=100):
-        """Initialize with configuration parameters."""
+    def __init__(
+        self,
+        max_recur_limit=100,
+        snapshot_provider: Optional[Callable[[str, str], Optional[MarketSnapshot]]] = None,
+    ):
+        """Initialize with configuration parameters.
+
+        Args:
+            max_recur_limit: Recursion limit for graph invocations
+            snapshot_provider: Called as `provider(ticker, trade_date)` to build
+                the market snapshot placed in the initial state. Without one,
+                or if it fails, `market_snapshot` is None.
+        """
         self.max_recur_limit = max_recur_limit
+        self.snapshot_provider = snapshot_provider
+
+    def get_market_snapshot(
+        self, company_name: str, trade_date: str
+    ) -> Optional[MarketSnapshot]:
+        """Compute the market snapshot, or None when it is unavailable."""
+        if self.snapshot_provider is None:
+            return None
+        try:
+            return self.snapshot_provider(company_name, str(trade_date))
+        except Exception as e:
+            # The agents fall back to the prices quoted in the market report
+            print(f"Market snapshot unavailable for {company_name}: {e}")
+            return None
 
     def create_initial_state(
         self, company_name: str, trade_date: str, shares_owned: float = 0, purchase_price: float = 0
@@ -25,8 +51,15 @@ class Propagator:
             "trade_date": str(trade_date),
             "shares_owned": shares_owned,
             "purchase_price": purchase_price,
+            "market_snapshot": self.get_market_snapshot(company_name, trade_date),
             "investment_debate_state": InvestDebateState(
-                {"history": "", "current_response": "", "count": 0}
+                {
+                    "history": "",
+                    "current_response": "",
+                    "count": 0,
+                    "history_summary": "",
+                    "summarized_turns": 0,
+                }
             ),
             "risk_debate_state": RiskDebateState(
                 {
@@ -35,17 +68,41 @@ class Propagator:
                     "current_safe_response": "",
                     "current_neutral_response": "",
                     "count": 0,
+                    "history_summary": "",
+                    "summarized_turns": 0,
                 }
             ),
             "market_report": "",
             "fundamentals_report": "",
             "sentiment_report": "",
             "news_report": "",
+            "research_brief": "",
         }
 
-    def get_graph_args(self) -> Dict[str, Any]:
-        """Get arguments for the graph invocation."""
+    def get_graph_args(
+        self,
+        thread_id: Optional[str] = None,
+        callbacks: Optional[List[Any]] = None,
+        run_objects: Optional[Dict[str, Any]] = None,
+    ) -> Dict[str, Any]:
+        """Get arguments for the graph invocation.
+
+        Args:
+            thread_id: Checkpoint thread to run on. Required when the graph
+                was compiled with a checkpointer.
+            callbacks: LangChain callback handlers for the run
+            run_objects: Per-run objects (e.g. stats collectors) that nodes
+                look up with `get_run_object`. They are not checkpointed.
+        """
+        config = {"recursion_limit": self.max_recur_limit}
+        configurable = dict(run_objects or {})
+        if thread_id is not None:
+            configurable["thread_id"] = thread_id
+        if configurable:
+            config["configurable"] = configurable
+        if callbacks:
+            config["callbacks"] = list(callbacks)
         return {
             "stream_mode": "values",
-            "config": {"recursion_limit": self.max_recur_limit},
+            "config": config,
         }
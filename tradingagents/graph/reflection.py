@@ -1,20 +1,100 @@
 # TradingAgents/graph/reflection.py
 
-from typing import Dict, Any
+import logging
+import re
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
 from langchain_openai import ChatOpenAI
 
+from tradingagents.agents.utils.token_utils import truncate_to_tokens
+
+logger = logging.getLogger(__name__)
+
+
+# "Lesson: ...", "**Lesson:** ..." or "4. Lesson - ..." up to the end of the line
+_LESSON = re.compile(r"^[\s>*#\d.)-]*lesson\**\s*[:\-–]\**\s*(.+)$", re.IGNORECASE | re.MULTILINE)
+# Body of the "Summary" or "Query" section, up to the next numbered heading
+_SECTION = r"^[\s*#]*(?:\d+\.\s*)?\**{name}\**\s*:?\**\s*$\n(.+?)(?=^[\s*#]*\d+\.\s|\Z)"
+
+
+def extract_lesson(reflection: str, max_tokens: int = 150) -> str:
+    """Distill a reflection into the short lesson injected into later prompts.
+
+    Takes the "Lesson:" line the reflection prompt asks for, falling back to
+    the Query or Summary section of older-style reflections and finally to
+    the reflection itself, capped at `max_tokens`.
+    """
+    match = _LESSON.search(reflection)
+    lesson = match.group(1) if match else ""
+    for name in ("Query", "Summary"):
+        if lesson:
+            break
+        section = re.search(
+            _SECTION.format(name=name), reflection, re.IGNORECASE | re.MULTILINE | re.DOTALL
+        )
+        lesson = section.group(1) if section else ""
+    lesson = " ".join((lesson or reflection).replace("*", "").split())
+    return truncate_to_tokens(lesson, max_tokens)
+
+
+def _prediction_field(field: str):
+    return lambda state: (state.get("prediction_debate_state") or {}).get(field, "")
+
+
+# Memory name -> (component label, the component's output in the final state)
+REFLECTION_COMPONENTS = {
+    "bull_memory": ("BULL", lambda state: state["investment_debate_state"]["bull_history"]),
+    "bear_memory": ("BEAR", lambda state: state["investment_debate_state"]["bear_history"]),
+    "trader_memory": ("TRADER", lambda state: state["trader_investment_plan"]),
+    "invest_judge_memory": (
+        "INVEST JUDGE",
+        lambda state: state["investment_debate_state"]["judge_decision"],
+    ),
+    "risk_manager_memory": (
+        "RISK JUDGE",
+        lambda state: state["risk_debate_state"]["judge_decision"],
+    ),
+    "short_term_predictor_memory": (
+        "SHORT-TERM PREDICTOR",
+        _prediction_field("short_term_history"),
+    ),
+    "medium_term_predictor_memory": (
+        "MEDIUM-TERM PREDICTOR",
+        _prediction_field("medium_term_history"),
+    ),
+    "long_term_predictor_memory": (
+        "LONG-TERM PREDICTOR",
+        _prediction_field("long_term_history"),
+    ),
+    "prediction_manager_memory": (
+        "PREDICTION MANAGER",
+        lambda state: state.get("final_predictions", ""),
+    ),
+}
+
 
 class Reflector:
     """Handles reflection on decisions and updating memory."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize the reflector with an LLM."""
+    def __init__(
+        self,
+        quick_thinking_llm: ChatOpenAI,
+        lesson_tokens: int = 150,
+        callbacks: Optional[List[Any]] = None,
+    ):
+        """Initialize the reflector with an LLM and the token cap for stored lessons.
+
+        `callbacks` are LangChain handlers passed to every reflection call.
+        """
         self.quick_thinking_llm = quick_thinking_llm
+        self.lesson_tokens = lesson_tokens
+        self.callbacks = callbacks
         self.reflection_system_prompt = self._get_reflection_prompt()
 
     def _get_reflection_prompt(self) -> str:
         """Get the system prompt for reflection."""
-        return """
+        lesson_words = max(10, self.lesson_tokens * 2 // 3)
+        return f"""
 You are an expert financial analyst tasked with reviewing trading decisions/analysis and providing a comprehensive, step-by-step analysis. 
 Your goal is to deliver detailed insights into investment decisions and highlight opportunities for improvement, adhering strictly to the following guidelines:
 
@@ -39,9 +119,9 @@ Your goal is to deliver detailed insights into investment decisions and highligh
    - Summarize the lessons learned from the successes and mistakes.
    - Highlight how these lessons can be adapted for future trading scenarios and draw connections between similar situations to apply the knowledge gained.
 
-4. Query:
-   - Extract key insights from the summary into a concise sentence of no more than 1000 tokens.
-   - Ensure the condensed sentence captures the essence of the lessons and reasoning for easy reference.
+4. Lesson:
+   - End with a single line starting with "Lesson:" that distills the summary into one actionable sentence of no more than {lesson_words} words.
+   - This line is all that is shown to the agent in similar future situations, so it must stand on its own.
 
 Adhere strictly to these instructions, and ensure your output is detailed, accurate, and actionable. You will also be given objective descriptions of the market from a price movements, technical indicator, news, and sentiment perspective to provide more context for your analysis.
 """
@@ -67,9 +147,84 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
             ),
         ]
 
-        result = self.quick_thinking_llm.invoke(messages).content
+        result = self.quick_thinking_llm.invoke(
+            messages, config={"callbacks": self.callbacks}
+        ).content
         return result
 
+    def _remember(self, memory, situation: str, reflection: str, embedded=None) -> None:
+        """Store the distilled lesson, keeping the full reflection for audit."""
+        lesson = extract_lesson(reflection, self.lesson_tokens)
+        memory.add_situations([(situation, lesson, reflection)], embedded=embedded)
+
+    def reflect_all(
+        self,
+        current_state: Dict[str, Any],
+        returns_losses,
+        memories: Dict[str, Any],
+        max_workers: Optional[int] = None,
+    ) -> Dict[str, str]:
+        """Reflect on every component with output in the state, concurrently.
+
+        The reflection LLM calls run in parallel while the shared situation is
+        chunked and embedded once; each memory then stores its lesson in a
+        single batched insert. Memories store the distilled lesson (see
+        `extract_lesson`) with the full reflection kept as metadata. If the
+        shared embedding fails, each memory embeds the situation itself.
+        Components whose reflection or storage fails are logged and skipped.
+
+        Args:
+            current_state: Final state of the run
+            returns_losses: Realized returns of the decision
+            memories: Memory name -> FinancialSituationMemory (see
+                REFLECTION_COMPONENTS for the names)
+            max_workers: Concurrent reflection calls (default: one per component)
+
+        Returns:
+            Memory name -> full reflection text for the components stored
+        """
+        situation = self._extract_current_situation(current_state)
+        components = []
+        for name, (label, get_report) in REFLECTION_COMPONENTS.items():
+            report = get_report(current_state) if name in memories else ""
+            if report:
+                components.append((name, label, report))
+        if not components:
+            return {}
+
+        with ThreadPoolExecutor(max_workers=max_workers or len(components)) as pool:
+            futures = {
+                name: pool.submit(
+                    self._reflect_on_component, label, report, situation, returns_losses
+                )
+                for name, label, report in components
+            }
+            first_memory = memories[components[0][0]]
+            try:
+                embedded = first_memory.embed_situations([situation])
+            except Exception:
+                logger.warning("Shared situation embedding failed", exc_info=True)
+                embedded = None
+
+            results = {}
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception:
+                    logger.warning("Reflection for %s failed", name, exc_info=True)
+
+        reflections = {}
+        for name, result in results.items():
+            memory = memories[name]
+            shared = embedded if memory.embedding == first_memory.embedding else None
+            try:
+                self._remember(memory, situation, result, embedded=shared)
+            except Exception:
+                logger.warning("Storing the reflection for %s failed", name, exc_info=True)
+                continue
+            reflections[name] = result
+        return reflections
+
     def reflect_bull_researcher(self, current_state, returns_losses, bull_memory):
         """Reflect on bull researcher's analysis and update memory."""
         situation = self._extract_current_situation(current_state)
@@ -78,7 +233,7 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "BULL", bull_debate_history, situation, returns_losses
         )
-        bull_memory.add_situations([(situation, result)])
+        self._remember(bull_memory, situation, result)
 
     def reflect_bear_researcher(self, current_state, returns_losses, bear_memory):
         """Reflect on bear researcher's analysis and update memory."""
@@ -88,7 +243,7 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "BEAR", bear_debate_history, situation, returns_losses
         )
-        bear_memory.add_situations([(situation, result)])
+        self._remember(bear_memory, situation, result)
 
     def reflect_trader(self, current_state, returns_losses, trader_memory):
         """Reflect on trader's decision and update memory."""
@@ -98,7 +253,7 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "TRADER", trader_decision, situation, returns_losses
         )
-        trader_memory.add_situations([(situation, result)])
+        self._remember(trader_memory, situation, result)
 
     def reflect_invest_judge(self, current_state, returns_losses, invest_judge_memory):
         """Reflect on investment judge's decision and update memory."""
@@ -108,7 +263,7 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "INVEST JUDGE", judge_decision, situation, returns_losses
         )
-        invest_judge_memory.add_situations([(situation, result)])
+        self._remember(invest_judge_memory, situation, result)
 
     def reflect_risk_manager(self, current_state, returns_losses, risk_manager_memory):
         """Reflect on risk manager's decision and update memory."""
@@ -118,4 +273,4 @@ Adhere strictly to these instructions, and ensure your output is detailed, accur
         result = self._reflect_on_component(
             "RISK JUDGE", judge_decision, situation, returns_losses
         )
-        risk_manager_memory.add_situations([(situation, result)])
+        self._remember(risk_manager_memory, situation, result)
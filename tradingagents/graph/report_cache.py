@@ -0,0 +1,253 @@
+# TradingAgents/graph/report_cache.py
+
+import hashlib
+import inspect
+import json
+import os
+import re
+from typing import Any, Callable, Dict, List, Optional
+
+from langchain_core.messages import AIMessage, ToolMessage
+
+from tradingagents.agents import (
+    create_fundamentals_analyst,
+    create_market_analyst,
+    create_news_analyst,
+    create_social_media_analyst,
+)
+from tradingagents.agents.utils import agent_utils
+
+
+# State field holding each analyst's report
+REPORT_FIELDS = {
+    "market": "market_report",
+    "social": "sentiment_report",
+    "news": "news_report",
+    "fundamentals": "fundamentals_report",
+}
+
+# Code that decides what each analyst sees: its prompt and tools, and the
+# digests that replace tool outputs it has already responded to
+ANALYST_FACTORIES = {
+    "market": create_market_analyst,
+    "social": create_social_media_analyst,
+    "news": create_news_analyst,
+    "fundamentals": create_fundamentals_analyst,
+}
+_PROMPT_HELPERS = (agent_utils.compact_consumed_tool_outputs, agent_utils.digest_tool_output)
+
+# Analysts whose reports may be reused on later dates while their data is unchanged
+CROSS_DATE_ANALYSTS = ("fundamentals",)
+
+# Lines that change on every fetch without the underlying data changing
+_VOLATILE_LINES = re.compile(r"^#?\s*Data retrieved on:.*$", re.MULTILINE)
+
+
+def _source(func: Callable) -> str:
+    try:
+        return inspect.getsource(func)
+    except (OSError, TypeError):  # No source available (e.g. bytecode-only installs)
+        return repr([const for const in func.__code__.co_consts if isinstance(const, str)])
+
+
+def analyst_prompt_version(analyst: str, compaction: Any = None) -> str:
+    """Hash of the code and settings that shape an analyst's prompt.
+
+    Any edit to the analyst's factory (system prompt, tools) or to the tool
+    output compaction, or different compaction settings, changes the version,
+    so reports written under an older prompt are never served.
+    """
+    digest = hashlib.sha256()
+    for func in (ANALYST_FACTORIES[analyst], *_PROMPT_HELPERS):
+        digest.update(_source(func).encode("utf-8"))
+    digest.update(json.dumps(compaction).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def fingerprint_outputs(outputs: List[str]) -> str:
+    """Hash tool outputs, ignoring fetch timestamps."""
+    digest = hashlib.sha256()
+    for output in outputs:
+        normalized = _VOLATILE_LINES.sub("", str(output)).strip()
+        digest.update(normalized.encode("utf-8"))
+        digest.update(b"\x00")
+    return digest.hexdigest()
+
+
+class ReportCache:
+    """Reuses analyst reports whose underlying tool data has not changed.
+
+    Entries are keyed by (analyst, ticker, trade_date, model, prompt version),
+    where the prompt version hashes the code that builds the analyst's prompt.
+    Each entry records the tool calls the analyst made and a fingerprint of
+    their results. On lookup the calls are replayed, with the recorded trade
+    date replaced by the requested one, and the report is only reused if the
+    results hash to the same fingerprint. Analysts in CROSS_DATE_ANALYSTS are
+    stored without a date, so e.g. a fundamentals report is reused across days
+    until new statements are published.
+    """
+
+    def __init__(
+        self,
+        cache_dir: str,
+        tools: Dict[str, Any],
+        model: str,
+        compaction: Optional[Dict[str, Optional[int]]] = None,
+        compaction_rounds: Optional[int] = None,
+    ):
+        """Initialize the cache.
+
+        Args:
+            cache_dir: Directory holding one JSON file per entry
+            tools: Tools by name, used to replay recorded tool calls
+            model: Name of the model that writes the analyst reports
+            compaction: The `tool_output_compaction` config, part of each
+                analyst's prompt version
+            compaction_rounds: The `tool_output_compaction_rounds` config,
+                also part of the prompt version
+        """
+        self.cache_dir = cache_dir
+        self.tools = tools
+        self.model = model
+        self.prompt_versions = {
+            analyst: analyst_prompt_version(
+                analyst, [(compaction or {}).get(analyst), compaction_rounds]
+            )
+            for analyst in ANALYST_FACTORIES
+        }
+        self.hits = 0
+        self.misses = 0
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _entry_path(self, analyst: str, ticker: str, trade_date: str) -> str:
+        date_key = "*" if analyst in CROSS_DATE_ANALYSTS else str(trade_date)
+        key = json.dumps(
+            [analyst, ticker.upper(), date_key, self.model, self.prompt_versions.get(analyst, "")]
+        )
+        return os.path.join(
+            self.cache_dir, f"{analyst}_{hashlib.sha256(key.encode('utf-8')).hexdigest()}.json"
+        )
+
+    def _replay(self, calls: List[Dict[str, Any]], recorded_date: str, trade_date: str) -> List[str]:
+        """Re-run recorded tool calls for `trade_date` and return their outputs."""
+        outputs = []
+        for call in calls:
+            args = {
+                name: (trade_date if value == recorded_date else value)
+                for name, value in call["args"].items()
+            }
+            outputs.append(str(self.tools[call["name"]].invoke(args)))
+        return outputs
+
+    def lookup(self, analyst: str, ticker: str, trade_date: str) -> Optional[str]:
+        """Return a cached report if its tool data is unchanged, else None."""
+        path = self._entry_path(analyst, ticker, trade_date)
+        if not os.path.exists(path):
+            self.misses += 1
+            return None
+
+        with open(path, "r") as f:
+            entry = json.load(f)
+
+        try:
+            outputs = self._replay(entry["calls"], entry["trade_date"], str(trade_date))
+        except Exception:
+            # Tools that now fail or no longer exist cannot validate the entry
+            self.misses += 1
+            return None
+
+        if fingerprint_outputs(outputs) != entry["fingerprint"]:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return entry["report"]
+
+    def record(
+        self,
+        analyst: str,
+        ticker: str,
+        trade_date: str,
+        messages: List[Any],
+        report: str,
+    ) -> None:
+        """Store a finished report with the tool calls and results that produced it."""
+        results = {
+            message.tool_call_id: message.content
+            for message in messages
+            if isinstance(message, ToolMessage)
+        }
+        calls, outputs = [], []
+        for message in messages:
+            if not isinstance(message, AIMessage):
+                continue
+            for call in message.tool_calls:
+                if call["id"] in results:
+                    calls.append({"name": call["name"], "args": call["args"]})
+                    outputs.append(results[call["id"]])
+
+        # Without tool data there is nothing to detect a change across dates
+        if analyst in CROSS_DATE_ANALYSTS and not calls:
+            return
+
+        entry = {
+            "analyst": analyst,
+            "ticker": ticker,
+            "trade_date": str(trade_date),
+            "model": self.model,
+            "prompt_version": self.prompt_versions.get(analyst, ""),
+            "calls": calls,
+            "fingerprint": fingerprint_outputs(outputs),
+            "report": report,
+        }
+        path = self._entry_path(analyst, ticker, trade_date)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(entry, f, indent=2)
+        os.replace(tmp_path, path)
+
+    def wrap_analyst(self, analyst: str, node: Callable) -> Callable:
+        """Wrap an analyst node so it serves cached reports and records new ones."""
+        report_field = REPORT_FIELDS[analyst]
+
+        def cached_analyst_node(state):
+            ticker = state["company_of_interest"]
+            trade_date = state["trade_date"]
+            messages = state["messages"]
+
+            # Only consult the cache on entry, not when returning from tool calls
+            if not messages or not isinstance(messages[-1], ToolMessage):
+                report = self.lookup(analyst, ticker, trade_date)
+                if report is not None:
+                    return {"messages": [AIMessage(content=report)], report_field: report}
+
+            result = node(state)
+            if result.get(report_field):
+                self.record(
+                    analyst, ticker, trade_date, messages, result[report_field]
+                )
+            return result
+
+        return cached_analyst_node
+
+
+def create_report_cache(config: Dict[str, Any], tools: Dict[str, Any]) -> Optional[ReportCache]:
+    """Create the analyst report cache described by the config.
+
+    Reads `report_cache_enabled` and `report_cache_dir` (defaults to
+    `<results_dir>/report_cache`). Reports are keyed on `quick_think_llm`,
+    the model the analysts run on. Returns None when disabled.
+    """
+    if not config.get("report_cache_enabled", False):
+        return None
+
+    cache_dir = config.get("report_cache_dir") or os.path.join(
+        config["results_dir"], "report_cache"
+    )
+    return ReportCache(
+        cache_dir,
+        tools,
+        config["quick_think_llm"],
+        config.get("tool_output_compaction"),
+        config.get("tool_output_compaction_rounds"),
+    )
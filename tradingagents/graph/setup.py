@@ -3,12 +3,12 @@
 from typing import Dict, Any
 from langchain_openai import ChatOpenAI
 from langgraph.graph import END, StateGraph, START
-from langgraph.prebuilt import ToolNode
 
 from tradingagents.agents import *
 from tradingagents.agents.utils.agent_states import AgentState
 
 from .conditional_logic import ConditionalLogic
+from .tool_nodes import ParallelToolNode
 
 
 class GraphSetup:
@@ -18,7 +18,7 @@ class GraphSetup:
         self,
         quick_thinking_llm: ChatOpenAI,
         deep_thinking_llm: ChatOpenAI,
-        tool_nodes: Dict[str, ToolNode],
+        tool_nodes: Dict[str, ParallelToolNode],
         bull_memory,
         bear_memory,
         trader_memory,
@@ -29,6 +29,7 @@ class GraphSetup:
         long_term_predictor_memory,
         prediction_manager_memory,
         conditional_logic: ConditionalLogic,
+        report_cache=None,
     ):
         """Initialize with required components."""
         self.quick_thinking_llm = quick_thinking_llm
@@ -44,9 +45,13 @@ class GraphSetup:
         self.long_term_predictor_memory = long_term_predictor_memory
         self.prediction_manager_memory = prediction_manager_memory
         self.conditional_logic = conditional_logic
+        self.report_cache = report_cache
 
     def setup_graph(
-        self, selected_analysts=["market", "social", "news", "fundamentals"], enable_prediction_team=True
+        self,
+        selected_analysts=["market", "social", "news", "fundamentals"],
+        enable_prediction_team=True,
+        checkpointer=None,
     ):
         """Set up and compile the agent workflow graph.
 
@@ -56,6 +61,9 @@ class GraphSetup:
                 - "social": Social media analyst
                 - "news": News analyst
                 - "fundamentals": Fundamentals analyst
+            enable_prediction_team (bool): Whether to run the prediction team
+            checkpointer: Optional LangGraph checkpointer used to persist state
+                after every node so interrupted runs can be resumed
         """
         if len(selected_analysts) == 0:
             raise ValueError("Trading Agents Graph Setup Error: no analysts selected!")
@@ -93,6 +101,16 @@ class GraphSetup:
             delete_nodes["fundamentals"] = create_msg_delete()
             tool_nodes["fundamentals"] = self.tool_nodes["fundamentals"]
 
+        # Serve analyst reports whose tool data is unchanged from the cache
+        if self.report_cache is not None:
+            for analyst_type, node in analyst_nodes.items():
+                analyst_nodes[analyst_type] = self.report_cache.wrap_analyst(
+                    analyst_type, node
+                )
+
+        # Condense the analyst reports into one brief for the downstream agents
+        research_brief_node = create_research_brief(self.quick_thinking_llm)
+
         # Create researcher and manager nodes
         bull_researcher_node = create_bull_researcher(
             self.quick_thinking_llm, self.bull_memory
@@ -139,6 +157,7 @@ class GraphSetup:
             workflow.add_node(f"tools_{analyst_type}", tool_nodes[analyst_type])
 
         # Add other nodes
+        workflow.add_node("Research Brief", research_brief_node)
         workflow.add_node("Bull Researcher", bull_researcher_node)
         workflow.add_node("Bear Researcher", bear_researcher_node)
         workflow.add_node("Research Manager", research_manager_node)
@@ -173,14 +192,15 @@ class GraphSetup:
             )
             workflow.add_edge(current_tools, current_analyst)
 
-            # Connect to next analyst or to Bull Researcher if this is the last analyst
+            # Connect to next analyst or to the Research Brief if this is the last analyst
             if i < len(selected_analysts) - 1:
                 next_analyst = f"{selected_analysts[i+1].capitalize()} Analyst"
                 workflow.add_edge(current_clear, next_analyst)
             else:
-                workflow.add_edge(current_clear, "Bull Researcher")
+                workflow.add_edge(current_clear, "Research Brief")
 
         # Add remaining edges
+        workflow.add_edge("Research Brief", "Bull Researcher")
         workflow.add_conditional_edges(
             "Bull Researcher",
             self.conditional_logic.should_continue_debate,
@@ -262,4 +282,4 @@ class GraphSetup:
             workflow.add_edge("Risk Judge", END)
 
         # Compile and return
-        return workflow.compile()
+        return workflow.compile(checkpointer=checkpointer)
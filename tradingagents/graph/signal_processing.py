@@ -1,14 +1,150 @@
 # TradingAgents/graph/signal_processing.py
 
+import re
+from typing import Any, List, Optional
+
+from typing_extensions import TypedDict
 from langchain_openai import ChatOpenAI
 
 
+# "FINAL TRANSACTION PROPOSAL: **BUY**", but not the "**BUY/HOLD/SELL**" template
+_PROPOSAL = re.compile(
+    r"FINAL TRANSACTION PROPOSAL:\s*\**\s*(BUY|SELL|HOLD)\b(?!\s*/)", re.IGNORECASE
+)
+# "Clear Action: **Hold**", "Recommendation: SELL", "Final Decision - Buy"
+_ACTION = re.compile(
+    r"(?:clear action|recommendation|final decision|decision|action)\**\s*[:\-–]\s*\**\s*(BUY|SELL|HOLD)\b(?!\s*/)",
+    re.IGNORECASE,
+)
+# Another speaker named or quoted earlier in the sentence: "the Trader's
+# FINAL TRANSACTION PROPOSAL", "the Bull argued ... Recommendation: Buy"
+_ATTRIBUTION = re.compile(
+    r"\b(?:analyst|trader|bull|bear|aggressive|conservative|neutral|safe|risky|debater|researcher|predictor)s?\b"
+    r"|\w['\u2019]s\b|\b(?:propos|argu|suggest|quot)\w*",
+    re.IGNORECASE,
+)
+_QUOTE_MARKS = re.compile(r"[\"\u201c\u201d]")
+_PRICE = r"\$\s?(\d[\d,]*(?:\.\d+)?)"
+_STOP_LOSS = re.compile(r"stop[- ]?loss[^$\n]{0,40}?" + _PRICE, re.IGNORECASE)
+_TARGET = re.compile(
+    r"(?:price target|target price|take[- ]profit|exit price|target)[^$\n]{0,40}?"
+    + _PRICE
+    + r"(?:\s*[-–]\s*\$?\s?(\d[\d,]*(?:\.\d+)?))?",
+    re.IGNORECASE,
+)
+_ENTRY = re.compile(
+    r"(?:entry(?: price)?|buy at|enter at|accumulate at)[^$\n]{0,40}?"
+    + _PRICE
+    + r"(?:\s*[-–]\s*\$?\s?(\d[\d,]*(?:\.\d+)?))?",
+    re.IGNORECASE,
+)
+_POSITION = re.compile(
+    r"(?:\b(?:sell|buy|add|trim|reduce|allocate|increase|decrease)\s+(?:up to\s+)?(\d+(?:\.\d+)?)\s*%)"
+    r"|(?:(\d+(?:\.\d+)?)\s*%\s+(?:of\s+(?:the\s+|your\s+)?)?(?:position|portfolio|holdings))",
+    re.IGNORECASE,
+)
+
+
+class TradeSignal(TypedDict):
+    decision: str  # BUY, SELL or HOLD
+    entry_prices: List[float]
+    price_targets: List[float]
+    stop_loss: Optional[float]
+    position_pct: Optional[float]
+    source: str  # "parsed" when extracted deterministically, "llm" otherwise
+
+
+def _to_float(value: str) -> float:
+    return float(value.replace(",", ""))
+
+
+def _prices(pattern: re.Pattern, text: str) -> List[float]:
+    prices = []
+    for match in pattern.finditer(text):
+        for group in match.groups():
+            if group and _to_float(group) not in prices:
+                prices.append(_to_float(group))
+    return prices
+
+
+def _is_attributed(text: str, start: int) -> bool:
+    """Whether the marker at `start` is quoted or credited to another speaker."""
+    line_start = text.rfind("\n", 0, start) + 1
+    line = text[line_start:start]
+    if line.lstrip().startswith(">") or len(_QUOTE_MARKS.findall(line)) % 2:
+        return True
+    sentence = re.split(r"[.!?]\s", line)[-1]
+    return bool(_ATTRIBUTION.search(sentence))
+
+
+def _stated_decisions(text: str) -> List[str]:
+    """Decisions the author states in their own words, in order of appearance."""
+    matches = sorted(
+        [*_PROPOSAL.finditer(text), *_ACTION.finditer(text)], key=lambda m: m.start()
+    )
+    return [m.group(1).upper() for m in matches if not _is_attributed(text, m.start())]
+
+
+def parse_trade_signal(full_signal: str) -> TradeSignal:
+    """Extract a trade signal from decision text without calling an LLM.
+
+    The decision is taken from the `FINAL TRANSACTION PROPOSAL` marker the
+    agents are instructed to end with and from explicit "Clear Action:" /
+    "Recommendation:" lines. The risk judge's text quotes the debate, so
+    markers inside quotes or credited to another speaker earlier in the
+    sentence ("the Trader's FINAL TRANSACTION PROPOSAL: BUY") are ignored.
+    If the remaining markers disagree or none are left, `decision` is empty
+    and the caller should fall back to the LLM. Entry prices, price
+    targets, the stop-loss and the position percentage are filled in
+    whenever they are stated with explicit labels.
+    """
+    decisions = set(_stated_decisions(full_signal))
+
+    stop_losses = _prices(_STOP_LOSS, full_signal)
+    position = None
+    for match in _POSITION.finditer(full_signal):
+        position = float(match.group(1) or match.group(2))
+        break
+
+    return TradeSignal(
+        decision=decisions.pop() if len(decisions) == 1 else "",
+        entry_prices=_prices(_ENTRY, full_signal),
+        price_targets=_prices(_TARGET, full_signal),
+        stop_loss=stop_losses[0] if stop_losses else None,
+        position_pct=position,
+        source="parsed",
+    )
+
+
 class SignalProcessor:
     """Processes trading signals to extract actionable decisions."""
 
-    def __init__(self, quick_thinking_llm: ChatOpenAI):
-        """Initialize with an LLM for processing."""
+    def __init__(
+        self, quick_thinking_llm: ChatOpenAI, callbacks: Optional[List[Any]] = None
+    ):
+        """Initialize with an LLM for processing and callbacks for its calls."""
         self.quick_thinking_llm = quick_thinking_llm
+        self.callbacks = callbacks
+
+    def extract_signal(self, full_signal: str) -> TradeSignal:
+        """
+        Extract a structured trade signal from the final decision text.
+
+        The signal is parsed deterministically; the LLM is only called when
+        the decision itself cannot be parsed unambiguously.
+
+        Args:
+            full_signal: Complete trading signal text
+
+        Returns:
+            TradeSignal with the decision, entry prices, price targets,
+            stop-loss and position percentage
+        """
+        signal = parse_trade_signal(full_signal)
+        if not signal["decision"]:
+            signal["decision"] = self._llm_decision(full_signal)
+            signal["source"] = "llm"
+        return signal
 
     def process_signal(self, full_signal: str) -> str:
         """
@@ -20,6 +156,10 @@ class SignalProcessor:
         Returns:
             Extracted decision (BUY, SELL, or HOLD)
         """
+        return self.extract_signal(full_signal)["decision"]
+
+    def _llm_decision(self, full_signal: str) -> str:
+        """Ask the LLM for the decision when the text is ambiguous."""
         messages = [
             (
                 "system",
@@ -28,4 +168,8 @@ class SignalProcessor:
             ("human", full_signal),
         ]
 
-        return self.quick_thinking_llm.invoke(messages).content
+        content = self.quick_thinking_llm.invoke(
+            messages, config={"callbacks": self.callbacks}
+        ).content
+        match = re.search(r"\b(BUY|SELL|HOLD)\b", content.upper())
+        return match.group(1) if match else content.strip()
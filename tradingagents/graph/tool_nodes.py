@@ -0,0 +1,162 @@
+# TradingAgents/graph/tool_nodes.py
+
+import contextvars
+import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from langchain_core.messages import AIMessage, ToolMessage
+from langchain_core.runnables import RunnableConfig
+
+
+class ToolCallMemo:
+    """Per-run memo of tool results keyed on (tool name, arguments).
+
+    Entries hold futures, so a call that is already in flight on another
+    thread is awaited rather than executed a second time. Failed calls are
+    not memoized. Call `reset` at the start of every run so that data is not
+    reused across runs.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._futures: Dict[Tuple[str, str], Future] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def make_key(name: str, args: Dict[str, Any]) -> Tuple[str, str]:
+        return name, json.dumps(args, sort_keys=True, default=str)
+
+    def reset(self) -> None:
+        with self._lock:
+            self._futures.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def get_or_reserve(self, key: Tuple[str, str]) -> Tuple[Future, bool]:
+        """Return the future for `key` and whether the caller must compute it."""
+        with self._lock:
+            future = self._futures.get(key)
+            if future is not None:
+                self.hits += 1
+                return future, False
+            future = Future()
+            self._futures[key] = future
+            self.misses += 1
+            return future, True
+
+    def discard(self, key: Tuple[str, str]) -> None:
+        with self._lock:
+            self._futures.pop(key, None)
+
+
+class ParallelToolNode:
+    """Graph node that executes the tool calls of the last AI message.
+
+    A drop-in replacement for LangGraph's ToolNode for the analyst tool loops.
+    The calls in a message run concurrently on a bounded thread pool, since
+    the vendor tools spend most of their time blocked on network I/O.
+    Identical calls within a message are executed once. With a shared
+    `ToolCallMemo`, calls repeated later in the same run (including by other
+    analysts) are served from the memo.
+
+    Tools are invoked with the node's run config, and worker threads run in
+    a copy of the calling context, so callbacks and per-run objects (see
+    `get_run_object`) reach the tools as they would under ToolNode.
+    """
+
+    def __init__(
+        self,
+        tools: List[Any],
+        max_workers: int = 4,
+        memo: Optional[ToolCallMemo] = None,
+    ):
+        """Initialize the node.
+
+        Args:
+            tools: LangChain tools the analyst may call
+            max_workers: Upper bound on concurrently executing calls
+            memo: Optional memo shared by the tool nodes of a graph
+        """
+        self.tools_by_name = {tool.name: tool for tool in tools}
+        self.max_workers = max(1, max_workers)
+        self.memo = memo
+
+    def _run_tool(
+        self, name: str, args: Dict[str, Any], config: Optional[RunnableConfig]
+    ) -> str:
+        if name not in self.tools_by_name:
+            raise ValueError(
+                f"{name} is not a valid tool, try one of [{', '.join(self.tools_by_name)}]."
+            )
+        return str(self.tools_by_name[name].invoke(args, config))
+
+    def _execute(
+        self, name: str, args: Dict[str, Any], config: Optional[RunnableConfig]
+    ) -> str:
+        """Run a call, going through the memo when one is configured."""
+        if self.memo is None:
+            return self._run_tool(name, args, config)
+
+        key = ToolCallMemo.make_key(name, args)
+        future, owner = self.memo.get_or_reserve(key)
+        if owner:
+            try:
+                future.set_result(self._run_tool(name, args, config))
+            except Exception as e:
+                self.memo.discard(key)
+                future.set_exception(e)
+        return future.result()
+
+    def __call__(
+        self, state, config: Optional[RunnableConfig] = None
+    ) -> Dict[str, List[ToolMessage]]:
+        message = state["messages"][-1]
+        if not isinstance(message, AIMessage) or not message.tool_calls:
+            return {"messages": []}
+        tool_calls = message.tool_calls
+
+        # Identical calls in one message are executed once
+        unique_calls = {}
+        for call in tool_calls:
+            unique_calls.setdefault(ToolCallMemo.make_key(call["name"], call["args"]), call)
+
+        if len(unique_calls) == 1 or self.max_workers == 1:
+            results = {}
+            for key, call in unique_calls.items():
+                results[key] = self._capture(call, config)
+        else:
+            workers = min(self.max_workers, len(unique_calls))
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                # One context copy per call: a context can only be entered once at a time
+                futures = {
+                    key: executor.submit(
+                        contextvars.copy_context().run, self._capture, call, config
+                    )
+                    for key, call in unique_calls.items()
+                }
+                results = {key: future.result() for key, future in futures.items()}
+
+        messages = []
+        for call in tool_calls:
+            content, error = results[ToolCallMemo.make_key(call["name"], call["args"])]
+            messages.append(
+                ToolMessage(
+                    content=content,
+                    name=call["name"],
+                    tool_call_id=call["id"],
+                    status="error" if error else "success",
+                )
+            )
+        return {"messages": messages}
+
+    def _capture(
+        self, call: Dict[str, Any], config: Optional[RunnableConfig]
+    ) -> Tuple[str, bool]:
+        """Execute a call, turning exceptions into an error message for the model."""
+        try:
+            return self._execute(call["name"], call["args"], config), False
+        except Exception as e:
+            return f"Error: {e!r}\n Please fix your mistakes.", True
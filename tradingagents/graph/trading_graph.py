@@ -10,17 +10,35 @@ from langchain_openai import ChatOpenAI
 from langchain_anthropic import ChatAnthropic
 from langchain_google_genai import ChatGoogleGenerativeAI
 
-from langgraph.prebuilt import ToolNode
-
 from tradingagents.agents import *
 from tradingagents.default_config import DEFAULT_CONFIG
-from tradingagents.agents.utils.memory import FinancialSituationMemory
+from tradingagents.agents.utils.memory import (
+    FinancialSituationMemory,
+    memory_namespace,
+    memory_registry,
+    resolve_memory_dir,
+)
+from tradingagents.agents.utils.memory_store import (
+    find_snapshot_tag,
+    list_snapshot_tags,
+    load_snapshot_manifest,
+    open_snapshot_collection,
+    save_snapshot_manifest,
+)
 from tradingagents.agents.utils.agent_states import (
     AgentState,
     InvestDebateState,
     RiskDebateState,
 )
+from tradingagents.agents.utils.prompt_builder import PromptCacheStats
+from tradingagents.agents.utils.prompt_profiler import (
+    PromptProfiler,
+    format_prompt_profile,
+    merge_prompt_profiles,
+)
 from tradingagents.dataflows.config import set_config
+from tradingagents.dataflows.formatting import ToolOutputStats
+from tradingagents.dataflows.market_snapshot import get_market_snapshot
 
 # Import the new abstract tool methods from agent_utils
 from tradingagents.agents.utils.agent_utils import (
@@ -41,6 +59,12 @@ from .setup import GraphSetup
 from .propagation import Propagator
 from .reflection import Reflector
 from .signal_processing import SignalProcessor
+from .checkpointing import create_checkpointer, new_run_id, make_thread_id, list_run_ids
+from .forking import Forker
+from .llm_cache import create_llm_cache
+from .tool_nodes import ParallelToolNode, ToolCallMemo
+from .report_cache import create_report_cache
+from .instrumentation import RunMetrics, metrics_to_json, metrics_to_prometheus
 
 
 class TradingAgentsGraph:
@@ -51,6 +75,10 @@ class TradingAgentsGraph:
         selected_analysts=["market", "social", "news", "fundamentals"],
         debug=False,
         config: Dict[str, Any] = None,
+        checkpointer=None,
+        quick_thinking_llm=None,
+        deep_thinking_llm=None,
+        callbacks: Optional[List[Any]] = None,
     ):
         """Initialize the trading agents graph and components.
 
@@ -58,9 +86,18 @@ class TradingAgentsGraph:
             selected_analysts: List of analyst types to include
             debug: Whether to run in debug mode
             config: Configuration dictionary. If None, uses default config
+            checkpointer: Optional LangGraph checkpointer. If None, one is created
+                from the config when `checkpoint_enabled` is set
+            quick_thinking_llm: Optional chat model used instead of the one
+                created from `llm_provider` and `quick_think_llm`
+            deep_thinking_llm: Optional chat model used instead of the one
+                created from `llm_provider` and `deep_think_llm`
+            callbacks: Optional LangChain callback handlers attached to every
+                graph run and to the reflection and signal-extraction calls
         """
         self.debug = debug
         self.config = config or DEFAULT_CONFIG
+        self.callbacks = callbacks
 
         # Update the interface's config
         set_config(self.config)
@@ -71,32 +108,65 @@ class TradingAgentsGraph:
             exist_ok=True,
         )
 
-        # Initialize LLMs
-        if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
-            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif self.config["llm_provider"].lower() == "anthropic":
-            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"])
-            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"])
-        elif self.config["llm_provider"].lower() == "google":
-            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"])
-            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"])
-        else:
-            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
+        # Initialize LLMs, sharing one response cache (None when caching is off)
+        self.llm_cache = create_llm_cache(self.config)
+        if quick_thinking_llm is None or deep_thinking_llm is None:
+            self._create_llms()
+        if quick_thinking_llm is not None:
+            self.quick_thinking_llm = quick_thinking_llm
+        if deep_thinking_llm is not None:
+            self.deep_thinking_llm = deep_thinking_llm
+
+        # Per-node latency, token and cost metrics. The handler is passed with
+        # each call (run config, reflection, signal extraction) rather than set
+        # on the models, which callers may share between graphs
+        self.instrumentation = None
+        if self.config.get("instrumentation_enabled", True):
+            self.instrumentation = RunMetrics(self.config.get("llm_pricing"))
+        self.run_callbacks = list(self.callbacks or [])
+        if self.instrumentation is not None:
+            self.run_callbacks.append(self.instrumentation)
         
-        # Initialize memories
-        self.bull_memory = FinancialSituationMemory("bull_memory", self.config)
-        self.bear_memory = FinancialSituationMemory("bear_memory", self.config)
-        self.trader_memory = FinancialSituationMemory("trader_memory", self.config)
-        self.invest_judge_memory = FinancialSituationMemory("invest_judge_memory", self.config)
-        self.risk_manager_memory = FinancialSituationMemory("risk_manager_memory", self.config)
-        self.short_term_predictor_memory = FinancialSituationMemory("short_term_predictor_memory", self.config)
-        self.medium_term_predictor_memory = FinancialSituationMemory("medium_term_predictor_memory", self.config)
-        self.long_term_predictor_memory = FinancialSituationMemory("long_term_predictor_memory", self.config)
-        self.prediction_manager_memory = FinancialSituationMemory("prediction_manager_memory", self.config)
-
-        # Create tool nodes
+        # Initialize memories: collections are namespaced per graph (or per
+        # tenant via memory_namespace) in the process-wide registry, which
+        # also shares the embedding cache
+        self.memory_namespace = memory_namespace(self.config)
+        self.embedding_cache = memory_registry.get_embedding_cache(self.config)
+        self.bull_memory = self._create_memory("bull_memory")
+        self.bear_memory = self._create_memory("bear_memory")
+        self.trader_memory = self._create_memory("trader_memory")
+        self.invest_judge_memory = self._create_memory("invest_judge_memory")
+        self.risk_manager_memory = self._create_memory("risk_manager_memory")
+        self.short_term_predictor_memory = self._create_memory("short_term_predictor_memory")
+        self.medium_term_predictor_memory = self._create_memory("medium_term_predictor_memory")
+        self.long_term_predictor_memory = self._create_memory("long_term_predictor_memory")
+        self.prediction_manager_memory = self._create_memory("prediction_manager_memory")
+        self.memories = {
+            memory.name: memory
+            for memory in (
+                self.bull_memory,
+                self.bear_memory,
+                self.trader_memory,
+                self.invest_judge_memory,
+                self.risk_manager_memory,
+                self.short_term_predictor_memory,
+                self.medium_term_predictor_memory,
+                self.long_term_predictor_memory,
+                self.prediction_manager_memory,
+            )
+        }
+
+        # Create tool nodes (sharing a per-run memo of tool results when enabled)
+        self.tool_memo = ToolCallMemo() if self.config.get("tool_memoize", True) else None
         self.tool_nodes = self._create_tool_nodes()
+        self.report_cache = create_report_cache(
+            self.config,
+            {
+                name: tool
+                for tool_node in self.tool_nodes.values()
+                for name, tool in tool_node.tools_by_name.items()
+            },
+        )
 
         # Initialize components
         self.conditional_logic = ConditionalLogic(self.config)
@@ -114,68 +184,164 @@ class TradingAgentsGraph:
             self.long_term_predictor_memory,
             self.prediction_manager_memory,
             self.conditional_logic,
+            self.report_cache,
+        )
+
+        self.propagator = Propagator(
+            snapshot_provider=(
+                get_market_snapshot if self.config.get("market_snapshot_enabled", True) else None
+            )
+        )
+        self.reflector = Reflector(
+            self.quick_thinking_llm,
+            lesson_tokens=self.config.get("reflection_lesson_tokens", 150),
+            callbacks=self.run_callbacks,
+        )
+        self.signal_processor = SignalProcessor(
+            self.quick_thinking_llm, callbacks=self.run_callbacks
         )
 
-        self.propagator = Propagator()
-        self.reflector = Reflector(self.quick_thinking_llm)
-        self.signal_processor = SignalProcessor(self.quick_thinking_llm)
+        # Stats collectors for the run in progress, passed to the agents in
+        # the run config so that each graph keeps its own counts
+        self.prompt_profiler = PromptProfiler(self.config.get("prompt_profiling", False))
+        self.run_collectors = {
+            "prompt_cache_stats": PromptCacheStats(),
+            "tool_output_stats": ToolOutputStats(),
+            "prompt_profiler": self.prompt_profiler,
+        }
 
         # State tracking
         self.curr_state = None
         self.ticker = None
+        self.run_id = None
+        self.prompt_cache_stats = None
+        self.tool_output_stats = None
+        self.run_metrics = None
+        self.prompt_profile = None
+        self.prompt_profiles = []  # One per propagate run, for batch breakdowns
+        self.curr_signal = None
         self.log_states_dict = {}  # date to full state dict
 
         # Set up the graph
+        self.checkpointer = checkpointer or create_checkpointer(self.config)
         enable_prediction_team = self.config.get("enable_prediction_team", True)
-        self.graph = self.graph_setup.setup_graph(selected_analysts, enable_prediction_team)
+        self.graph = self.graph_setup.setup_graph(
+            selected_analysts, enable_prediction_team, self.checkpointer
+        )
+        self.forker = Forker(
+            self.graph_setup,
+            self.propagator,
+            self.config,
+            selected_analysts,
+            self.checkpointer,
+            self.process_signal,
+            self.get_run_args,
+        )
+
+    def _create_llms(self):
+        """Create the deep and quick thinking LLMs for the configured provider."""
+        if self.config["llm_provider"].lower() == "openai" or self.config["llm_provider"] == "ollama" or self.config["llm_provider"] == "openrouter":
+            self.deep_thinking_llm = ChatOpenAI(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatOpenAI(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+        elif self.config["llm_provider"].lower() == "anthropic":
+            self.deep_thinking_llm = ChatAnthropic(model=self.config["deep_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatAnthropic(model=self.config["quick_think_llm"], base_url=self.config["backend_url"], cache=self.llm_cache)
+        elif self.config["llm_provider"].lower() == "google":
+            self.deep_thinking_llm = ChatGoogleGenerativeAI(model=self.config["deep_think_llm"], cache=self.llm_cache)
+            self.quick_thinking_llm = ChatGoogleGenerativeAI(model=self.config["quick_think_llm"], cache=self.llm_cache)
+        else:
+            raise ValueError(f"Unsupported LLM provider: {self.config['llm_provider']}")
 
-    def _create_tool_nodes(self) -> Dict[str, ToolNode]:
+    def _create_memory(self, name: str) -> FinancialSituationMemory:
+        return FinancialSituationMemory(
+            name, self.config, self.embedding_cache, namespace=self.memory_namespace
+        )
+
+    def _create_tool_nodes(self) -> Dict[str, ParallelToolNode]:
         """Create tool nodes for different data sources using abstract methods."""
+        max_workers = self.config.get("tool_max_workers", 4)
         return {
-            "market": ToolNode(
+            "market": ParallelToolNode(
                 [
                     # Core stock data tools
                     get_stock_data,
                     # Technical indicators
                     get_indicators,
-                ]
+                ],
+                max_workers=max_workers,
+                memo=self.tool_memo,
             ),
-            "social": ToolNode(
+            "social": ParallelToolNode(
                 [
                     # News tools for social media analysis
                     get_news,
-                ]
+                ],
+                max_workers=max_workers,
+                memo=self.tool_memo,
             ),
-            "news": ToolNode(
+            "news": ParallelToolNode(
                 [
                     # News and insider information
                     get_news,
                     get_global_news,
                     get_insider_sentiment,
                     get_insider_transactions,
-                ]
+                ],
+                max_workers=max_workers,
+                memo=self.tool_memo,
             ),
-            "fundamentals": ToolNode(
+            "fundamentals": ParallelToolNode(
                 [
                     # Fundamental analysis tools
                     get_fundamentals,
                     get_balance_sheet,
                     get_cashflow,
                     get_income_statement,
-                ]
+                ],
+                max_workers=max_workers,
+                memo=self.tool_memo,
             ),
         }
 
-    def propagate(self, company_name, trade_date):
-        """Run the trading agents graph for a company on a specific date."""
+    def propagate(
+        self,
+        company_name,
+        trade_date,
+        shares_owned=0,
+        purchase_price=0,
+        run_id=None,
+        resume=False,
+    ):
+        """Run the trading agents graph for a company on a specific date.
+
+        Args:
+            company_name: Ticker symbol to analyze
+            trade_date: Analysis date
+            shares_owned: Number of shares currently held
+            purchase_price: Price per share of the current position
+            run_id: Checkpoint run id. A new one is generated if omitted
+            resume: Continue `run_id` from its last completed node instead of
+                starting over. Requires a checkpointer.
+        """
 
         self.ticker = company_name
 
-        # Initialize state
-        init_agent_state = self.propagator.create_initial_state(
-            company_name, trade_date
-        )
-        args = self.propagator.get_graph_args()
+        if resume and (self.checkpointer is None or run_id is None):
+            raise ValueError("Resuming a run requires a checkpointer and a run_id")
+
+        thread_id = None
+        if self.checkpointer is not None:
+            self.run_id = run_id or new_run_id()
+            thread_id = make_thread_id(company_name, str(trade_date), self.run_id)
+        args = self.get_run_args(thread_id)
+
+        # Initialize state, or pick up from the last checkpoint when resuming
+        if resume and self.graph.get_state(args["config"]).values:
+            init_agent_state = None
+        else:
+            init_agent_state = self.propagator.create_initial_state(
+                company_name, trade_date, shares_owned, purchase_price
+            )
 
         if self.debug:
             # Debug mode with tracing
@@ -187,7 +353,7 @@ class TradingAgentsGraph:
                     chunk["messages"][-1].pretty_print()
                     trace.append(chunk)
 
-            final_state = trace[-1]
+            final_state = trace[-1] if trace else self.graph.get_state(args["config"]).values
         else:
             # Standard mode without tracing
             final_state = self.graph.invoke(init_agent_state, **args)
@@ -195,11 +361,114 @@ class TradingAgentsGraph:
         # Store current state for reflection
         self.curr_state = final_state
 
+        # The structured signal is kept on curr_signal. Extracted before the
+        # stats are taken, since an ambiguous decision costs an LLM call
+        self.curr_signal = self.extract_signal(final_state["final_trade_decision"])
+
+        self.prompt_cache_stats = self.run_collectors["prompt_cache_stats"].snapshot()
+        self.tool_output_stats = self.run_collectors["tool_output_stats"].snapshot()
+        if self.instrumentation is not None:
+            self.run_metrics = self.instrumentation.snapshot()
+            final_state["run_metrics"] = self.run_metrics
+        if self.prompt_profiler.enabled:
+            self.prompt_profile = self.prompt_profiler.snapshot()
+            self.prompt_profiles.append(self.prompt_profile)
+            print(format_prompt_profile(self.prompt_profile, f"Prompt anatomy for {company_name} on {trade_date}"))
+
         # Log state
         self._log_state(trade_date, final_state)
 
-        # Return decision and processed signal
-        return final_state, self.process_signal(final_state["final_trade_decision"])
+        return final_state, self.curr_signal["decision"]
+
+    def get_run_args(self, thread_id=None, new_run=True) -> Dict[str, Any]:
+        """Arguments for invoking or streaming the graph for one run.
+
+        Use these instead of `propagator.get_graph_args` when driving
+        `self.graph` directly, so that the run gets this graph's callbacks,
+        stats collectors and tool memo.
+
+        Args:
+            thread_id: Checkpoint thread to run on
+            new_run: Reset the stats, metrics and tool memo first. Pass False
+                to keep counting into the current run (e.g. forked variants).
+        """
+        if new_run:
+            for collector in self.run_collectors.values():
+                collector.reset()
+            if self.instrumentation is not None:
+                self.instrumentation.reset()
+            if self.tool_memo is not None:
+                self.tool_memo.reset()
+
+        return self.propagator.get_graph_args(
+            thread_id, self.run_callbacks or None, self.run_collectors
+        )
+
+    def export_run_metrics(self, fmt: str = "json") -> str:
+        """Metrics of the last propagate run as JSON or Prometheus text.
+
+        Args:
+            fmt: "json" or "prometheus"
+        """
+        if self.run_metrics is None:
+            raise ValueError("No run metrics: call propagate with instrumentation_enabled")
+        labels = {"ticker": self.ticker, "trade_date": str(self.curr_state["trade_date"])}
+        if fmt == "json":
+            return metrics_to_json(self.run_metrics, **labels)
+        if fmt == "prometheus":
+            return metrics_to_prometheus(self.run_metrics, **labels)
+        raise ValueError(f"Unsupported metrics format: {fmt}")
+
+    def prompt_profile_summary(self) -> str:
+        """Prompt token breakdown aggregated over every profiled propagate run."""
+        if not self.prompt_profiles:
+            return "No prompt profiles: set prompt_profiling in the config and call propagate"
+        return format_prompt_profile(
+            merge_prompt_profiles(self.prompt_profiles),
+            f"Prompt anatomy across {len(self.prompt_profiles)} runs",
+        )
+
+    def snapshot(
+        self,
+        company_name,
+        trade_date,
+        after_node="Research Manager",
+        shares_owned=0,
+        purchase_price=0,
+    ) -> Dict[str, Any]:
+        """Run the graph through `after_node` and capture the state for forking."""
+        self.ticker = company_name
+        return self.forker.snapshot(
+            company_name, trade_date, after_node, shares_owned, purchase_price
+        )
+
+    def run_variants(
+        self, snapshot, variants, max_workers=1
+    ) -> List[Tuple[Dict[str, Any], Any]]:
+        """Run downstream variants (position inputs or config overrides) from a snapshot.
+
+        Example:
+            snap = ta.snapshot("NVDA", "2024-05-10")
+            results = ta.run_variants(snap, [
+                {"shares_owned": 0},
+                {"shares_owned": 100, "purchase_price": 80.0},
+                {"config": {"max_risk_discuss_rounds": 2}},
+            ])
+        """
+        return self.forker.run_variants(snapshot, variants, max_workers)
+
+    def get_resumable_runs(self, company_name, trade_date) -> List[str]:
+        """List checkpointed runs for a ticker and date that did not finish, newest first."""
+        if self.checkpointer is None:
+            return []
+
+        resumable = []
+        for run_id in list_run_ids(self.checkpointer, company_name, str(trade_date)):
+            thread_id = make_thread_id(company_name, str(trade_date), run_id)
+            snapshot = self.graph.get_state(self.propagator.get_graph_args(thread_id)["config"])
+            if snapshot.next:
+                resumable.append(run_id)
+        return resumable
 
     def _log_state(self, trade_date, final_state):
         """Log the final state to a JSON file."""
@@ -210,6 +479,8 @@ class TradingAgentsGraph:
             "sentiment_report": final_state["sentiment_report"],
             "news_report": final_state["news_report"],
             "fundamentals_report": final_state["fundamentals_report"],
+            "research_brief": final_state.get("research_brief", ""),
+            "market_snapshot": final_state.get("market_snapshot"),
             "investment_debate_state": {
                 "bull_history": final_state["investment_debate_state"]["bull_history"],
                 "bear_history": final_state["investment_debate_state"]["bear_history"],
@@ -231,14 +502,25 @@ class TradingAgentsGraph:
             },
             "investment_plan": final_state["investment_plan"],
             "final_trade_decision": final_state["final_trade_decision"],
+            # Absent when the prediction team is disabled
             "prediction_debate_state": {
-                "short_term_history": final_state["prediction_debate_state"]["short_term_history"],
-                "medium_term_history": final_state["prediction_debate_state"]["medium_term_history"],
-                "long_term_history": final_state["prediction_debate_state"]["long_term_history"],
-                "history": final_state["prediction_debate_state"]["history"],
-                "final_predictions": final_state["prediction_debate_state"]["final_predictions"],
+                field: (final_state.get("prediction_debate_state") or {}).get(field, "")
+                for field in (
+                    "short_term_history",
+                    "medium_term_history",
+                    "long_term_history",
+                    "history",
+                    "final_predictions",
+                )
             },
-            "final_predictions": final_state["final_predictions"],
+            "final_predictions": final_state.get("final_predictions", ""),
+            "prompt_cache_stats": self.prompt_cache_stats,
+            "tool_output_stats": self.tool_output_stats,
+            "run_metrics": self.run_metrics,
+            "prompt_profile": self.prompt_profile,
+            "embedding_cache_stats": (
+                self.embedding_cache.stats() if self.embedding_cache else None
+            ),
         }
 
         # Save to file
@@ -377,23 +659,94 @@ class TradingAgentsGraph:
         print(f"\n✓ Comprehensive research report saved to: {output_file}")
 
     def reflect_and_remember(self, returns_losses):
-        """Reflect on decisions and update memory based on returns."""
-        self.reflector.reflect_bull_researcher(
-            self.curr_state, returns_losses, self.bull_memory
-        )
-        self.reflector.reflect_bear_researcher(
-            self.curr_state, returns_losses, self.bear_memory
-        )
-        self.reflector.reflect_trader(
-            self.curr_state, returns_losses, self.trader_memory
+        """Reflect on decisions and update memory based on returns.
+
+        Covers the researchers, trader, both judges and, when the prediction
+        team ran, the predictors and prediction manager. The reflections run
+        concurrently and share one embedding of the situation. Their LLM
+        calls are added to `run_metrics` of the last run.
+        """
+        reflections = self.reflector.reflect_all(
+            self.curr_state,
+            returns_losses,
+            self.memories,
+            max_workers=self.config.get("reflection_max_workers"),
         )
-        self.reflector.reflect_invest_judge(
-            self.curr_state, returns_losses, self.invest_judge_memory
+        if self.instrumentation is not None:
+            self.run_metrics = self.instrumentation.snapshot()
+            self.curr_state["run_metrics"] = self.run_metrics
+        return reflections
+
+    def close(self) -> None:
+        """Release this graph's in-process agent memories.
+
+        Without a configured `memory_namespace`, a graph's memories live in a
+        private namespace of the process-wide registry and would otherwise
+        stay there after the graph is discarded. Tenant namespaces shared
+        with other graphs and files of the persistent backend are kept. The
+        memories must not be used after closing.
+        """
+        if self.memory_namespace and not self.config.get("memory_namespace"):
+            memory_registry.drop_namespace(self.memory_namespace)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _memory_snapshot_dir(self) -> str:
+        if self.config.get("memory_backend", "chroma") != "persistent":
+            raise ValueError("Memory snapshots require memory_backend 'persistent'")
+        return self.config.get("memory_snapshot_dir") or os.path.join(
+            resolve_memory_dir(self.config), "snapshots"
         )
-        self.reflector.reflect_risk_manager(
-            self.curr_state, returns_losses, self.risk_manager_memory
+
+    def save_memory_snapshot(self, tag: str) -> str:
+        """Checkpoint all agent memories under `tag` (usually the trade date).
+
+        Only row counts are recorded, so this is cheap enough to call after
+        every `reflect_and_remember` in a backtest. Returns the manifest path.
+        """
+        return save_snapshot_manifest(
+            self._memory_snapshot_dir(),
+            tag,
+            {name: memory.situation_collection for name, memory in self.memories.items()},
         )
 
+    def list_memory_snapshots(self) -> List[str]:
+        """Return the saved memory snapshot tags, sorted."""
+        return list_snapshot_tags(self._memory_snapshot_dir())
+
+    def load_memory_snapshot(self, as_of: str) -> Optional[str]:
+        """Restore all agent memories to the latest snapshot tagged on or before `as_of`.
+
+        The snapshot is opened copy-on-write: memories read its rows and
+        write new situations to this graph's overlay directory under
+        `<memory_dir>/overlays`, leaving the snapshot untouched for other
+        workers. Returns the loaded tag, or None (memories unchanged) when no
+        snapshot is that old.
+        """
+        snapshot_dir = self._memory_snapshot_dir()
+        tag = find_snapshot_tag(snapshot_dir, str(as_of))
+        if tag is None:
+            return None
+
+        manifest = load_snapshot_manifest(snapshot_dir, tag)
+        overlay_id = new_run_id()
+        for name, memory in self.memories.items():
+            entry = manifest["memories"].get(name, {"model": memory.embedding, "segments": []})
+            overlay_dir = os.path.join(
+                resolve_memory_dir(self.config), "overlays", overlay_id, name
+            )
+            memory.situation_collection = open_snapshot_collection(entry, overlay_dir)
+            memory.clear_retrieval_cache()
+        return tag
+
     def process_signal(self, full_signal):
         """Process a signal to extract the core decision."""
         return self.signal_processor.process_signal(full_signal)
+
+    def extract_signal(self, full_signal):
+        """Extract the structured trade signal (decision, prices, stop-loss, sizing)."""
+        return self.signal_processor.extract_signal(full_signal)